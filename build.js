@@ -1,5 +1,6 @@
 const fs = require('fs-extra');
 const path = require('path');
+const crypto = require('crypto');
 const ejs = require('ejs');
 const { execSync } = require('child_process');
 
@@ -10,6 +11,13 @@ const DATA_DIR = path.join(__dirname, 'data');
 const IMAGES_DIR = path.join(__dirname, 'images');
 const SRC_DIR = path.join(__dirname, 'src');
 const PUBLIC_DIR = path.join(__dirname, 'public');
+const CACHE_DIR = path.join(__dirname, '.cms-cache');
+const CHANGES_PATH = path.join(CACHE_DIR, 'changes.json');
+const BUILD_STATE_PATH = path.join(CACHE_DIR, 'build-state.json');
+const IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'];
+
+// --incremental rebuilds only what the CMS change manifest lists
+const INCREMENTAL = process.argv.includes('--incremental');
 
 // Load data
 function loadData() {
@@ -100,7 +108,7 @@ function buildVideoSchema(project, category, siteConfig) {
     "@type": "VideoObject",
     "name": project.title,
     "description": project.description || `${category.name} project: ${project.title}${project.client ? ` for ${project.client}` : ''}`,
-    "thumbnailUrl": `${siteConfig.domain}/images/thumbnails/${project.thumbnail}`,
+    "thumbnailUrl": `${siteConfig.domain}/images/thumbnails/${thumbnailSrc(project)}`,
     "contentUrl": videoUrl,
     "embedUrl": embedUrl,
     "creator": {
@@ -116,6 +124,15 @@ function buildVideoSchema(project, category, siteConfig) {
   };
 }
 
+// A category's projects in display order. The CMS keeps the order in each
+// project's fractional `sortKey`; projects without one follow in list order.
+function projectsInCategory(allProjects, categoryId) {
+  const key = p => p.sortKey || '~';
+  return allProjects
+    .filter(p => p.category === categoryId)
+    .sort((a, b) => (key(a) < key(b) ? -1 : key(a) > key(b) ? 1 : 0));
+}
+
 function buildItemListSchema(category, categoryProjects, siteConfig) {
   return {
     "@context": "https://schema.org",
@@ -159,7 +176,7 @@ async function generateSitemap(projects, siteConfig) {
     });
 
     // Add project pages
-    const categoryProjects = projects.projects.filter(p => p.category === category.id);
+    const categoryProjects = projectsInCategory(projects.projects, category.id);
     for (const project of categoryProjects) {
       urls.push({
         loc: `/${category.slug}/${project.id}/`,
@@ -194,6 +211,22 @@ Sitemap: ${siteConfig.domain}/sitemap.xml`;
   console.log('Generated robots.txt');
 }
 
+// Attributes for an <img> with a CMS-computed placeholder: the dominant colour
+// and tiny LQIP paint as its background until the lazy-loaded image covers
+// them, and width/height reserve the layout box so nothing shifts.
+function placeholderAttrs(placeholder) {
+  if (!placeholder) return '';
+  const { color, lqip, width, height } = placeholder;
+  return `width="${width}" height="${height}" ` +
+    `style="background: ${color} url('${lqip}') center / cover no-repeat"`;
+}
+
+// Thumbnail path under images/thumbnails: the CMS's smart crop at the grid's
+// aspect ratio when there is one, otherwise the original upload.
+function thumbnailSrc(project) {
+  return project.thumbnailCrop ? project.thumbnailCrop.src : project.thumbnail;
+}
+
 // Render template
 async function renderTemplate(templateName, data) {
   const templatePath = path.join(TEMPLATES_DIR, `${templateName}.ejs`);
@@ -221,6 +254,56 @@ function buildCSS() {
 
 // Copy static assets
 async function copyAssets() {
+  await copyStaticAssets();
+
+  // Copy images
+  if (await fs.pathExists(IMAGES_DIR)) {
+    await fs.copy(IMAGES_DIR, path.join(DIST_DIR, 'images'));
+  }
+}
+
+// Copy only the images the change manifest lists
+async function syncImages(assets) {
+  console.log(`Syncing ${assets.changed.length} changed and ${assets.removed.length} removed images...`);
+
+  for (const rel of assets.changed) {
+    await fs.copy(path.join(IMAGES_DIR, rel), path.join(DIST_DIR, 'images', rel));
+  }
+  for (const rel of assets.removed) {
+    await fs.remove(path.join(DIST_DIR, 'images', rel));
+  }
+}
+
+// Image paths under dir, relative to IMAGES_DIR with forward slashes (as the CMS index keys them)
+function listImages(dir = IMAGES_DIR, found = []) {
+  if (!fs.existsSync(dir)) return found;
+  for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+    const full = path.join(dir, entry.name);
+    if (entry.isDirectory()) {
+      listImages(full, found);
+    } else if (IMAGE_EXTENSIONS.includes(path.extname(entry.name).toLowerCase())) {
+      found.push(path.relative(IMAGES_DIR, full).split(path.sep).join('/'));
+    }
+  }
+  return found;
+}
+
+// Whether images/ changed since the CMS wrote the manifest (edited outside it, or never saved)
+function imagesChangedSince(manifest) {
+  if (!manifest.images) return true;
+  const files = listImages();
+  if (files.length !== Object.keys(manifest.images).length) return true;
+  return files.some(rel => {
+    const entry = manifest.images[rel];
+    if (!entry) return true;
+    const stat = fs.statSync(path.join(IMAGES_DIR, rel));
+    const [bytes, mtime] = entry;
+    return stat.size !== bytes || Math.abs(stat.mtimeMs / 1000 - mtime) > 0.001;
+  });
+}
+
+// Copy everything except images (small, so always copied)
+async function copyStaticAssets() {
   console.log('Copying static assets...');
 
   // Copy public folder contents to dist root (favicon, manifest, icons, etc.)
@@ -228,11 +311,6 @@ async function copyAssets() {
     await fs.copy(PUBLIC_DIR, DIST_DIR);
   }
 
-  // Copy images
-  if (await fs.pathExists(IMAGES_DIR)) {
-    await fs.copy(IMAGES_DIR, path.join(DIST_DIR, 'images'));
-  }
-
   // Copy JS
   const jsPath = path.join(SRC_DIR, 'main.js');
   if (await fs.pathExists(jsPath)) {
@@ -247,15 +325,17 @@ async function copyAssets() {
   }
 }
 
-// Build pages
-async function buildPages() {
+// Build pages; `only` limits category and project pages to the given ids
+async function buildPages(only = null) {
   const { projects, siteConfig } = loadData();
 
   // Common data for all templates
   const commonData = {
     site: siteConfig,
     categories: projects.categories,
-    currentYear: new Date().getFullYear()
+    currentYear: new Date().getFullYear(),
+    placeholderAttrs,
+    thumbnailSrc
   };
 
   // Build home page with Person + LocalBusiness schema
@@ -302,26 +382,29 @@ async function buildPages() {
 
   // Build gallery pages and project pages for each category
   for (const category of projects.categories) {
-    const categoryProjects = projects.projects.filter(p => p.category === category.id);
-
-    // Build gallery index page with ItemList schema
-    console.log(`Building ${category.name} gallery...`);
-    const galleryDescription = categoryDescriptions[category.slug] || `${category.name} video editing and post-production work by ${siteConfig.title}, Melbourne-based video editor.`;
-    const galleryHtml = await renderTemplate('gallery', {
-      ...commonData,
-      title: `${category.name} | ${siteConfig.title}`,
-      activePage: category.slug,
-      category,
-      projects: categoryProjects,
-      pageDescription: galleryDescription,
-      pageUrl: `/${category.slug}/`,
-      pageType: 'website',
-      structuredData: buildItemListSchema(category, categoryProjects, siteConfig)
-    });
-    await fs.outputFile(path.join(DIST_DIR, category.slug, 'index.html'), galleryHtml);
+    const categoryProjects = projectsInCategory(projects.projects, category.id);
+
+    if (!only || only.categories.has(category.id)) {
+      // Build gallery index page with ItemList schema
+      console.log(`Building ${category.name} gallery...`);
+      const galleryDescription = categoryDescriptions[category.slug] || `${category.name} video editing and post-production work by ${siteConfig.title}, Melbourne-based video editor.`;
+      const galleryHtml = await renderTemplate('gallery', {
+        ...commonData,
+        title: `${category.name} | ${siteConfig.title}`,
+        activePage: category.slug,
+        category,
+        projects: categoryProjects,
+        pageDescription: galleryDescription,
+        pageUrl: `/${category.slug}/`,
+        pageType: 'website',
+        structuredData: buildItemListSchema(category, categoryProjects, siteConfig)
+      });
+      await fs.outputFile(path.join(DIST_DIR, category.slug, 'index.html'), galleryHtml);
+    }
 
     // Build individual project pages with VideoObject schema
     for (const project of categoryProjects) {
+      if (only && !only.projects.has(project.id)) continue;
       console.log(`  Building project: ${project.title}...`);
       const projectDescription = project.description ||
         `${project.title} - ${category.name} work${project.client ? ` for ${project.client}` : ''}. Edited by ${siteConfig.title}, Melbourne video editor.`;
@@ -333,7 +416,7 @@ async function buildPages() {
         project,
         pageDescription: projectDescription,
         pageUrl: `/${category.slug}/${project.id}/`,
-        pageImage: `/images/thumbnails/${project.thumbnail}`,
+        pageImage: `/images/thumbnails/${thumbnailSrc(project)}`,
         pageType: 'video.other',
         structuredData: buildVideoSchema(project, category, siteConfig)
       });
@@ -349,22 +432,83 @@ async function buildPages() {
   await generateRobotsTxt(siteConfig);
 }
 
+// Load the CMS change manifest, if it still describes data/projects.json
+function loadChangeManifest() {
+  if (!fs.existsSync(CHANGES_PATH)) return null;
+
+  const manifest = fs.readJsonSync(CHANGES_PATH);
+  const projectsJson = fs.readFileSync(path.join(DATA_DIR, 'projects.json'));
+  const sha1 = crypto.createHash('sha1').update(projectsJson).digest('hex');
+  return manifest.projectsSha1 === sha1 ? manifest : null;
+}
+
+// Rebuild only the pages and images the manifest lists
+async function buildIncremental(manifest) {
+  console.log(`Incremental build: ${manifest.projects.length} projects, ${manifest.categories.length} categories\n`);
+
+  // Templates and styles aren't tracked by the manifest; change them with a full build
+  if (!(await fs.pathExists(path.join(DIST_DIR, 'css', 'styles.css')))) {
+    buildCSS();
+  }
+
+  await copyStaticAssets();
+  if (imagesChangedSince(manifest)) {
+    // The manifest's image diff is stale, so every image is copied again
+    console.log('Images changed since the last CMS save, copying all of images/...');
+    await fs.remove(path.join(DIST_DIR, 'images'));
+    if (await fs.pathExists(IMAGES_DIR)) {
+      await fs.copy(IMAGES_DIR, path.join(DIST_DIR, 'images'));
+    }
+  } else {
+    await syncImages(manifest.assets);
+  }
+
+  for (const page of manifest.removedPages) {
+    await fs.remove(path.join(DIST_DIR, page));
+  }
+
+  await buildPages({
+    categories: new Set(manifest.categories),
+    projects: new Set(manifest.projects)
+  });
+}
+
 // Main build function
 async function build() {
   console.log('Starting build...\n');
 
-  // Clean dist directory
-  console.log('Cleaning dist directory...');
-  await fs.emptyDir(DIST_DIR);
+  const manifest = loadChangeManifest();
+  const canIncrement = manifest && !manifest.full &&
+    await fs.pathExists(path.join(DIST_DIR, 'index.html'));
+
+  if (INCREMENTAL && canIncrement) {
+    await buildIncremental(manifest);
+  } else {
+    if (INCREMENTAL) {
+      console.log('No usable change manifest (Save All in the CMS writes one), doing a full build.\n');
+    }
+
+    // Clean dist directory
+    console.log('Cleaning dist directory...');
+    await fs.emptyDir(DIST_DIR);
 
-  // Build CSS
-  buildCSS();
+    // Build CSS
+    buildCSS();
 
-  // Copy assets
-  await copyAssets();
+    // Copy assets
+    await copyAssets();
 
-  // Build pages
-  await buildPages();
+    // Build pages
+    await buildPages();
+  }
+
+  // Record what dist/ was built from so the CMS can diff against it next save.
+  // Without a matching manifest the state is unknown, so the next build is full.
+  if (manifest) {
+    await fs.outputJson(BUILD_STATE_PATH, manifest.state);
+  } else {
+    await fs.remove(BUILD_STATE_PATH);
+  }
 
   console.log('\nBuild complete! Output in dist/');
 }
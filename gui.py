@@ -1,133 +1,2698 @@
+import base64
+import bisect
+import collections
+import collections.abc
+import concurrent.futures
+import copy
+import functools
+import hashlib
+import io
 import json
+import multiprocessing
 import os
+import queue
 import re
 import shutil
+import sqlite3
+import sys
+import threading
+import time
 import tkinter as tk
+import tracemalloc
+import types
 from tkinter import ttk, filedialog, messagebox
 from tkinterdnd2 import DND_FILES, TkinterDnD
+import numpy as np
+
+try:
+    # Optional: native (inotify/FSEvents) change notifications
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
 from PIL import Image, ImageTk, ImageDraw, ImageFilter
 from datetime import datetime
 
 # =====================
-# CONFIG
+# CONFIG
+# =====================
+PROJECTS_JSON = "data/projects.json"
+PROJECTS_SHARD_DIR = "data/projects"
+PROJECTS_MANIFEST = os.path.join(PROJECTS_SHARD_DIR, "manifest.json")
+
+# Catalogue storage: "json" (single projects.json), "sharded" (one file per
+# project plus a manifest), "sqlite" (indexed local database that exports
+# projects.json) or "auto" (sharded once a manifest exists)
+STORAGE_MODE = os.environ.get("CMS_STORAGE", "auto")
+IMAGES_DIR = "images"
+THUMBNAILS_DIR = os.path.join(IMAGES_DIR, "thumbnails")
+GALLERY_DIR = os.path.join(IMAGES_DIR, "gallery")
+
+# Local caches/indexes, never deployed
+CACHE_DIR = ".cms-cache"
+IMAGE_INDEX_JSON = os.path.join(CACHE_DIR, "image-index.json")
+PHASH_INDEX_JSON = os.path.join(CACHE_DIR, "phash-index.json")
+UI_STATE_JSON = os.path.join(CACHE_DIR, "ui-state.json")
+CATALOGUE_DB = os.path.join(CACHE_DIR, "catalogue.db")
+CHANGES_JSON = os.path.join(CACHE_DIR, "changes.json")  # Read by `node build.js --incremental`
+BUILD_STATE_JSON = os.path.join(CACHE_DIR, "build-state.json")  # Written by build.js after a build
+
+THUMBNAIL_SIZE = (260, 260)
+GALLERY_SIZE = (150, 150)
+WIDE_THUMBNAIL_WIDTH = 450
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp")
+IMAGE_SIZE_BUDGET = 2 * 1024 * 1024  # Bytes per deployed image before we warn
+INDEX_WORKERS = 8
+INDEX_FLUSH_MS = 2000  # Index edits are batched and written at most this often
+
+# Perceptual hashing (64-bit DCT pHash)
+PHASH_SAMPLE = 32
+PHASH_BITS = 8
+PHASH_THRESHOLD = 6  # Max Hamming distance to count as a near-duplicate
+PHASH_CHUNK = 1024   # Rows per vectorised distance block
+
+# Background preview prefetch
+PREFETCH_RADIUS = 2       # Tree neighbours either side of the selection
+PREFETCH_SEARCH_HITS = 3  # Top search results to warm
+
+# Background jobs: priority lanes (highest first), bounded pools, Tk bridge
+JOB_LANES = ("interactive", "prefetch", "maintenance")
+JOB_THREADS = 4    # Worker threads; the first only ever takes interactive jobs
+JOB_PROCESSES = 2  # Process pool for CPU-bound work (hashing, placeholders)
+JOB_POLL_MS = 15   # How often the Tk loop collects results while jobs are out
+
+# Progressive previews: placeholder first, full render as an interactive job
+PLACEHOLDER_DIR = os.path.join(CACHE_DIR, "placeholders")
+PLACEHOLDER_SCALE = 8  # Stored placeholders are 1/8 of the preview size
+
+# Per-project sprite sheet of gallery previews
+ATLAS_DIR = os.path.join(CACHE_DIR, "atlas")
+ATLAS_COLUMNS = 8
+
+# Full-resolution still viewer backed by an on-disk tile pyramid
+PYRAMID_DIR = os.path.join(CACHE_DIR, "pyramid")
+PYRAMID_MAX_BYTES = 1024 * 1024 * 1024  # Oldest pyramids are pruned past this
+TILE_SIZE = 256
+VIEWER_TILE_CACHE = 96  # PhotoImage tiles kept by the viewer (~25 MB)
+
+# Site placeholders: dominant colour and a tiny LQIP per image, stored on
+# project records so templates can paint something before the image loads
+LQIP_COLUMNS = 16   # Placeholder width in pixels; rows follow the aspect ratio
+LQIP_SAMPLE = 256   # Longest side images are box-reduced to before averaging
+LQIP_QUALITY = 50
+SITE_PLACEHOLDER_FIELDS = ("thumbnailPlaceholder", "galleryPlaceholders")  # Derived, so never merge conflicts
+
+# Smart-cropped site thumbnails: originals stay put, crops match the grid's aspect ratio
+THUMBNAIL_CROPS_DIR = os.path.join(THUMBNAILS_DIR, "cropped")
+CROP_STAGING_DIR = os.path.join(CACHE_DIR, "crops")  # Previewed crops waiting to be applied
+THUMBNAIL_ASPECT = (16, 9)                # .portfolio-item is aspect-video
+THUMBNAIL_ASPECTS = {"vertical": (9, 16)}  # Per-category overrides (.portfolio-item-vertical)
+CROP_SAMPLE = 256         # Longest side the saliency map is computed at
+CROP_CENTRE_BIAS = 0.15   # How strongly ties are broken towards the middle of the frame
+CROP_LONG_SIDE = 1280     # Crops are never upscaled past the source
+CROP_QUALITY = 85
+CROP_PREVIEW_SIZE = 160   # Before/after images in the preview dialog
+CROP_TOLERANCE = 0.02     # Sources this close to the target aspect are shown as they are
+
+# Colour scopes for gallery stills
+SCOPE_SAMPLE_WIDTH = 480  # Stills are downsampled to this before analysis
+SCOPE_SIZE = (240, 128)   # Display size of each scope
+SCOPES = ("parade", "waveform", "histogram")
+
+# External change detection
+WATCH_POLL_MS = 1000  # Polling fallback interval, also the UI drain interval
+
+# Dropped folders are scanned in the background and ingested in batches
+DROP_BATCH_SIZE = 16
+DROP_BATCH_SECONDS = 0.2  # Flush a partial batch after this long so early cards show up
+
+# Leading bytes -> canonical extension; RIFF files are only WebP if "WEBP" follows
+IMAGE_MAGIC = (
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+    (b"BM", ".bmp"),
+    (b"RIFF", ".webp"),
+)
+
+# Per-category order lives in each project's fractional "sortKey"
+SORT_KEY_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+SORT_KEY_MAX_LEN = 12  # Longer keys from repeated moves into one gap re-key the category
+TREE_DRAG_THRESHOLD = 4  # Pixels before a press on a tree row becomes a drag
+
+FIELD_MAP = {
+    "title": "Title",
+    "client": "Client",
+    "role": "Role",
+    "year": "Year",
+    "vimeoId": "Vimeo ID",
+    "youtubeId": "Youtube ID",
+    "description": "Description",
+    "production": "Production",
+}
+
+# Color schemes
+LIGHT_COLORS = {
+    "bg": "#f8f9fa",
+    "sidebar": "#2c3e50",
+    "sidebar_text": "#ecf0f1",
+    "primary": "#3498db",
+    "primary_hover": "#2980b9",
+    "danger": "#e74c3c",
+    "danger_hover": "#c0392b",
+    "success": "#27ae60",
+    "success_hover": "#229954",
+    "card": "#ffffff",
+    "border": "#dfe6e9",
+    "text": "#2c3e50",
+    "text_light": "#7f8c8d",
+    "selected": "#3498db",
+    "selected_bg": "#ebf5fb",
+    "topbar": "#ffffff",
+    "topbar_border": "#dfe6e9",
+}
+
+DARK_COLORS = {
+    "bg": "#1a1d23",
+    "sidebar": "#0d0f12",
+    "sidebar_text": "#e4e6eb",
+    "primary": "#4a9eff",
+    "primary_hover": "#3d8de5",
+    "danger": "#ff4757",
+    "danger_hover": "#ee3f4f",
+    "success": "#2ecc71",
+    "success_hover": "#27ae60",
+    "card": "#242830",
+    "border": "#3a3f4b",
+    "text": "#e4e6eb",
+    "text_light": "#8b92a3",
+    "selected": "#4a9eff",
+    "selected_bg": "#1e2a3a",
+    "topbar": "#1e2126",
+    "topbar_border": "#3a3f4b",
+}
+
+COLORS = LIGHT_COLORS.copy()
+
+# Profiling - set CMS_PROFILE=1 to record spans from startup
+PROFILE_BUFFER_SIZE = 8192
+PROFILE_REFRESH_MS = 500
+
+# Memory budgets in bytes for the evictable subsystems
+MB = 1024 * 1024
+MEMORY_BUDGETS = {
+    "decoded_images": 96 * MB,
+    "undo_history": 32 * MB,
+}
+MEMORY_SNAPSHOT_TOP = 15
+
+# Thumbnail drop shadow
+SHADOW_RADIUS = 5
+SHADOW_OFFSET = 5
+SHADOW_ALPHA = 30
+SHADOW_CACHE_SIZE = 64
+
+# =====================
+# PROFILER
+# =====================
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("profiler", "name", "cat", "start")
+
+    def __init__(self, profiler, name, cat):
+        self.profiler = profiler
+        self.name = name
+        self.cat = cat
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.cat, self.start, time.perf_counter_ns())
+        return False
+
+class Profiler:
+    """Keeps the most recent timing spans in a ring buffer.
+
+    Recording is skipped entirely while disabled, so instrumented code only
+    pays for a single attribute check.
+    """
+    def __init__(self, capacity=PROFILE_BUFFER_SIZE, enabled=False):
+        self.spans = collections.deque(maxlen=capacity)
+        self.enabled = enabled
+        self.origin = time.perf_counter_ns()
+
+    def span(self, name, cat="ui"):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat)
+
+    def record(self, name, cat, start_ns, end_ns):
+        # deque.append is atomic, so worker threads can record too
+        self.spans.append((name, cat, start_ns, end_ns - start_ns, threading.get_ident()))
+
+    def clear(self):
+        self.spans.clear()
+
+    def summary(self):
+        """Aggregate spans by name: (name, count, total_ms, mean_ms, max_ms), slowest first"""
+        stats = {}
+        for name, _cat, _start, dur, _tid in list(self.spans):
+            count, total, worst = stats.get(name, (0, 0, 0))
+            stats[name] = (count + 1, total + dur, max(worst, dur))
+        rows = [(name, count, total / 1e6, total / count / 1e6, worst / 1e6)
+                for name, (count, total, worst) in stats.items()]
+        rows.sort(key=lambda r: r[2], reverse=True)
+        return rows
+
+    def to_chrome_trace(self):
+        pid = os.getpid()
+        events = [{
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start - self.origin) / 1000,
+            "dur": dur / 1000,
+            "pid": pid,
+            "tid": tid,
+        } for name, cat, start, dur, tid in list(self.spans)]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+PROFILER = Profiler(enabled=os.environ.get("CMS_PROFILE") == "1")
+
+def profiled(name=None, cat="ui"):
+    """Decorator that records a span for every call while profiling is enabled"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(span_name, cat, start, time.perf_counter_ns())
+        return wrapper
+    return decorator
+
+# =====================
+# HELPERS
+# =====================
+@profiled("load_data", "io")
+def load_data(path=PROJECTS_JSON):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+@profiled("save_data", "io")
+def save_data(data, path=PROJECTS_JSON):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=json_default)
+
+def dump_json(obj):
+    return json.dumps(obj, indent=2, default=json_default)
+
+def json_default(obj):
+    # Lets ProjectRecords serialise exactly like the dicts they were loaded from
+    if isinstance(obj, ProjectRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def write_text(path, text):
+    """Write via a temp file so readers (and watchers) never see partial JSON"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def sha1_text(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def sha1_file(path, chunk=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        while block := f.read(chunk):
+            h.update(block)
+    return h.hexdigest()
+
+def project_keys(projects):
+    """Unique key per project: its id, suffixed ~2, ~3... for repeated ids"""
+    seen = collections.Counter()
+    keys = []
+    for p in projects:
+        seen[p["id"]] += 1
+        n = seen[p["id"]]
+        keys.append(p["id"] if n == 1 else f"{p['id']}~{n}")
+    return keys
+
+def search_text(p):
+    """What the search box matches against, lower-cased (shared by filter_projects and SqliteStore)"""
+    return f"{p.get('title', '')} {p.get('client', '')} {p.get('role', '')}".lower()
+
+def filter_projects(projects, search_term, filter_cat="All"):
+    """Indices of projects matching a lower-case search term and category filter"""
+    found = []
+    for i, p in enumerate(projects):
+        # Filter by category
+        if filter_cat != "All" and p["category"] != filter_cat:
+            continue
+        
+        # Filter by search
+        if search_term and search_term not in search_text(p):
+            continue
+
+        found.append(i)
+    return found
+
+def sort_key_between(lo, hi):
+    """A key sorting strictly between lo and hi, where None is an open end
+
+    Keys are base-62 fractions (digits after the point, no trailing zero),
+    so there's always room for another key between two neighbours.
+    """
+    lo = lo or ""
+    if hi is not None and lo >= hi:
+        raise ValueError(f"No sort key between {lo!r} and {hi!r}")
+    prefix = ""
+    if hi is not None:
+        n = 0
+        while n < len(hi) and (lo[n] if n < len(lo) else "0") == hi[n]:
+            n += 1
+        prefix, lo, hi = hi[:n], lo[n:], hi[n:]
+    a = SORT_KEY_DIGITS.index(lo[0]) if lo else 0
+    b = SORT_KEY_DIGITS.index(hi[0]) if hi else len(SORT_KEY_DIGITS)
+    if b - a > 1:
+        return prefix + SORT_KEY_DIGITS[(a + b) // 2]
+    if hi and len(hi) > 1:
+        return prefix + hi[0]
+    return prefix + SORT_KEY_DIGITS[a] + sort_key_between(lo[1:], None)
+
+def spread_sort_keys(n):
+    """n evenly spaced, shortest-width ascending keys"""
+    base = len(SORT_KEY_DIGITS)
+    width = 1
+    while base ** width <= n:
+        width += 1
+    keys = []
+    for i in range(1, n + 1):
+        value = i * base ** width // (n + 1)
+        digits = []
+        for _ in range(width):
+            value, d = divmod(value, base)
+            digits.append(SORT_KEY_DIGITS[d])
+        keys.append("".join(reversed(digits)).rstrip("0"))
+    return keys
+
+def sort_key_order(projects, index):
+    # Keyless projects sort after keyed ones, in list order (as build.js does)
+    return (projects[index].get("sortKey") or "~", index)
+
+def category_order(projects, indices):
+    """The given project indices in their category display order"""
+    return sorted(indices, key=lambda i: sort_key_order(projects, i))
+
+def respread_sort_keys(projects, indices):
+    """Re-key projects (in display order) with short evenly spaced keys"""
+    for i, key in zip(indices, spread_sort_keys(len(indices))):
+        projects[i]["sortKey"] = key
+
+def assign_sort_keys(projects):
+    """Key projects that have no sortKey, after the rest of their category
+
+    Returns the indices that changed. A category that has no keys at all
+    (a catalogue from before sort keys) keeps its list order.
+    """
+    members = {}
+    for i, p in enumerate(projects):
+        members.setdefault(p["category"], []).append(i)
+    changed = []
+    for indices in members.values():
+        keyless = [i for i in indices if not projects[i].get("sortKey")]
+        if not keyless:
+            continue
+        if len(keyless) == len(indices):
+            respread_sort_keys(projects, indices)
+            changed.extend(indices)
+            continue
+        ordered = category_order(projects, indices)
+        key = max((projects[i]["sortKey"] for i in indices if projects[i].get("sortKey")), default=None)
+        for i in keyless:
+            key = sort_key_between(key, None)
+            if len(key) > SORT_KEY_MAX_LEN:
+                respread_sort_keys(projects, ordered)
+                changed.extend(indices)
+                break
+            projects[i]["sortKey"] = key
+        else:
+            changed.extend(keyless)
+    return changed
+
+def sort_key_for_move(projects, members, position, target):
+    """Key that places members[position] at members[target], or None if there's no room
+
+    members is a category's indices in display order; only the moved
+    project's key changes.
+    """
+    if target > position:
+        lo, hi = members[target], members[target + 1] if target + 1 < len(members) else None
+    else:
+        lo, hi = members[target - 1] if target > 0 else None, members[target]
+    lo_key = projects[lo]["sortKey"] if lo is not None else None
+    hi_key = projects[hi]["sortKey"] if hi is not None else None
+    try:
+        key = sort_key_between(lo_key, hi_key)
+    except ValueError:
+        return None  # Tied keys, e.g. from a hand-edited catalogue
+    return key if len(key) <= SORT_KEY_MAX_LEN else None
+
+def load_ui_state():
+    try:
+        with open(UI_STATE_JSON, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_ui_state(state):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(UI_STATE_JSON, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+def create_rounded_rectangle(canvas, x1, y1, x2, y2, radius=10, **kwargs):
+    points = [
+        x1+radius, y1,
+        x1+radius, y1,
+        x2-radius, y1,
+        x2-radius, y1,
+        x2, y1,
+        x2, y1+radius,
+        x2, y1+radius,
+        x2, y2-radius,
+        x2, y2-radius,
+        x2, y2,
+        x2-radius, y2,
+        x2-radius, y2,
+        x1+radius, y2,
+        x1+radius, y2,
+        x1, y2,
+        x1, y2-radius,
+        x1, y2-radius,
+        x1, y1+radius,
+        x1, y1+radius,
+        x1, y1
+    ]
+    return canvas.create_polygon(points, **kwargs, smooth=True)
+
+def image_nbytes(img):
+    """Approximate pixel buffer size of a PIL image"""
+    return img.width * img.height * len(img.getbands())
+
+def photo_nbytes(photo):
+    # Tk keeps PhotoImages as 32-bit RGBA blocks
+    return photo.width() * photo.height() * 4
+
+def deep_sizeof(obj, _seen=None):
+    """Recursive sys.getsizeof over JSON-like containers"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, ProjectRecord):
+        size += sum(deep_sizeof(v, _seen) for v in obj.to_dict().values())
+    elif isinstance(obj, dict):
+        size += sum(deep_sizeof(k, _seen) + deep_sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_sizeof(v, _seen) for v in obj)
+    return size
+
+# =====================
+# PROJECT RECORDS
+# =====================
+_SHAPES = {}  # Interned key-order tuples, shared by every record with the same keys
+
+def _freeze_value(v):
+    if type(v) is list:
+        return tuple(_freeze_value(x) for x in v)
+    if type(v) is dict:
+        return types.MappingProxyType({k: _freeze_value(x) for k, x in v.items()})
+    return v
+
+def _thaw_value(v):
+    if type(v) is tuple:
+        return [_thaw_value(x) for x in v]
+    if type(v) is types.MappingProxyType:
+        return {k: _thaw_value(x) for k, x in v.items()}
+    return v
+
+class ProjectRecord(collections.abc.MutableMapping):
+    """A project with one slot per known field instead of a per-record dict.
+
+    Behaves like the dict it was loaded from, key order and unknown keys
+    included, so callers and the projects.json schema are unchanged.
+    Category ids and other low-cardinality fields are interned, so records
+    share one string per distinct value.
+
+    freeze() returns an immutable (keys, values) snapshot that is cached
+    until the record changes, so undo history shares unchanged records
+    between snapshots instead of copying them. Reads keep the cache, so a
+    list or dict value (e.g. gallery) must only be changed in place through
+    mutable(), which drops it; otherwise assign a new value.
+    """
+    FIELDS = ("id", "title", "category", "vimeoId", "youtubeId", "thumbnail", "client", "role",
+              "production", "description", "year", "gallery", "created", "updated", "sortKey",
+              "thumbnailPlaceholder", "galleryPlaceholders", "thumbnailCrop")
+    __slots__ = FIELDS + ("_keys", "_extra", "_frozen")
+    _SLOTS = frozenset(FIELDS)
+    _INTERNED = frozenset(("category", "role", "client", "production", "year"))
+
+    def __init__(self, data=()):
+        self._keys = ()
+        self._extra = None
+        self._frozen = None
+        for k, v in dict(data).items():
+            self[k] = v
+
+    @classmethod
+    def from_dict(cls, data):
+        if type(data) is cls:
+            return data
+        r = cls.__new__(cls)
+        keys = tuple(data)
+        r._keys = _SHAPES.setdefault(keys, keys)
+        r._extra = None
+        r._frozen = None
+        for k, v in data.items():
+            r._set(k, v)
+        return r
+
+    def _set(self, key, value):
+        if key in self._INTERNED and type(value) is str:
+            value = sys.intern(value)
+        if key in self._SLOTS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def _get(self, key):
+        if key in self._SLOTS:
+            return getattr(self, key)
+        return self._extra[key]
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        return self._get(key)
+
+    def mutable(self, key):
+        """self[key] for changing in place, e.g. gallery.append(); drops the frozen cache"""
+        value = self[key]
+        self._frozen = None
+        return value
+
+    def __setitem__(self, key, value):
+        self._set(key, value)
+        if key not in self._keys:
+            keys = self._keys + (key,)
+            self._keys = _SHAPES.setdefault(keys, keys)
+        self._frozen = None
+
+    def __delitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        if key in self._SLOTS:
+            delattr(self, key)
+        else:
+            del self._extra[key]
+        keys = tuple(k for k in self._keys if k != key)
+        self._keys = _SHAPES.setdefault(keys, keys)
+        self._frozen = None
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __eq__(self, other):
+        if isinstance(other, ProjectRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, collections.abc.Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ProjectRecord({self.to_dict()!r})"
+
+    def to_dict(self):
+        """The projects.json form; values are not copied"""
+        return {k: self._get(k) for k in self._keys}
+
+    def freeze(self):
+        if self._frozen is None:
+            self._frozen = (self._keys, tuple(_freeze_value(self._get(k)) for k in self._keys))
+        return self._frozen
+
+    @classmethod
+    def thaw(cls, frozen):
+        keys, values = frozen
+        r = cls.__new__(cls)
+        r._keys = keys
+        r._extra = None
+        for k, v in zip(keys, values):
+            r._set(k, _thaw_value(v))
+        r._frozen = frozen  # Content matches, so the next snapshot reuses it
+        return r
+
+    def __deepcopy__(self, memo):
+        return self.thaw(self.freeze())
+
+    def __reduce__(self):
+        return ProjectRecord.from_dict, (self.to_dict(),)
+
+    @classmethod
+    def snapshot(cls, projects):
+        """Copy-on-write snapshot of a project list: (frozen records, bytes newly allocated).
+
+        Plain dicts in the list (new or merged-in projects) are converted in place.
+        """
+        frozen = []
+        new_bytes = 0
+        for i, p in enumerate(projects):
+            if type(p) is not cls:
+                p = projects[i] = cls.from_dict(p)
+            if p._frozen is None:
+                new_bytes += deep_sizeof(p.freeze())
+            frozen.append(p._frozen)
+        frozen = tuple(frozen)
+        return frozen, new_bytes + sys.getsizeof(frozen)
+
+    @classmethod
+    def restore(cls, snapshot, live=()):
+        """Records for a snapshot, reusing live records whose frozen state is identical"""
+        unchanged = {id(p._frozen): p for p in live
+                     if type(p) is cls and p._frozen is not None}
+        return [unchanged.get(id(f)) or cls.thaw(f) for f in snapshot]
+
+# =====================
+# PREVIEW CACHE
+# =====================
+class ImageCache:
+    """Byte-accounted LRU of decoded preview images.
+
+    Keys start with the source path so every variant of a file can be
+    invalidated together.
+    """
+    def __init__(self):
+        self.entries = collections.OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            img = self.entries.get(key)
+            if img is not None:
+                self.entries.move_to_end(key)
+            return img
+
+    def put(self, key, img):
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= image_nbytes(old)
+            self.entries[key] = img
+            self.bytes += image_nbytes(img)
+
+    def evict_to(self, max_bytes):
+        """Drop least recently used entries until under max_bytes; returns bytes freed"""
+        freed = 0
+        with self.lock:
+            while self.entries and self.bytes > max_bytes:
+                _, img = self.entries.popitem(last=False)
+                n = image_nbytes(img)
+                self.bytes -= n
+                freed += n
+        return freed
+
+    def invalidate(self, path):
+        with self.lock:
+            for key in [k for k in self.entries if k[0] == path]:
+                self.bytes -= image_nbytes(self.entries.pop(key))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+PREVIEW_CACHE = ImageCache()
+
+@functools.lru_cache(maxsize=SHADOW_CACHE_SIZE)
+def shadow_layer(width, height, radius=SHADOW_RADIUS, offset=SHADOW_OFFSET):
+    """Blurred drop-shadow canvas for an image of the given size.
+
+    The shadow only depends on dimensions, so it's blurred once per size and
+    callers copy it before pasting their image on top.
+    """
+    layer = Image.new('RGBA', (width + offset * 2, height + offset * 2), (0, 0, 0, 0))
+    ImageDraw.Draw(layer).rectangle([offset, offset, width + offset, height + offset],
+                                    fill=(0, 0, 0, SHADOW_ALPHA))
+    return layer.filter(ImageFilter.GaussianBlur(radius))
+
+def with_shadow(img, radius=SHADOW_RADIUS, offset=SHADOW_OFFSET):
+    canvas = shadow_layer(img.width, img.height, radius, offset).copy()
+    canvas.paste(img, (offset, offset), img if img.mode == 'RGBA' else None)
+    return canvas
+
+def thumbnail_target_size(width, height):
+    """Preview size for a thumbnail, decided from its dimensions alone"""
+    # Wide (landscape) images are scaled to fit the ~470px container width,
+    # using 450px to leave some margin
+    if width > height * 1.3:  # More than 30% wider than tall
+        return WIDE_THUMBNAIL_WIDTH, int(WIDE_THUMBNAIL_WIDTH * height / width)
+    # Portrait/square images use standard thumbnail sizing
+    scale = min(THUMBNAIL_SIZE[0] / width, THUMBNAIL_SIZE[1] / height, 1)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def render_thumbnail_preview(img_path, size):
+    with PROFILER.span("load_thumbnail.decode", "io"):
+        img = Image.open(img_path)
+        img = img.resize(size, Image.Resampling.LANCZOS)
+
+    # Add subtle shadow effect
+    with PROFILER.span("load_thumbnail.shadow"):
+        return with_shadow(img)
+
+def render_gallery_preview(img_path):
+    img = Image.open(img_path)
+    img.thumbnail(GALLERY_SIZE, Image.Resampling.LANCZOS)
+    return img
+
+def gallery_target_size(width, height):
+    scale = min(GALLERY_SIZE[0] / width, GALLERY_SIZE[1] / height, 1)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def preview_size(meta, variant):
+    """Final on-screen size of a preview, from indexed dimensions alone"""
+    if variant == "thumbnail":
+        w, h = thumbnail_target_size(meta["width"], meta["height"])
+        return w + SHADOW_OFFSET * 2, h + SHADOW_OFFSET * 2
+    return gallery_target_size(meta["width"], meta["height"])
+
+def preview_key(path, variant):
+    # mtime makes edited files miss instead of serving a stale preview
+    return (path, os.path.getmtime(path), variant)
+
+def placeholder_path(key):
+    return os.path.join(PLACEHOLDER_DIR, sha1_text(repr(key)) + ".png")
+
+def store_placeholder(key, img):
+    """Keep a tiny copy of a finished preview to show next time while it re-renders"""
+    try:
+        os.makedirs(PLACEHOLDER_DIR, exist_ok=True)
+        tiny = img.resize((max(1, img.width // PLACEHOLDER_SCALE),
+                           max(1, img.height // PLACEHOLDER_SCALE)), Image.Resampling.BILINEAR)
+        tiny.save(placeholder_path(key))
+    except Exception as e:
+        print(f"Error storing placeholder: {e}")
+
+def render_placeholder(path, key, size, variant):
+    """Cheapest available stand-in at the final preview size.
+
+    In order: the stored tiny copy of a previous render, a JPEG draft-mode
+    decode (DCT scaling, a fraction of a full decode), or a flat card.
+    """
+    try:
+        with Image.open(placeholder_path(key)) as tiny:
+            return tiny.resize(size, Image.Resampling.BILINEAR)
+    except OSError:
+        pass
+
+    try:
+        with Image.open(path) as img:
+            if img.format == "JPEG":
+                img.draft("RGB", size)
+                if variant == "thumbnail":
+                    inner = (size[0] - SHADOW_OFFSET * 2, size[1] - SHADOW_OFFSET * 2)
+                    return with_shadow(img.resize(inner, Image.Resampling.BILINEAR))
+                return img.resize(size, Image.Resampling.BILINEAR)
+    except Exception as e:
+        print(f"Error drafting placeholder for {path}: {e}")
+
+    return Image.new("RGB", size, COLORS["border"])
+
+# =====================
+# GALLERY ATLAS
+# =====================
+class GalleryAtlas:
+    """One sprite sheet of a project's gallery previews plus an offset index.
+
+    Cells are GALLERY_SIZE and keyed by gallery path rather than position,
+    so reordering costs nothing. sync() only decodes stills that are new or
+    changed on disk; kept cells are copied across from the old sheet when
+    it's re-packed. Index entries record the source mtime/size so stale
+    cells are never served. Atlases are filed by category as well as id,
+    since the same id can appear in two categories.
+    """
+    def __init__(self, category, project_id, root=ATLAS_DIR):
+        self.key = (category, project_id)
+        self.sheet_path = os.path.join(root, category, f"{project_id}.png")
+        self.index_path = os.path.join(root, category, f"{project_id}.json")
+        self.entries = {}  # gallery rel path -> {"slot", "width", "height", "mtime", "bytes"}
+        self.sheet = None
+        self.lock = threading.Lock()       # Guards entries/sheet for lookups
+        self.sync_lock = threading.Lock()  # One sync at a time
+
+    def load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)["entries"]
+            with Image.open(self.sheet_path) as sheet:
+                self.sheet = sheet.copy()  # The single decode for the whole gallery
+        except (OSError, ValueError, KeyError):
+            self.entries, self.sheet = {}, None
+        return self
+
+    @staticmethod
+    def cell_origin(slot):
+        return (slot % ATLAS_COLUMNS) * GALLERY_SIZE[0], (slot // ATLAS_COLUMNS) * GALLERY_SIZE[1]
+
+    @staticmethod
+    def _fresh(entry, st):
+        return entry is not None and entry["mtime"] == st.st_mtime and entry["bytes"] == st.st_size
+
+    def lookup(self, rel, path):
+        """The still's preview cropped from the sheet, or None if missing or stale"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self.lock:
+            entry = self.entries.get(rel)
+            if self.sheet is None or not self._fresh(entry, st):
+                return None
+            x, y = self.cell_origin(entry["slot"])
+            return self.sheet.crop((x, y, x + entry["width"], y + entry["height"]))
+
+    @profiled("GalleryAtlas.sync", "io")
+    def sync(self, gallery, render=render_gallery_preview):
+        """Bring the sheet up to date with a gallery; returns the number of cells rendered"""
+        with self.sync_lock:
+            stats = {}
+            for rel in gallery:
+                try:
+                    stats[rel] = os.stat(os.path.join(GALLERY_DIR, rel))
+                except OSError:
+                    pass
+            with self.lock:
+                stale = [rel for rel, st in stats.items() if not self._fresh(self.entries.get(rel), st)]
+                removed = [rel for rel in self.entries if rel not in stats]
+            if not stale and not removed and self.sheet is not None:
+                return 0
+
+            # Decode outside the lock so lookups on the Tk thread never wait on it
+            rendered = {}
+            for rel in stale:
+                try:
+                    rendered[rel] = render(os.path.join(GALLERY_DIR, rel))
+                except Exception as e:
+                    print(f"Error adding {rel} to gallery atlas: {e}")
+
+            with self.lock:
+                # Stills that changed but failed to render drop out rather than going stale
+                entries = {rel: e for rel, e in self.entries.items()
+                           if rel in stats and (rel in rendered or rel not in stale)}
+                sources = {rel: self.cell_origin(e["slot"]) for rel, e in entries.items()
+                           if rel not in rendered}
+                # Re-pack into the first cells, copying kept cells from the old sheet
+                for slot, rel in enumerate(sorted(set(entries) | set(rendered))):
+                    img = rendered.get(rel)
+                    size = img.size if img is not None else (entries[rel]["width"], entries[rel]["height"])
+                    st = stats[rel]
+                    entries[rel] = {"slot": slot, "width": size[0], "height": size[1],
+                                    "mtime": st.st_mtime, "bytes": st.st_size}
+                rows = max(1, -(-len(entries) // ATLAS_COLUMNS))
+                sheet = Image.new("RGBA", (ATLAS_COLUMNS * GALLERY_SIZE[0], rows * GALLERY_SIZE[1]))
+                for rel, e in entries.items():
+                    origin = self.cell_origin(e["slot"])
+                    if rel in rendered:
+                        sheet.paste(rendered[rel].convert("RGBA"), origin)
+                    elif self.sheet is not None:
+                        x, y = sources[rel]
+                        sheet.paste(self.sheet.crop((x, y, x + e["width"], y + e["height"])), origin)
+                self.entries, self.sheet = entries, sheet
+
+            self._save()
+            return len(rendered)
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.sheet_path), exist_ok=True)
+        tmp = f"{self.sheet_path}.tmp"
+        self.sheet.save(tmp, format="PNG", compress_level=1)
+        os.replace(tmp, self.sheet_path)
+        write_text(self.index_path, dump_json({"version": 1, "cell": list(GALLERY_SIZE),
+                                               "columns": ATLAS_COLUMNS, "entries": self.entries}))
+
+# =====================
+# IMAGE PYRAMID
+# =====================
+class ImagePyramid:
+    """Raw RGB levels of one image on disk, each half the size of the last.
+
+    Level 0 is full resolution. Levels are plain uint8 arrays read through
+    np.memmap, so reading a tile only pages in the rows it touches and the
+    OS, not the process, holds the rest. The directory name includes the
+    source mtime/size, so an edited image gets a fresh pyramid.
+    """
+    def __init__(self, path, root=PYRAMID_DIR):
+        st = os.stat(path)
+        self.path = path
+        self.root = root
+        self.dir = os.path.join(root, sha1_text(f"{os.path.abspath(path)}|{st.st_mtime}|{st.st_size}"))
+        self.levels = []  # [(width, height)] from full resolution down
+        self.maps = {}
+
+    def level_path(self, level, root=None):
+        return os.path.join(root or self.dir, f"level-{level}.rgb")
+
+    def open(self):
+        """Read the level table if the pyramid exists; returns whether it does"""
+        try:
+            with open(os.path.join(self.dir, "levels.json"), "r", encoding="utf-8") as f:
+                self.levels = [tuple(size) for size in json.load(f)]
+            os.utime(self.dir)  # Recently viewed pyramids survive pruning
+            return True
+        except (OSError, ValueError):
+            return False
+
+    @profiled("ImagePyramid.build", "io")
+    def build(self):
+        """Decode the source once and write every level; safe to call from a worker"""
+        if self.open():
+            return self
+        tmp = f"{self.dir}.{threading.get_ident()}.tmp"
+        os.makedirs(tmp, exist_ok=True)
+        levels = []
+        with Image.open(self.path) as img:
+            img = img.convert("RGB")
+            while True:
+                mm = np.memmap(self.level_path(len(levels), tmp), dtype=np.uint8, mode="w+",
+                               shape=(img.height, img.width, 3))
+                mm[:] = np.asarray(img)
+                mm.flush()
+                del mm
+                levels.append((img.width, img.height))
+                if max(img.size) <= TILE_SIZE:
+                    break
+                img = img.reduce(2)
+        with open(os.path.join(tmp, "levels.json"), "w", encoding="utf-8") as f:
+            json.dump(levels, f)
+        try:
+            os.replace(tmp, self.dir)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)  # Another build won the race
+        prune_pyramids(self.root, keep=self.dir)
+        self.open()
+        return self
+
+    def level_map(self, level):
+        if level not in self.maps:
+            w, h = self.levels[level]
+            self.maps[level] = np.memmap(self.level_path(level), dtype=np.uint8, mode="r", shape=(h, w, 3))
+        return self.maps[level]
+
+    def tile(self, level, col, row):
+        x, y = col * TILE_SIZE, row * TILE_SIZE
+        return Image.fromarray(np.ascontiguousarray(
+            self.level_map(level)[y:y + TILE_SIZE, x:x + TILE_SIZE]))
+
+    def close(self):
+        self.maps.clear()
+
+def prune_pyramids(root=PYRAMID_DIR, max_bytes=PYRAMID_MAX_BYTES, keep=None):
+    """Delete least recently viewed pyramids until the cache fits max_bytes"""
+    try:
+        dirs = [os.path.join(root, d) for d in os.listdir(root) if not d.endswith(".tmp")]
+    except OSError:
+        return
+    sizes = {d: sum(e.stat().st_size for e in os.scandir(d)) for d in dirs if os.path.isdir(d)}
+    total = sum(sizes.values())
+    for d in sorted(sizes, key=os.path.getmtime):
+        if total <= max_bytes:
+            break
+        if d != keep:
+            shutil.rmtree(d, ignore_errors=True)
+            total -= sizes[d]
+
+# =====================
+# CATALOGUE STORAGE
+# =====================
+class JsonStore:
+    """The original single-file projects.json catalogue"""
+    name = "json"
+
+    def __init__(self, path=PROJECTS_JSON):
+        self.path = path
+
+    def load(self):
+        return load_data(self.path)
+
+    def save(self, data):
+        save_data(data, self.path)
+
+    def read_disk(self):
+        return self.load()
+
+    def watch_paths(self):
+        return [self.path], []
+
+class ShardedStore:
+    """One JSON file per project under data/projects/ plus a manifest.
+
+    The manifest holds category definitions and project order. Saves only
+    rewrite shards whose content changed, and regenerate the aggregate
+    projects.json for build.js only when something was written. If the
+    aggregate is edited externally (e.g. by scripts/), its hash no longer
+    matches the manifest and it's treated as the source on the next load.
+    """
+    name = "sharded"
+
+    def __init__(self, shard_dir=PROJECTS_SHARD_DIR, manifest=PROJECTS_MANIFEST,
+                 aggregate=PROJECTS_JSON):
+        self.shard_dir = shard_dir
+        self.manifest_path = manifest
+        self.aggregate_path = aggregate
+        # Shards are keyed by project_keys(), so repeated ids get their own file
+        self.written = {}     # key -> shard text last read or written
+        self.stat_cache = {}  # key -> ((mtime, size), project)
+        self.manifest = None
+
+    def shard_path(self, key):
+        return os.path.join(self.shard_dir, f"{key}.json")
+
+    @profiled("ShardedStore.load", "io")
+    def load(self):
+        if not os.path.exists(self.manifest_path):
+            # First run in sharded mode: split the existing aggregate
+            data = load_data(self.aggregate_path)
+            self.save(data)
+            return data
+
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+
+        with concurrent.futures.ThreadPoolExecutor(INDEX_WORKERS) as pool:
+            projects = list(pool.map(self._read_shard, self.manifest["order"]))
+        if self._aggregate_edited():
+            # Shards were still read so the next save only rewrites real changes
+            return load_data(self.aggregate_path)
+        return {"categories": self.manifest["categories"],
+                "projects": [p for p in projects if p is not None]}
+
+    @profiled("ShardedStore.save", "io")
+    def save(self, data):
+        """Write changed shards; returns the number of files written"""
+        os.makedirs(self.shard_dir, exist_ok=True)
+        written = 0
+        ids = project_keys(data["projects"])
+        for key, p in zip(ids, data["projects"]):
+            text = dump_json(p)
+            if self.written.get(key) != text:
+                write_text(self.shard_path(key), text)
+                self.written[key] = text
+                written += 1
+
+        for stale in set(self.written) - set(ids):
+            try:
+                os.remove(self.shard_path(stale))
+            except OSError:
+                pass
+            del self.written[stale]
+            self.stat_cache.pop(stale, None)
+            written += 1
+
+        layout = {"categories": data["categories"], "order": ids}
+        manifest_changed = self.manifest is None or any(
+            self.manifest.get(k) != v for k, v in layout.items())
+
+        if written or manifest_changed or self._aggregate_edited():
+            aggregate = dump_json(data)
+            write_text(self.aggregate_path, aggregate)
+            self.manifest = dict(layout, version=1, aggregateSha1=sha1_text(aggregate))
+            write_text(self.manifest_path, dump_json(self.manifest))
+            written += 2
+        return written
+
+    def read_disk(self):
+        return self.load()
+
+    def watch_paths(self):
+        return [self.aggregate_path], [self.shard_dir]
+
+    def _aggregate_edited(self):
+        try:
+            with open(self.aggregate_path, "r", encoding="utf-8") as f:
+                return sha1_text(f.read()) != self.manifest.get("aggregateSha1")
+        except OSError:
+            return False
+
+    def _read_shard(self, key):
+        path = self.shard_path(key)
+        try:
+            st = os.stat(path)
+            stamp = (st.st_mtime, st.st_size)
+            cached = self.stat_cache.get(key)
+            if cached and cached[0] == stamp:
+                return copy.deepcopy(cached[1])
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError as e:
+            print(f"Error reading project shard {path}: {e}")
+            return None
+        project = json.loads(text)
+        self.written[key] = text
+        self.stat_cache[key] = (stamp, project)
+        return copy.deepcopy(project)
+
+class SqliteStore:
+    """Catalogue kept in SQLite (WAL) with indexed and full-text queries.
+
+    projects.json stays the file of record for git and build.js: every save
+    that changes rows re-exports it, and if it's edited externally (hash
+    differs from the last export) the next load re-imports it.
+
+    Rows carry their list position, so search/filter queries return
+    indices into the in-memory project list. Search matches the same
+    substrings as filter_projects, through a trigram full-text index when
+    SQLite has one (terms of 3+ characters) and instr() otherwise, so the
+    search box behaves the same on every backend. sync() pushes unsaved
+    in-memory edits into the database without exporting. Saves run as
+    background jobs, so the connection is shared across threads under a lock.
+    """
+    name = "sqlite"
+
+    def __init__(self, path=CATALOGUE_DB, aggregate=PROJECTS_JSON):
+        self.path = path
+        self.aggregate_path = aggregate
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        # key -> (position, text) as stored, used to skip unchanged rows
+        self.rows = {key: (pos, text) for key, pos, text in
+                     self.db.execute("SELECT key, position, data FROM projects")}
+        if self.rows and self.db.execute("SELECT 1 FROM projects_search LIMIT 1").fetchone() is None:
+            # A database from before projects_search existed
+            with self.db:
+                self.db.executemany("INSERT INTO projects_search (key, searchable) VALUES (?, ?)",
+                                    [(key, search_text(json.loads(text)))
+                                     for key, (_pos, text) in self.rows.items()])
+
+    def _create_schema(self):
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS projects (
+                key TEXT PRIMARY KEY,
+                id TEXT NOT NULL,
+                category TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS projects_id ON projects(id);
+            CREATE INDEX IF NOT EXISTS projects_category_position ON projects(category, position);
+            CREATE INDEX IF NOT EXISTS projects_position ON projects(position);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        """)
+        self.db.execute("DROP TABLE IF EXISTS projects_fts")  # Word-prefix index, replaced by projects_search
+        try:
+            self.db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS projects_search "
+                            "USING fts5(key UNINDEXED, searchable, tokenize='trigram')")
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite without FTS5 or its trigram tokenizer (3.34+): same table, scanned with instr()
+            self.db.execute("CREATE TABLE IF NOT EXISTS projects_search (key TEXT PRIMARY KEY, searchable TEXT)")
+            self.has_fts = False
+        self.db.commit()
+
+    def _meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @profiled("SqliteStore.load", "io")
+    def load(self):
+        try:
+            with open(self.aggregate_path, "r", encoding="utf-8") as f:
+                aggregate = f.read()
+        except OSError:
+            aggregate = None
+
+        with self.lock:
+            if aggregate is not None and sha1_text(aggregate) != self._meta("aggregateSha1"):
+                # First run, or projects.json edited outside the CMS
+                data = json.loads(aggregate)
+                self._write(data)
+                self._set_meta("aggregateSha1", sha1_text(aggregate))
+                self.db.commit()
+                return data
+
+            rows = sorted(self.rows.values())
+            return {"categories": json.loads(self._meta("categories") or "[]"),
+                    "projects": [json.loads(text) for _pos, text in rows]}
+
+    def read_disk(self):
+        # The exported file, not the database, which may hold synced unsaved edits
+        return load_data(self.aggregate_path)
+
+    @profiled("SqliteStore.save", "io")
+    def save(self, data):
+        with self.lock:
+            changed = self._write(data)
+            if changed or not os.path.exists(self.aggregate_path):
+                aggregate = dump_json(data)
+                write_text(self.aggregate_path, aggregate)
+                self._set_meta("aggregateSha1", sha1_text(aggregate))
+            self.db.commit()
+        return changed
+
+    def sync(self, projects):
+        """Mirror unsaved in-memory edits so queries see them"""
+        with self.lock:
+            changed = self._write({"projects": projects})
+            self.db.commit()
+        return changed
+
+    def _write(self, data):
+        """Upsert rows whose position or JSON changed; returns the number of rows touched"""
+        keys = project_keys(data["projects"])
+        upserts = []
+        for pos, (key, p) in enumerate(zip(keys, data["projects"])):
+            text = json.dumps(p, default=json_default)
+            if self.rows.get(key) != (pos, text):
+                upserts.append((key, p, pos, text))
+        removed = set(self.rows) - set(keys)
+
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO projects (key, id, category, position, data) VALUES (?, ?, ?, ?, ?)",
+                [(key, p["id"], p.get("category", ""), pos, text) for key, p, pos, text in upserts])
+            self.db.executemany("DELETE FROM projects WHERE key = ?", [(k,) for k in removed])
+            stale = [(key,) for key, *_ in upserts] + [(k,) for k in removed]
+            self.db.executemany("DELETE FROM projects_search WHERE key = ?", stale)
+            self.db.executemany("INSERT INTO projects_search (key, searchable) VALUES (?, ?)",
+                                [(key, search_text(p)) for key, p, _pos, _text in upserts])
+            if "categories" in data:
+                self._set_meta("categories", json.dumps(data["categories"]))
+
+        for key, _p, pos, text in upserts:
+            self.rows[key] = (pos, text)
+        for k in removed:
+            del self.rows[k]
+        return len(upserts) + len(removed)
+
+    def search(self, term, category=None):
+        """List positions matching a free-text term and/or category, in order"""
+        sql = "SELECT p.position FROM projects p"
+        args = []
+        where = []
+        if term:
+            term = term.lower()
+            sql += " JOIN projects_search s ON s.key = p.key"
+            if self.has_fts and len(term) >= 3:
+                # One quoted string is a plain substring to the trigram index, operators and all
+                where.append("projects_search MATCH ?")
+                args.append('"{}"'.format(term.replace('"', '""')))
+            else:
+                where.append("instr(s.searchable, ?) > 0")
+                args.append(term)
+        if category:
+            where.append("p.category = ?")
+            args.append(category)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY p.position"
+        with self.lock:
+            return [row[0] for row in self.db.execute(sql, args)]
+
+    def has_id(self, project_id):
+        with self.lock:
+            return self.db.execute("SELECT 1 FROM projects WHERE id = ? LIMIT 1",
+                                   (project_id,)).fetchone() is not None
+
+    def watch_paths(self):
+        return [self.aggregate_path], []
+
+def open_store(mode=STORAGE_MODE):
+    if mode == "sqlite":
+        return SqliteStore()
+    if mode == "sharded" or (mode == "auto" and os.path.exists(PROJECTS_MANIFEST)):
+        return ShardedStore()
+    return JsonStore()
+
+# =====================
+# IMAGE METADATA INDEX
+# =====================
+def read_image_header(path):
+    """Dimensions, format and mode without decoding pixel data"""
+    st = os.stat(path)
+    with Image.open(path) as img:
+        return {
+            "width": img.width,
+            "height": img.height,
+            "format": img.format,
+            "mode": img.mode,
+            "bytes": st.st_size,
+            "mtime": st.st_mtime,
+        }
+
+class ImageIndex:
+    """Persistent sidecar of image metadata for everything under images/.
+
+    Entries are keyed by path relative to the images root and refreshed
+    incrementally: only files whose mtime or size changed are re-read.
+    Jobs read the index while the Tk thread updates it, so mutations hold
+    the lock and anything iterating off the Tk thread uses snapshot().
+    Mutations only mark the index dirty; flush() writes them in one go.
+    """
+    def __init__(self, root=IMAGES_DIR, path=IMAGE_INDEX_JSON):
+        self.root = root
+        self.path = path
+        self.entries = {}
+        self.lock = threading.RLock()
+        self.dirty = False
+
+    def key(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self.lock:
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+            self.dirty = False
+
+    def flush(self):
+        """Write the index if anything changed since it was last written"""
+        with self.lock:
+            if self.dirty:
+                self.save()
+
+    def scan(self):
+        """Map of index key -> os.stat_result for every image on disk"""
+        found = {}
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    path = os.path.join(dirpath, name)
+                    found[self.key(path)] = os.stat(path)
+        return found
+
+    @profiled("ImageIndex.refresh", "io")
+    def refresh(self):
+        """Bring the index up to date with disk and write it; returns the keys that changed"""
+        changed = self.apply(*self.changes())
+        self.flush()
+        return changed
+
+    @profiled("ImageIndex.changes", "io")
+    def changes(self):
+        """(fresh entries, removed keys) versus disk, without touching the index.
+
+        Safe to run as a job while the Tk thread reads the index; apply()
+        the result on the Tk thread.
+        """
+        entries = self.snapshot()
+        on_disk = self.scan()
+        stale = [k for k, st in on_disk.items()
+                 if k not in entries
+                 or "sha1" not in entries[k]
+                 or entries[k]["mtime"] != st.st_mtime
+                 or entries[k]["bytes"] != st.st_size]
+        removed = [k for k in entries if k not in on_disk]
+
+        fresh = {}
+        with concurrent.futures.ThreadPoolExecutor(INDEX_WORKERS) as pool:
+            paths = [os.path.join(self.root, k) for k in stale]
+            for k, meta in zip(stale, pool.map(self._read, paths)):
+                if meta is not None:
+                    fresh[k] = meta
+        return fresh, removed
+
+    def apply(self, fresh, removed):
+        with self.lock:
+            for k in removed:
+                self.entries.pop(k, None)
+            self.entries.update(fresh)
+            if fresh or removed:
+                self.dirty = True
+        return list(fresh) + list(removed)
+
+    def update(self, path, meta=None):
+        """Re-read a single file after it was copied in or changed (or record meta read by a job)"""
+        if meta is None:
+            meta = self._read(path)
+        if meta is not None:
+            with self.lock:
+                self.entries[self.key(path)] = meta
+                self.dirty = True
+        return meta
+
+    def get(self, path):
+        return self.entries.get(self.key(path))
+
+    def discard(self, path):
+        with self.lock:
+            if self.entries.pop(self.key(path), None) is not None:
+                self.dirty = True
+
+    def snapshot(self):
+        """A copy of the entries that's safe to iterate while the index changes"""
+        with self.lock:
+            return dict(self.entries)
+
+    def oversized(self, budget=IMAGE_SIZE_BUDGET):
+        entries = self.snapshot()
+        return sorted((k for k, meta in entries.items() if meta["bytes"] > budget),
+                      key=lambda k: entries[k]["bytes"], reverse=True)
+
+    @staticmethod
+    def _read(path):
+        try:
+            meta = read_image_header(path)
+            meta["sha1"] = sha1_file(path)  # Content hash for the build change manifest
+            return meta
+        except Exception as e:
+            print(f"Error indexing image {path}: {e}")
+            return None
+
+# =====================
+# BUILD CHANGE MANIFEST
+# =====================
+def catalogue_state(data, image_index):
+    """Content hashes of everything build.js renders from: projects, category pages, images"""
+    categories = {c["id"]: c for c in data["categories"]}
+    keys = project_keys(data["projects"])
+    projects = {}
+    members = collections.defaultdict(list)
+    for i, (key, p) in enumerate(zip(keys, data["projects"])):
+        slug = categories.get(p.get("category"), {}).get("slug", p.get("category", ""))
+        projects[key] = {
+            "id": p["id"],
+            "category": p.get("category", ""),
+            "page": f"{slug}/{p['id']}",
+            "sha1": sha1_text(json.dumps(p, sort_keys=True, default=json_default)),
+        }
+        members[p.get("category", "")].append((p.get("sortKey") or "~", i, key))
+    return {
+        # Every page includes the category nav, so any change here means a full rebuild
+        "categoryList": sha1_text(json.dumps(data["categories"], sort_keys=True)),
+        # A category page depends on which projects it lists and in what order
+        "categories": {c: sha1_text(json.dumps([key for *_, key in sorted(m)]))
+                       for c, m in members.items()},
+        "projects": projects,
+        "assets": {k: meta["sha1"] for k, meta in image_index.snapshot().items() if "sha1" in meta},
+    }
+
+def save_catalogue(store, data, image_index):
+    """Save a catalogue snapshot and write the change manifest (runs as a job).
+
+    Returns the image index changes found on the way, for the Tk thread to
+    apply, and the manifest, or None if it couldn't be written.
+    """
+    store.save(data)
+    fresh, removed = image_index.changes()
+    index = ImageIndex(image_index.root, image_index.path)
+    index.entries = image_index.snapshot()
+    for k in removed:
+        index.entries.pop(k, None)
+    index.entries.update(fresh)
+    try:
+        manifest = change_manifest(catalogue_state(data, index), load_build_state(),
+                                   sha1_file(PROJECTS_JSON))
+        # Size and mtime of every image, so build.js can spot ones replaced or added after this save
+        manifest["images"] = {k: [meta["bytes"], meta["mtime"]] for k, meta in index.entries.items()}
+        write_text(CHANGES_JSON, dump_json(manifest))
+    except Exception as e:
+        print(f"Error writing change manifest: {e}")
+        manifest = None
+    return fresh, removed, manifest
+
+def manifest_summary(manifest):
+    if manifest is None:
+        return ""
+    if manifest["full"]:
+        return "Next site build: full rebuild."
+    images = len(manifest["assets"]["changed"]) + len(manifest["assets"]["removed"])
+    return (f"Next site build: {len(manifest['projects'])} project pages, "
+            f"{len(manifest['categories'])} category pages, {images} images.")
+
+def load_build_state(path=BUILD_STATE_JSON):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def change_manifest(state, built, projects_sha1):
+    """Diff the current state against the last recorded build.
+
+    Without a recorded build (or when the category list changed) the
+    manifest asks for a full rebuild. projectsSha1 lets build.js check the
+    manifest still describes the projects.json on disk.
+    """
+    manifest = {
+        "version": 1,
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "projectsSha1": projects_sha1,
+        "full": built is None or built.get("categoryList") != state["categoryList"],
+        "projects": [],
+        "categories": [],
+        "assets": {"changed": [], "removed": []},
+        "removedPages": [],
+        "state": state,
+    }
+    if built is None:
+        return manifest
+
+    old_projects = built.get("projects", {})
+    changed, categories, removed_pages = set(), set(), set()
+    for key, p in state["projects"].items():
+        old = old_projects.get(key)
+        if old is None or old["sha1"] != p["sha1"]:
+            changed.add(p["id"])
+            categories.add(p["category"])
+        if old is not None and old["category"] != p["category"]:
+            categories.add(old["category"])
+        if old is not None and old["page"] != p["page"]:
+            removed_pages.add(old["page"])
+    for key, old in old_projects.items():
+        if key not in state["projects"]:
+            categories.add(old["category"])
+            removed_pages.add(old["page"])
+    old_categories = built.get("categories", {})
+    for c in set(state["categories"]) | set(old_categories):
+        if state["categories"].get(c) != old_categories.get(c):
+            categories.add(c)
+    # A page can be vacated by one project and taken by another (e.g. an id reused)
+    removed_pages -= {p["page"] for p in state["projects"].values()}
+
+    old_assets = built.get("assets", {})
+    manifest["projects"] = sorted(changed)
+    manifest["categories"] = sorted(categories)
+    manifest["assets"] = {
+        "changed": sorted(k for k, h in state["assets"].items() if old_assets.get(k) != h),
+        "removed": sorted(k for k in old_assets if k not in state["assets"]),
+    }
+    manifest["removedPages"] = sorted(removed_pages)
+    return manifest
+
+# =====================
+# CATALOGUE VALIDATION
+# =====================
+def issue(severity, kind, message, project=None, path=None):
+    return {"severity": severity, "kind": kind, "project": project, "path": path, "message": message}
+
+def project_image_paths(p):
+    """(field, path) for every image a project references"""
+    paths = []
+    if p.get("thumbnail"):
+        paths.append(("thumbnail", os.path.join(THUMBNAILS_DIR, p["thumbnail"])))
+    if p.get("thumbnailCrop"):
+        paths.append(("thumbnailCrop", os.path.join(THUMBNAILS_DIR, p["thumbnailCrop"]["src"])))
+    for rel in p.get("gallery", []):
+        paths.append(("gallery", os.path.join(GALLERY_DIR, rel)))
+    return paths
+
+def validate_project(p, category_ids, image_index, duplicate_ids=()):
+    """Broken references, size-budget violations and category problems for one project.
+
+    Uses the image index rather than the filesystem, so it's cheap enough to
+    run on every edit once the index is fresh.
+    """
+    pid = p.get("id")
+    issues = []
+    if not pid:
+        issues.append(issue("error", "missing-id", f"\"{p.get('title', '?')}\" has no id"))
+    elif pid in duplicate_ids:
+        issues.append(issue("error", "duplicate-id", f"id {pid} is used by more than one project", pid))
+    if p.get("category") not in category_ids:
+        issues.append(issue("error", "unknown-category",
+                            f"category \"{p.get('category')}\" isn't in categories", pid))
+    for field, path in project_image_paths(p):
+        meta = image_index.get(path)
+        if meta is None:
+            if os.path.exists(path):
+                issues.append(issue("error", "unreadable-image", f"{field} can't be read as an image", pid, path))
+            else:
+                issues.append(issue("error", "missing-file", f"{field} does not exist", pid, path))
+        elif meta["bytes"] > IMAGE_SIZE_BUDGET:
+            issues.append(issue("warning", "oversized",
+                                f"{field} is {meta['bytes'] / 1024 / 1024:.1f} MB "
+                                f"(budget {IMAGE_SIZE_BUDGET // 1024 // 1024} MB)", pid, path))
+    crop = p.get("thumbnailCrop")
+    if crop and p.get("thumbnail"):
+        meta = image_index.get(os.path.join(THUMBNAILS_DIR, p["thumbnail"]))
+        if meta and meta.get("sha1") != crop.get("sha1"):
+            issues.append(issue("warning", "stale-crop", "thumbnail changed since it was cropped",
+                                pid, os.path.join(THUMBNAILS_DIR, crop["src"])))
+    return issues
+
+def duplicate_project_ids(projects):
+    """Ids that would collide on the site (same id twice in one category)"""
+    counts = collections.Counter((p.get("id"), p.get("category")) for p in projects)
+    return {pid for (pid, _c), n in counts.items() if pid and n > 1}
+
+@profiled("validate_catalogue", "io")
+def validate_catalogue(data, image_index, refresh=True):
+    """Every issue in the catalogue and images/ tree, errors first.
+
+    The expensive part, reading image headers under images/, is the index
+    refresh, which only re-reads changed files and does so on a thread pool.
+    The CMS runs that as a job and passes refresh=False once it's applied.
+    """
+    if refresh:
+        image_index.refresh()
+    projects = data.get("projects", [])
+    category_ids = {c["id"] for c in data.get("categories", [])}
+    duplicates = duplicate_project_ids(projects)
+
+    issues = []
+    for p in projects:
+        issues.extend(validate_project(p, category_ids, image_index, duplicates))
+
+    # Same id in different categories builds fine but is ambiguous in the CMS
+    shared = collections.defaultdict(set)
+    for p in projects:
+        shared[p.get("id")].add(p.get("category"))
+    for pid, cats in shared.items():
+        if pid and len(cats) > 1 and pid not in duplicates:
+            issues.append(issue("warning", "shared-id",
+                                f"id {pid} is used in {', '.join(sorted(cats))}", pid))
+
+    referenced = {image_index.key(path) for p in projects for _f, path in project_image_paths(p)}
+    roots = tuple(image_index.key(d) + "/" for d in (THUMBNAILS_DIR, GALLERY_DIR))
+    for key in sorted(image_index.snapshot()):
+        if key.startswith(roots) and key not in referenced:
+            issues.append(issue("warning", "orphan", "not referenced by any project",
+                                path=os.path.join(image_index.root, key)))
+
+    issues.sort(key=lambda i: (i["severity"] != "error", i["project"] or "", i["kind"]))
+    return issues
+
+def format_issue(i):
+    where = i["project"] or os.path.relpath(i["path"])
+    detail = f" ({os.path.relpath(i['path'])})" if i["project"] and i["path"] else ""
+    return f"{i['severity'].upper():8}{i['kind']:18}{where}: {i['message']}{detail}"
+
+# =====================
+# JOB SCHEDULER
+# =====================
+class CancelToken:
+    """Shared by the jobs submitted for one purpose; cancelling it drops them all.
+
+    A token with a parent also counts as cancelled once the parent is, so
+    renewing "selection" drops every preview job for the old selection.
+    """
+    __slots__ = ("_cancelled", "parent")
+
+    def __init__(self, parent=None):
+        self._cancelled = False
+        self.parent = parent
+
+    @property
+    def cancelled(self):
+        return self._cancelled or (self.parent is not None and self.parent.cancelled)
+
+    def cancel(self):
+        self._cancelled = True
+
+def process_pool_executor(max_workers=None):
+    """A process pool with spawned workers: forking while Tk and the job threads run can hang the child"""
+    return concurrent.futures.ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+class Job:
+    __slots__ = ("fn", "lane", "token", "on_done", "on_error", "process", "name")
+
+    def __init__(self, fn, lane, token, on_done, on_error, process, name):
+        self.fn = fn
+        self.lane = lane
+        self.token = token
+        self.on_done = on_done
+        self.on_error = on_error
+        self.process = process
+        self.name = name
+
+class JobScheduler:
+    """Every slow CMS operation runs here instead of inside a Tk callback.
+
+    Jobs wait in priority lanes (JOB_LANES, highest first); a free worker
+    thread always takes the oldest job of the highest non-empty lane, and
+    the first worker only takes interactive jobs, so a long maintenance
+    pass can't hold up a preview. process=True jobs run their (picklable)
+    function in a bounded process pool.
+
+    Jobs carry a CancelToken, usually the current one for a scope such as
+    "thumbnail" or "prefetch" that the app renews when the selection
+    changes. Cancelled jobs are skipped if they haven't started, and their
+    callbacks are dropped if they have. Callbacks run on the Tk thread in
+    pump(), which the app polls with after() while jobs are outstanding.
+    """
+    def __init__(self, threads=JOB_THREADS, processes=JOB_PROCESSES):
+        self.lanes = {lane: collections.deque() for lane in JOB_LANES}
+        self.running = collections.Counter()
+        self.cond = threading.Condition()
+        self.results = queue.Queue()
+        self.tokens = {}
+        self.processes = processes
+        self._process_pool = None
+        for n in range(threads):
+            lanes = JOB_LANES[:1] if n == 0 else JOB_LANES
+            threading.Thread(target=self._work, args=(lanes,), name=f"job-{n}", daemon=True).start()
+
+    def token(self, scope):
+        """The live token for a scope, created on first use"""
+        if scope not in self.tokens:
+            self.tokens[scope] = CancelToken()
+        return self.tokens[scope]
+
+    def renew(self, scope, parent=None):
+        """Cancel everything submitted under scope and return its new token"""
+        old = self.tokens.get(scope)
+        if old is not None:
+            old.cancel()
+            with self.cond:
+                # Drop queued jobs now so the status bar counts stay honest
+                for lane in self.lanes.values():
+                    if any(job.token is not None and job.token.cancelled for job in lane):
+                        kept = [job for job in lane if job.token is None or not job.token.cancelled]
+                        lane.clear()
+                        lane.extend(kept)
+        self.tokens[scope] = CancelToken(parent)
+        return self.tokens[scope]
+
+    def submit(self, fn, lane="interactive", token=None, on_done=None, on_error=None,
+               process=False, name=None):
+        """Queue fn() to run in the background; on_done(result) / on_error(exc) run on the Tk thread"""
+        job = Job(fn, lane, token, on_done, on_error, process,
+                  name or getattr(fn, "__name__", None) or getattr(getattr(fn, "func", None), "__name__", "job"))
+        with self.cond:
+            self.lanes[lane].append(job)
+            self.cond.notify_all()
+        return job
+
+    def call_soon(self, fn, *args, token=None):
+        """Run fn(*args) on the Tk thread at the next pump; for jobs reporting progress"""
+        self.results.put((None, (fn, args, token)))
+
+    def process_pool(self):
+        """The shared process pool, for jobs that fan work out themselves"""
+        with self.cond:
+            if self._process_pool is None:
+                self._process_pool = process_pool_executor(self.processes)
+            return self._process_pool
+
+    def _next(self, lanes):
+        for lane in lanes:
+            while self.lanes[lane]:
+                job = self.lanes[lane].popleft()
+                if job.token is None or not job.token.cancelled:
+                    return job
+        return None
+
+    def _work(self, lanes):
+        while True:
+            with self.cond:
+                job = self._next(lanes)
+                while job is None:
+                    self.cond.wait()
+                    job = self._next(lanes)
+                self.running[job.lane] += 1
+            try:
+                with PROFILER.span(f"job.{job.name}", "io"):
+                    if job.process:
+                        result = self.process_pool().submit(job.fn).result()
+                    else:
+                        result = job.fn()
+                outcome = (result, None)
+            except Exception as e:
+                outcome = (None, e)
+            with self.cond:
+                self.running[job.lane] -= 1
+            self.results.put((job, outcome))
+
+    def pump(self):
+        """Run callbacks for finished jobs (Tk thread); True while anything is outstanding"""
+        while True:
+            try:
+                job, payload = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                fn, args, token = payload
+                if token is None or not token.cancelled:
+                    self._callback(getattr(fn, "__name__", "call_soon"), fn, *args)
+                continue
+            if job.token is not None and job.token.cancelled:
+                continue
+            result, error = payload
+            if error is not None:
+                print(f"Error in background job {job.name}: {error}")
+                if job.on_error is not None:
+                    self._callback(job.name, job.on_error, error)
+            elif job.on_done is not None:
+                self._callback(job.name, job.on_done, result)
+        return self.busy()
+
+    @staticmethod
+    def _callback(name, fn, *args):
+        # One failing callback mustn't strand the results queued behind it
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"Error in callback for {name}: {e}")
+
+    def counts(self):
+        """Queued plus running jobs per lane"""
+        with self.cond:
+            return {lane: len(self.lanes[lane]) + self.running[lane] for lane in JOB_LANES}
+
+    def busy(self):
+        return any(self.counts().values()) or not self.results.empty()
+
+# =====================
+# FILE WATCHER
+# =====================
+class _WatchHandler(FileSystemEventHandler):
+    def __init__(self, changes):
+        self.changes = changes
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        self.changes.put(event.src_path)
+        dest = getattr(event, "dest_path", None)
+        if dest:
+            self.changes.put(dest)
+
+class FileWatcher:
+    """Reports changed files under the catalogue and image roots.
+
+    Uses watchdog (inotify on Linux, FSEvents on macOS) when it's installed
+    and falls back to stat polling otherwise. Changed paths are queued for
+    the Tk thread to drain with drain().
+    """
+    def __init__(self, files, dirs, interval_ms=WATCH_POLL_MS):
+        self.files = [os.path.abspath(f) for f in files]
+        self.dirs = [os.path.abspath(d) for d in dirs]
+        self.interval = interval_ms / 1000
+        self.changes = queue.Queue()
+        self.observer = None
+
+    def start(self):
+        if Observer is not None:
+            self.observer = Observer()
+            handler = _WatchHandler(self.changes)
+            for d in {os.path.dirname(f) for f in self.files}:
+                self.observer.schedule(handler, d, recursive=False)
+            for d in self.dirs:
+                self.observer.schedule(handler, d, recursive=True)
+            self.observer.daemon = True
+            self.observer.start()
+        else:
+            threading.Thread(target=self._poll, name="file-watcher", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.observer is not None:
+            self.observer.stop()
+
+    def drain(self):
+        """Changed absolute paths since the last drain, filtered to watched roots"""
+        paths = set()
+        while True:
+            try:
+                paths.add(os.path.abspath(self.changes.get_nowait()))
+            except queue.Empty:
+                break
+        return {p for p in paths
+                if p in self.files or any(p.startswith(d + os.sep) for d in self.dirs)}
+
+    def _snapshot(self):
+        found = {}
+        for f in self.files:
+            try:
+                st = os.stat(f)
+                found[f] = (st.st_mtime, st.st_size)
+            except OSError:
+                pass
+        for d in self.dirs:
+            for dirpath, _dirnames, filenames in os.walk(d):
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    found[path] = (st.st_mtime, st.st_size)
+        return found
+
+    def _poll(self):
+        before = self._snapshot()
+        while True:
+            time.sleep(self.interval)
+            after = self._snapshot()
+            for path in before.keys() | after.keys():
+                if before.get(path) != after.get(path):
+                    self.changes.put(path)
+            before = after
+
+def _merge_differs(p, other):
+    """Whether p differs from other, ignoring derived fields and sort keys other doesn't have"""
+    skip = SITE_PLACEHOLDER_FIELDS if "sortKey" in other else SITE_PLACEHOLDER_FIELDS + ("sortKey",)
+    return {k: v for k, v in p.items() if k not in skip} != \
+           {k: v for k, v in other.items() if k not in skip}
+
+def merge_catalogue(base, live, disk):
+    """Three-way merge of project lists by id.
+
+    base is what was last read from or written to disk, live is the
+    in-memory catalogue and disk is the file's new contents. External edits
+    win for projects that weren't touched locally; projects changed on both
+    sides keep the local version and are reported as conflicts.
+
+    Returns (projects, updated_ids, added_ids, removed_ids, conflict_ids),
+    using project_keys() so repeated ids are matched by occurrence. live
+    records are updated in place so list positions stay stable.
+
+    Fields the CMS fills in itself, site placeholders and sort keys it
+    assigned (the other side has none), don't count as local edits and
+    survive taking the disk version.
+    """
+    base_by_id = dict(zip(project_keys(base), base))
+    live_by_id = dict(zip(project_keys(live), live))
+    disk_by_id = dict(zip(project_keys(disk), disk))
+    updated, added, removed, conflicts = [], [], [], []
+
+    merged = []
+    for pid, p in live_by_id.items():
+        before = base_by_id.get(pid)
+        after = disk_by_id.get(pid)
+        if before is None or before == after:
+            merged.append(p)  # New locally, or unchanged on disk
+        elif _merge_differs(p, before):
+            if after is None or _merge_differs(p, after):
+                conflicts.append(pid)
+            merged.append(p)
+        elif after is None:
+            removed.append(pid)
+        else:
+            derived = {k: p[k] for k in ("sortKey",) + SITE_PLACEHOLDER_FIELDS if k in p and k not in after}
+            p.clear()
+            p.update(copy.deepcopy(after))
+            p.update(derived)  # Stale placeholders are recomputed by the next revalidate()
+            updated.append(pid)
+            merged.append(p)
+
+    for pid, p in disk_by_id.items():
+        if pid in base_by_id:
+            continue
+        if pid in live_by_id:
+            if _merge_differs(live_by_id[pid], p):
+                conflicts.append(pid)
+            continue
+        merged.append(copy.deepcopy(p))
+        added.append(pid)
+
+    return merged, updated, added, removed, conflicts
+
+# =====================
+# DROP INGESTION
+# =====================
+def sniff_image(path):
+    """Canonical extension if the file's leading bytes look like a supported image"""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(12)
+    except OSError:
+        return None
+    for magic, ext in IMAGE_MAGIC:
+        if head.startswith(magic):
+            if ext == ".webp" and head[8:12] != b"WEBP":
+                return None
+            return ext
+    return None
+
+def iter_image_files(paths):
+    """Images among dropped paths, walking directories recursively in name order"""
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                for name in sorted(filenames):
+                    full = os.path.join(dirpath, name)
+                    if not name.startswith(".") and sniff_image(full):
+                        yield full
+        elif os.path.isfile(path) and sniff_image(path):
+            yield path
+
+def scan_image_batches(paths, token, emit):
+    """Walk dropped files and folders as a job, passing image batches to emit().
+
+    A batch is flushed when it reaches DROP_BATCH_SIZE or has been open for
+    DROP_BATCH_SECONDS, so the first images arrive while a large folder is
+    still being walked. Stops early once token is cancelled.
+    """
+    batch = []
+    opened = time.monotonic()
+    for path in iter_image_files(paths):
+        if token.cancelled:
+            return
+        if not batch:
+            opened = time.monotonic()
+        batch.append(path)
+        if len(batch) >= DROP_BATCH_SIZE or time.monotonic() - opened >= DROP_BATCH_SECONDS:
+            emit(batch)
+            batch = []
+    if batch:
+        emit(batch)
+
+# =====================
+# FILE OPERATIONS
+# =====================
+def copy_images(pairs):
+    """Copy (source, dest) pairs and read each copy's index entry (runs as a job)"""
+    copied = []
+    for source, dest in pairs:
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.copy(source, dest)
+        copied.append((dest, ImageIndex._read(dest)))
+    return copied
+
+def remove_files(paths, folders=()):
+    """Delete files, then any of the folders left empty (runs as a job)"""
+    for path in paths:
+        if os.path.exists(path):
+            try:
+                os.remove(path)
+            except Exception as e:
+                print(f"Error deleting {path}: {e}")
+    for folder in folders:
+        if os.path.isdir(folder) and not os.listdir(folder):
+            try:
+                os.rmdir(folder)
+            except Exception as e:
+                print(f"Error deleting folder {folder}: {e}")
+
+def read_image_changes(image_index, paths):
+    """(removed paths, {path: fresh entry or None}) for files changed on disk (runs as a job)"""
+    removed, fresh = [], {}
+    for path in paths:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            removed.append(path)
+            continue
+        meta = image_index.get(path)
+        if meta and meta["mtime"] == mtime:
+            continue  # Already indexed, e.g. copied in by the CMS itself
+        fresh[path] = image_index._read(path)
+    return removed, fresh
+
+# =====================
+# PERCEPTUAL HASHING
+# =====================
+@functools.lru_cache(maxsize=1)
+def _dct_matrix(n=PHASH_SAMPLE):
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    return np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+
+def perceptual_hash(path):
+    """64-bit DCT hash of an image, robust to re-exports and rescales"""
+    with Image.open(path) as img:
+        img.draft("L", (PHASH_SAMPLE * 4, PHASH_SAMPLE * 4))
+        small = img.convert("L").resize((PHASH_SAMPLE, PHASH_SAMPLE), Image.Resampling.LANCZOS)
+    pixels = np.asarray(small, dtype=np.float64)
+    dct = _dct_matrix()
+    low = (dct @ pixels @ dct.T)[:PHASH_BITS, :PHASH_BITS].ravel()
+    # Median excludes the DC term, which only encodes overall brightness
+    bits = low > np.median(low[1:])
+    return int(np.packbits(bits).view(">u8")[0])
+
+def _hash_worker(path):
+    # Top-level so it can be pickled into the process pool
+    try:
+        return perceptual_hash(path)
+    except Exception as e:
+        print(f"Error hashing image {path}: {e}")
+        return None
+
+def popcount64(values):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return np.unpackbits(values.view(np.uint8)).reshape(-1, 64).sum(axis=1).reshape(values.shape)
+
+def hamming_pairs(hashes, threshold=PHASH_THRESHOLD, chunk=PHASH_CHUNK):
+    """All (i, j) with i < j whose hashes differ by at most threshold bits"""
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    pairs = []
+    for start in range(0, len(hashes), chunk):
+        block = hashes[start:start + chunk]
+        dist = popcount64(block[:, None] ^ hashes[None, start:])
+        rows, cols = np.nonzero(dist <= threshold)
+        keep = cols > rows
+        pairs.extend(zip((rows[keep] + start).tolist(), (cols[keep] + start).tolist()))
+    return pairs
+
+def near_duplicate_clusters(keys, hashes, threshold=PHASH_THRESHOLD):
+    """Group keys whose hashes are transitively within threshold bits"""
+    parent = list(range(len(keys)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in hamming_pairs(hashes, threshold):
+        parent[find(i)] = find(j)
+
+    groups = {}
+    for i, key in enumerate(keys):
+        groups.setdefault(find(i), []).append(key)
+    return [sorted(g) for g in groups.values() if len(g) > 1]
+
+class PHashIndex:
+    """Cached perceptual hashes for the gallery and thumbnail trees.
+
+    Staleness is judged against the ImageIndex mtimes, and missing hashes
+    are computed in a process pool. refresh() runs in jobs, so it's locked.
+    """
+    ROOTS = ("gallery/", "thumbnails/")
+    # Crops are near-duplicates of their sources by construction
+    EXCLUDE = (os.path.relpath(THUMBNAIL_CROPS_DIR, IMAGES_DIR).replace(os.sep, "/") + "/",)
+
+    def __init__(self, image_index, path=PHASH_INDEX_JSON):
+        self.image_index = image_index
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    @profiled("PHashIndex.refresh", "io")
+    def refresh(self, pool=None):
+        with self.lock:
+            images = {k: meta for k, meta in self.image_index.snapshot().items()
+                      if k.startswith(self.ROOTS) and not k.startswith(self.EXCLUDE)}
+            stale = [k for k, meta in images.items()
+                     if self.entries.get(k, {}).get("mtime") != meta["mtime"]]
+            removed = [k for k in self.entries if k not in images]
+
+            for k in removed:
+                del self.entries[k]
+            if stale:
+                paths = [os.path.join(self.image_index.root, k) for k in stale]
+                for k, h in zip(stale, hash_files(paths, pool)):
+                    if h is not None:
+                        self.entries[k] = {"mtime": images[k]["mtime"], "hash": f"{h:016x}"}
+
+            if stale or removed:
+                self.save()
+        return self
+
+    def arrays(self):
+        keys = list(self.entries)
+        hashes = np.array([int(self.entries[k]["hash"], 16) for k in keys], dtype=np.uint64)
+        return keys, hashes
+
+    def clusters(self, threshold=PHASH_THRESHOLD):
+        keys, hashes = self.arrays()
+        return near_duplicate_clusters(keys, hashes, threshold)
+
+    def matches(self, file_hashes, threshold=PHASH_THRESHOLD):
+        """For each incoming hash, the indexed keys within threshold bits"""
+        keys, hashes = self.arrays()
+        result = []
+        for h in file_hashes:
+            if h is None or not keys:
+                result.append([])
+                continue
+            dist = popcount64(hashes ^ np.uint64(h))
+            result.append([keys[i] for i in np.nonzero(dist <= threshold)[0]])
+        return result
+
+def hash_files(paths, pool=None):
+    """Perceptual hashes for paths, fanned out over a process pool (a private one if none is given)"""
+    if len(paths) < 4:
+        return [_hash_worker(p) for p in paths]
+    if pool is not None:
+        return list(pool.map(_hash_worker, paths, chunksize=8))
+    with process_pool_executor() as pool:
+        return list(pool.map(_hash_worker, paths, chunksize=8))
+
+# =====================
+# SITE PLACEHOLDERS
+# =====================
+def lqip_sample(path):
+    """Reduced RGB pixels of an image and its full (width, height)"""
+    with Image.open(path) as img:
+        size = img.size
+        img.draft("RGB", (LQIP_SAMPLE, LQIP_SAMPLE))
+        img = img.convert("RGB")
+        factor = max(img.size) // LQIP_SAMPLE
+        if factor > 1:
+            img = img.reduce(factor)
+        return np.asarray(img), size
+
+def box_downsample(rgb, columns):
+    """Mean colour of each cell of a grid `columns` wide, rows following the aspect ratio"""
+    h, w = rgb.shape[:2]
+    columns = min(columns, w)
+    rows = min(max(1, round(columns * h / w)), h)
+    ys = np.arange(rows) * h // rows
+    xs = np.arange(columns) * w // columns
+    sums = np.add.reduceat(np.add.reduceat(rgb.astype(np.uint32), ys, axis=0), xs, axis=1)
+    counts = np.outer(np.diff(ys, append=h), np.diff(xs, append=w))
+    return (sums / counts[..., None] + 0.5).astype(np.uint8)
+
+def dominant_colour(rgb):
+    """Mean of the most populated 4-bit-per-channel colour bin, as #rrggbb"""
+    pixels = rgb.reshape(-1, 3)
+    bins = (pixels >> 4).astype(np.intp)
+    idx = (bins[:, 0] << 8) | (bins[:, 1] << 4) | bins[:, 2]
+    top = np.bincount(idx, minlength=4096).argmax()
+    r, g, b = (pixels[idx == top].mean(axis=0) + 0.5).astype(int)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+def lqip_data_uri(cells):
+    buf = io.BytesIO()
+    Image.fromarray(cells).save(buf, "WEBP", quality=LQIP_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+def site_placeholder(path):
+    """Dominant colour, LQIP data URI and dimensions of one image"""
+    rgb, (width, height) = lqip_sample(path)
+    return {
+        "color": dominant_colour(rgb),
+        "lqip": lqip_data_uri(box_downsample(rgb, LQIP_COLUMNS)),
+        "width": width,
+        "height": height,
+    }
+
+def _site_placeholder_worker(path):
+    # Top-level so it can be pickled into the process pool
+    try:
+        return site_placeholder(path)
+    except Exception as e:
+        print(f"Error computing placeholder for {path}: {e}")
+        return None
+
+def site_placeholders(paths, pool=None):
+    """Placeholders for paths, fanned out over a process pool (a private one if none is given)"""
+    if len(paths) < 4:
+        return [_site_placeholder_worker(p) for p in paths]
+    if pool is not None:
+        return list(pool.map(_site_placeholder_worker, paths, chunksize=4))
+    with process_pool_executor() as pool:
+        return list(pool.map(_site_placeholder_worker, paths, chunksize=4))
+
+def prune_site_placeholders(p):
+    """Drop placeholders for images the project no longer references; True if any were"""
+    pruned = False
+    if "thumbnailPlaceholder" in p and not p.get("thumbnail"):
+        del p["thumbnailPlaceholder"]
+        pruned = True
+    placeholders = p.get("galleryPlaceholders")
+    if placeholders is not None:
+        kept = {rel: v for rel, v in placeholders.items() if rel in p.get("gallery", [])}
+        if len(kept) != len(placeholders):
+            if kept:
+                p["galleryPlaceholders"] = kept
+            else:
+                del p["galleryPlaceholders"]
+            pruned = True
+    return pruned
+
+def stale_site_placeholders(p, image_index):
+    """(field, rel, path, sha1) for each indexed image of p whose placeholder is missing or outdated"""
+    stale = []
+    gallery_placeholders = p.get("galleryPlaceholders") or {}
+    images = [("thumbnail", p["thumbnail"], thumbnail_path(p))] if p.get("thumbnail") else []
+    images += [("gallery", rel, os.path.join(GALLERY_DIR, rel)) for rel in p.get("gallery", [])]
+    for field, rel, path in images:
+        meta = image_index.get(path)
+        if meta is None or "sha1" not in meta:
+            continue  # Missing images are the validator's business
+        if field == "thumbnail":
+            current = p.get("thumbnailPlaceholder")
+        else:
+            current = gallery_placeholders.get(rel)
+        if not current or current.get("sha1") != meta["sha1"]:
+            stale.append((field, rel, path, meta["sha1"]))
+    return stale
+
+def set_site_placeholder(p, field, rel, sha1, placeholder):
+    entry = dict(placeholder, sha1=sha1)
+    if field == "thumbnail":
+        p["thumbnailPlaceholder"] = entry
+    else:
+        # A fresh dict so undo snapshots holding the old one are untouched
+        p["galleryPlaceholders"] = dict(p.get("galleryPlaceholders") or {}, **{rel: entry})
+
+def refresh_site_placeholders(projects, image_index, pool=None):
+    """Bring every project's placeholders up to date; returns the number of records changed"""
+    changed = {id(p): p for p in projects if prune_site_placeholders(p)}
+    jobs = [(p, job) for p in projects for job in stale_site_placeholders(p, image_index)]
+    results = site_placeholders([path for _p, (_f, _r, path, _s) in jobs], pool)
+    for (p, (field, rel, _path, sha1)), placeholder in zip(jobs, results):
+        if placeholder is not None:
+            set_site_placeholder(p, field, rel, sha1, placeholder)
+            changed[id(p)] = p
+    return len(changed)
+
+# =====================
+# COLOUR SCOPES
 # =====================
-PROJECTS_JSON = "data/projects.json"
-IMAGES_DIR = "images"
-THUMBNAILS_DIR = os.path.join(IMAGES_DIR, "thumbnails")
-GALLERY_DIR = os.path.join(IMAGES_DIR, "gallery")
+SCOPE_TINTS = np.array([[255, 70, 70], [70, 255, 70], [90, 120, 255]], dtype=np.float32)
+REC709_LUMA = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
 
-THUMBNAIL_SIZE = (260, 260)
-GALLERY_SIZE = (150, 150)
+def scope_sample(path):
+    """Downsampled RGB buffer of a still; draft decoding keeps 4K JPEGs cheap"""
+    with Image.open(path) as img:
+        img.draft("RGB", (SCOPE_SAMPLE_WIDTH, SCOPE_SAMPLE_WIDTH))
+        img = img.convert("RGB")
+        img.thumbnail((SCOPE_SAMPLE_WIDTH, SCOPE_SAMPLE_WIDTH), Image.Resampling.BILINEAR)
+        return np.asarray(img)
 
-FIELD_MAP = {
-    "title": "Title",
-    "client": "Client",
-    "role": "Role",
-    "year": "Year",
-    "vimeoId": "Vimeo ID",
-    "youtubeId": "Youtube ID",
-    "description": "Description",
-    "production": "Production",
-}
+def level_columns(channel):
+    """256 x width counts of each 8-bit level per column, level 255 at the top"""
+    h, w = channel.shape
+    idx = channel.astype(np.intp) * w + np.arange(w)
+    counts = np.bincount(idx.ravel(), minlength=256 * w).reshape(256, w)
+    return counts[::-1]
 
-# Color schemes
-LIGHT_COLORS = {
-    "bg": "#f8f9fa",
-    "sidebar": "#2c3e50",
-    "sidebar_text": "#ecf0f1",
-    "primary": "#3498db",
-    "primary_hover": "#2980b9",
-    "danger": "#e74c3c",
-    "danger_hover": "#c0392b",
-    "success": "#27ae60",
-    "success_hover": "#229954",
-    "card": "#ffffff",
-    "border": "#dfe6e9",
-    "text": "#2c3e50",
-    "text_light": "#7f8c8d",
-    "selected": "#3498db",
-    "selected_bg": "#ebf5fb",
-    "topbar": "#ffffff",
-    "topbar_border": "#dfe6e9",
-}
+def trace(counts):
+    """Level counts as 0..1 trace brightness, log-scaled so sparse levels still show"""
+    v = np.log1p(counts.astype(np.float32))
+    return v / max(float(v.max()), 1e-6)
 
-DARK_COLORS = {
-    "bg": "#1a1d23",
-    "sidebar": "#0d0f12",
-    "sidebar_text": "#e4e6eb",
-    "primary": "#4a9eff",
-    "primary_hover": "#3d8de5",
-    "danger": "#ff4757",
-    "danger_hover": "#ee3f4f",
-    "success": "#2ecc71",
-    "success_hover": "#27ae60",
-    "card": "#242830",
-    "border": "#3a3f4b",
-    "text": "#e4e6eb",
-    "text_light": "#8b92a3",
-    "selected": "#4a9eff",
-    "selected_bg": "#1e2a3a",
-    "topbar": "#1e2126",
-    "topbar_border": "#3a3f4b",
-}
+def scope_image(rgb, graticule=True):
+    if graticule:  # Faint 0/25/50/75/100% lines
+        rows = [0, 64, 128, 191, 255]
+        rgb[rows] = np.maximum(rgb[rows], 45)
+    return Image.fromarray(np.clip(rgb, 0, 255).astype(np.uint8)).resize(SCOPE_SIZE, Image.Resampling.BILINEAR)
 
-COLORS = LIGHT_COLORS.copy()
+def compute_scopes(path):
+    """RGB parade, luma waveform and RGB histogram images for a still"""
+    arr = scope_sample(path)
+
+    luma = np.rint(arr.astype(np.float32) @ REC709_LUMA).astype(np.uint8)
+    waveform = scope_image(trace(level_columns(luma))[..., None] * np.full(3, 230, dtype=np.float32))
+
+    gap = np.zeros((256, 2, 3), dtype=np.float32)
+    panels = []
+    for c in range(3):
+        panels += [trace(level_columns(arr[..., c]))[..., None] * SCOPE_TINTS[c], gap]
+    parade = scope_image(np.concatenate(panels[:-1], axis=1))
+
+    height = SCOPE_SIZE[1]
+    counts = np.stack([np.bincount(arr[..., c].ravel(), minlength=256) for c in range(3)])
+    bars = np.rint(np.sqrt(counts / max(int(counts.max()), 1)) * height)  # sqrt keeps small bins visible
+    filled = np.arange(height)[:, None, None] >= height - bars.T[None, :, :]  # height x 256 x channel
+    histogram = scope_image(filled.astype(np.float32) @ (SCOPE_TINTS * 0.8), graticule=False)
+
+    return {"parade": parade, "waveform": waveform, "histogram": histogram}
 
 # =====================
-# HELPERS
+# THUMBNAIL CROPS
 # =====================
-def load_data():
-    with open(PROJECTS_JSON, "r", encoding="utf-8") as f:
-        return json.load(f)
+def thumbnail_aspect(category):
+    return THUMBNAIL_ASPECTS.get(category, THUMBNAIL_ASPECT)
 
-def save_data(data):
-    with open(PROJECTS_JSON, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+def thumbnail_path(p):
+    """The thumbnail the site shows: the smart crop when there is one, else the original"""
+    crop = p.get("thumbnailCrop")
+    return os.path.join(THUMBNAILS_DIR, crop["src"] if crop else p["thumbnail"])
 
-def create_rounded_rectangle(canvas, x1, y1, x2, y2, radius=10, **kwargs):
-    points = [
-        x1+radius, y1,
-        x1+radius, y1,
-        x2-radius, y1,
-        x2-radius, y1,
-        x2, y1,
-        x2, y1+radius,
-        x2, y1+radius,
-        x2, y2-radius,
-        x2, y2-radius,
-        x2, y2,
-        x2-radius, y2,
-        x2-radius, y2,
-        x1+radius, y2,
-        x1+radius, y2,
-        x1, y2,
-        x1, y2-radius,
-        x1, y2-radius,
-        x1, y1+radius,
-        x1, y1+radius,
-        x1, y1
-    ]
-    return canvas.create_polygon(points, **kwargs, smooth=True)
+def saliency_map(rgb):
+    """Per-pixel interest: luma edges plus distance from the frame's mean colour, each mean-normalised"""
+    pixels = rgb.astype(np.float32)
+    luma = pixels @ REC709_LUMA
+    edges = np.abs(np.diff(luma, axis=1, append=luma[:, -1:])) + \
+            np.abs(np.diff(luma, axis=0, append=luma[-1:]))
+    distinct = np.linalg.norm(pixels - pixels.reshape(-1, 3).mean(axis=0), axis=2)
+    return edges / max(float(edges.mean()), 1e-6) + distinct / max(float(distinct.mean()), 1e-6)
+
+def crop_size(size, aspect):
+    """The largest (width, height) of the given aspect ratio that fits in size"""
+    width, height = size
+    ax, ay = aspect
+    if width * ay > height * ax:  # Too wide: full height
+        return min(width, max(1, round(height * ax / ay))), height
+    return width, min(height, max(1, round(width * ay / ax)))
+
+def crop_needed(size, aspect):
+    """Whether size is far enough from aspect to be worth cropping rather than shown as is"""
+    crop_width, crop_height = crop_size(size, aspect)
+    return crop_width < size[0] * (1 - CROP_TOLERANCE) or crop_height < size[1] * (1 - CROP_TOLERANCE)
+
+def crop_box(saliency, size, aspect):
+    """(left, top, right, bottom) of the largest `aspect` window over `size` holding the most saliency.
+
+    The window always spans the source's full width or height, so only its
+    offset along the other axis is searched: one cumulative sum of the
+    saliency profile scores every offset at once.
+    """
+    width, height = size
+    crop_width, crop_height = crop_size(size, aspect)
+    if crop_width < width:  # Slide horizontally
+        crop, length, profile = crop_width, width, saliency.sum(axis=0)
+    elif crop_height < height:
+        crop, length, profile = crop_height, height, saliency.sum(axis=1)
+    else:
+        return 0, 0, width, height
+
+    scale = len(profile) / length
+    window = max(1, min(len(profile), round(crop * scale)))
+    cumulative = np.concatenate(([0.0], np.cumsum(profile, dtype=np.float64)))
+    sums = cumulative[window:] - cumulative[:-window]
+    offsets = np.arange(len(sums))
+    centre = (len(sums) - 1) / 2
+    score = sums / max(float(sums.max()), 1e-6) - \
+            CROP_CENTRE_BIAS * ((offsets - centre) / max(centre, 1)) ** 2
+    start = min(round(int(score.argmax()) / scale), length - crop)
+    if crop_width < width:
+        return start, 0, start + crop, height
+    return 0, start, width, start + crop
+
+def crop_preview(img, box):
+    """Small copy of img with everything outside box dimmed"""
+    before = img.copy()
+    before.thumbnail((CROP_PREVIEW_SIZE, CROP_PREVIEW_SIZE), Image.Resampling.BILINEAR)
+    scale = before.width / img.width
+    inner = tuple(round(v * scale) for v in box)
+    dimmed = Image.blend(before, Image.new("RGB", before.size), 0.6)
+    dimmed.paste(before.crop(inner), inner[:2])
+    ImageDraw.Draw(dimmed).rectangle((inner[0], inner[1], inner[2] - 1, inner[3] - 1), outline="white")
+    return dimmed
+
+def thumbnail_crop(path, dest, aspect):
+    """Smart-crop one thumbnail to `aspect`, write it to dest and return the box plus previews.
+
+    Sources already (nearly) in `aspect` aren't re-encoded: the result has no
+    staged file, and applying it drops any crop so the source is shown.
+    """
+    with Image.open(path) as img:
+        size = img.size
+        if not crop_needed(size, aspect):
+            img.draft("RGB", (CROP_PREVIEW_SIZE, CROP_PREVIEW_SIZE))
+            preview = img.convert("RGB")
+            preview.thumbnail((CROP_PREVIEW_SIZE, CROP_PREVIEW_SIZE), Image.Resampling.BILINEAR)
+            return {"box": [0, 0, *size], "width": size[0], "height": size[1],
+                    "staged": None, "before": preview, "after": preview}
+        # JPEGs decode straight at the output resolution; other formats decode in full
+        scale = min(1, CROP_LONG_SIDE / max(crop_size(size, aspect)))
+        img.draft("RGB", (int(size[0] * scale) + 1, int(size[1] * scale) + 1))
+        img = img.convert("RGB")
+    factor = max(1, max(img.size) // CROP_SAMPLE)
+    box = crop_box(saliency_map(np.asarray(img.reduce(factor))), img.size, aspect)
+
+    cropped = img.crop(box)
+    scale = min(1, CROP_LONG_SIDE / max(cropped.size))
+    if scale < 1:
+        cropped = cropped.resize((max(1, round(cropped.width * scale)), max(1, round(cropped.height * scale))),
+                                 Image.Resampling.LANCZOS, reducing_gap=2.0)
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    # Baseline rather than progressive: the site paints LQIP placeholders meanwhile
+    cropped.save(dest, "JPEG", quality=CROP_QUALITY, optimize=True)
+
+    after = cropped.copy()
+    after.thumbnail((CROP_PREVIEW_SIZE, CROP_PREVIEW_SIZE), Image.Resampling.BILINEAR)
+    ratio = size[0] / img.width  # Boxes are recorded in source pixels
+    return {
+        "box": [round(v * ratio) for v in box],
+        "width": cropped.width,
+        "height": cropped.height,
+        "staged": dest,
+        "before": crop_preview(img, box),
+        "after": after,
+    }
+
+def _thumbnail_crop_worker(job):
+    # Top-level so it can be pickled into the process pool
+    path, dest, aspect = job
+    try:
+        return thumbnail_crop(path, dest, aspect)
+    except Exception as e:
+        print(f"Error cropping thumbnail {path}: {e}")
+        return None
+
+def staged_crop_path(sha1, aspect):
+    return os.path.join(CROP_STAGING_DIR, f"{sha1}-{aspect[0]}x{aspect[1]}.jpg")
+
+def crop_dest(p):
+    """Where a project's crop is deployed, relative to THUMBNAILS_DIR"""
+    rel = os.path.relpath(os.path.join(THUMBNAIL_CROPS_DIR, p["category"], f"{p['id']}.jpg"), THUMBNAILS_DIR)
+    return rel.replace(os.sep, "/")
+
+def stale_thumbnail_crops(projects, image_index):
+    """(project, source path, sha1, aspect) for each thumbnail whose crop is missing or outdated.
+
+    A crop is current while its source's sha1 and its category's aspect
+    ratio match the ones it was made from, so unchanged sources are skipped,
+    as are uncropped sources already in their category's aspect ratio.
+    """
+    stale = []
+    for p in projects:
+        if not p.get("thumbnail"):
+            continue
+        path = os.path.join(THUMBNAILS_DIR, p["thumbnail"])
+        meta = image_index.get(path)
+        if meta is None or "sha1" not in meta:
+            continue  # Missing images are the validator's business
+        aspect = thumbnail_aspect(p.get("category"))
+        crop = p.get("thumbnailCrop")
+        if not crop and not crop_needed((meta["width"], meta["height"]), aspect):
+            continue  # Already the right shape, so the site shows the source itself
+        if crop and crop.get("sha1") == meta["sha1"] and tuple(crop.get("aspect", ())) == aspect \
+                and image_index.get(os.path.join(THUMBNAILS_DIR, crop["src"])) is not None:
+            continue
+        stale.append((p, path, meta["sha1"], aspect))
+    return stale
+
+def thumbnail_crops(jobs, pool=None):
+    """Crops for (source path, sha1, aspect) jobs, staged under CROP_STAGING_DIR, across a process pool"""
+    args = [(path, staged_crop_path(sha1, aspect), aspect) for path, sha1, aspect in jobs]
+    if len(args) < 4:
+        return [_thumbnail_crop_worker(a) for a in args]
+    if pool is not None:
+        return list(pool.map(_thumbnail_crop_worker, args, chunksize=2))
+    with process_pool_executor() as pool:
+        return list(pool.map(_thumbnail_crop_worker, args, chunksize=2))
+
+def thumbnail_crop_entry(src, sha1, aspect, result):
+    return {
+        "src": src,
+        "box": result["box"],
+        "aspect": list(aspect),
+        "width": result["width"],
+        "height": result["height"],
+        "sha1": sha1,  # Of the source, so regeneration can skip it while unchanged
+    }
 
 # =====================
 # UNDO/REDO MANAGER
 # =====================
 class UndoManager:
+    """Catalogue snapshots for undo/redo.
+
+    Snapshots come from ProjectRecord.snapshot, so records untouched between
+    edits are shared rather than copied; `bytes` counts what each snapshot
+    newly allocated.
+    """
     def __init__(self, max_history=50):
         self.history = []
         self.current = -1
         self.max_history = max_history
+        self.bytes = 0
         
-    def add_state(self, state):
+    def add_state(self, projects):
         # Remove any states after current position
+        for _snapshot, nbytes in self.history[self.current + 1:]:
+            self.bytes -= nbytes
         self.history = self.history[:self.current + 1]
         # Add new state
-        self.history.append(json.dumps(state))
+        snapshot, nbytes = ProjectRecord.snapshot(projects)
+        self.history.append((snapshot, nbytes))
+        self.bytes += nbytes
         # Limit history size
         if len(self.history) > self.max_history:
-            self.history.pop(0)
+            self.bytes -= self.history.pop(0)[1]
         else:
             self.current += 1
+
+    def trim(self, max_bytes):
+        """Drop the oldest snapshots until under max_bytes, always keeping the current one"""
+        freed = 0
+        while self.bytes > max_bytes and self.current > 0:
+            n = self.history.pop(0)[1]
+            self.bytes -= n
+            freed += n
+            self.current -= 1
+        return freed
             
     def can_undo(self):
         return self.current > 0
@@ -135,16 +2700,16 @@ class UndoManager:
     def can_redo(self):
         return self.current < len(self.history) - 1
         
-    def undo(self):
+    def undo(self, live=()):
         if self.can_undo():
             self.current -= 1
-            return json.loads(self.history[self.current])
+            return ProjectRecord.restore(self.history[self.current][0], live)
         return None
         
-    def redo(self):
+    def redo(self, live=()):
         if self.can_redo():
             self.current += 1
-            return json.loads(self.history[self.current])
+            return ProjectRecord.restore(self.history[self.current][0], live)
         return None
 
 # =====================
@@ -194,6 +2759,9 @@ class ModernEntry(tk.Frame):
     def __init__(self, parent, label="", **kwargs):
         super().__init__(parent, bg=COLORS["bg"])
         self.label = label
+        self.var = tk.StringVar()
+        self.baseline = ""
+        self.dirty = False
         
         if label:
             # Create a container for inline layout
@@ -206,17 +2774,37 @@ class ModernEntry(tk.Frame):
             
             self.entry = tk.Entry(container, relief="flat", bd=0, bg=COLORS["card"],
                                  fg=COLORS["text"], font=("SF Pro Text", 12),
-                                 insertbackground=COLORS["primary"], **kwargs)
+                                 insertbackground=COLORS["primary"],
+                                 textvariable=self.var, **kwargs)
             self.entry.pack(side="left", fill="x", expand=True, ipady=8, ipadx=10)
         else:
             self.entry = tk.Entry(self, relief="flat", bd=0, bg=COLORS["card"],
                                  fg=COLORS["text"], font=("SF Pro Text", 12),
-                                 insertbackground=COLORS["primary"], **kwargs)
+                                 insertbackground=COLORS["primary"],
+                                 textvariable=self.var, **kwargs)
             self.entry.pack(fill="x", ipady=8, ipadx=10)
         
         # Add subtle border
         self.entry.configure(highlightthickness=1, highlightbackground=COLORS["border"],
                            highlightcolor=COLORS["primary"])
+
+        self.var.trace_add("write", self._on_write)
+
+    def _on_write(self, *args):
+        dirty = self.var.get() != self.baseline
+        if dirty != self.dirty:
+            self.dirty = dirty
+            # Edited-but-unsaved fields keep an accent border when unfocused
+            self.entry.configure(highlightbackground=COLORS["primary"] if dirty else COLORS["border"])
+
+    def set_value(self, value):
+        """Replace the text and treat it as the clean baseline"""
+        self.baseline = value
+        self.var.set(value)
+        self._on_write()
+
+    def mark_clean(self):
+        self.set_value(self.var.get())
     
     def get(self):
         return self.entry.get()
@@ -227,21 +2815,71 @@ class ModernEntry(tk.Frame):
     def insert(self, index, string):
         self.entry.insert(index, string)
 
+class ModernCombobox(ttk.Combobox):
+    """Readonly Combobox with ModernEntry's baseline and dirty tracking"""
+    def __init__(self, parent, **kwargs):
+        self.var = tk.StringVar()
+        super().__init__(parent, textvariable=self.var, state="readonly", **kwargs)
+        self.baseline = ""
+        self.dirty = False
+        self.var.trace_add("write", self._on_write)
+
+    def _on_write(self, *args):
+        dirty = self.var.get() != self.baseline
+        if dirty != self.dirty:
+            self.dirty = dirty
+            self.configure(style="Dirty.TCombobox" if dirty else "TCombobox")
+
+    def set_value(self, value):
+        """Replace the selection and treat it as the clean baseline"""
+        self.baseline = value
+        self.var.set(value)
+        self._on_write()
+
+    def mark_clean(self):
+        self.set_value(self.var.get())
+
+# =====================
+# LAYOUT SCHEDULER
+# =====================
+class LayoutScheduler:
+    """Coalesces scroll-region recomputation into one idle-time pass.
+
+    <Configure> handlers call request() as often as they like; each dirty
+    canvas has its bbox measured once, after Tk has finished the geometry
+    changes that triggered it.
+    """
+    def __init__(self, widget):
+        self.widget = widget
+        self.pending = set()
+        self.job = None
+
+    def request(self, canvas):
+        self.pending.add(canvas)
+        if self.job is None:
+            self.job = self.widget.after_idle(self.flush)
+
+    @profiled("LayoutScheduler.flush", "layout")
+    def flush(self):
+        self.job = None
+        canvases, self.pending = self.pending, set()
+        for canvas in canvases:
+            if canvas.winfo_exists():
+                canvas.configure(scrollregion=canvas.bbox("all"))
+
 # =====================
 # SCROLLABLE FRAME
 # =====================
 class ScrollableFrame(ttk.Frame):
-    def __init__(self, container):
+    def __init__(self, container, layout=None):
         super().__init__(container)
+        self.layout = layout or LayoutScheduler(self)
         self.canvas = tk.Canvas(self, highlightthickness=0, bg=COLORS["bg"])
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
         self.scrollable_frame = ttk.Frame(self.canvas)
         self.scrollable_frame.configure(style="Card.TFrame")
 
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
+        self.scrollable_frame.bind("<Configure>", self._on_frame_configure)
 
         self.window_id = self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         self.canvas.configure(yscrollcommand=scrollbar.set)
@@ -251,9 +2889,391 @@ class ScrollableFrame(ttk.Frame):
 
         self.canvas.bind("<Configure>", self._resize)
 
+    def _on_frame_configure(self, event):
+        self.layout.request(self.canvas)
+
     def _resize(self, event):
         self.canvas.itemconfig(self.window_id, width=event.width)
 
+# =====================
+# PERFORMANCE OVERLAY
+# =====================
+class PerformanceOverlay(tk.Toplevel):
+    """Live per-span timing table fed from PROFILER"""
+    COLUMNS = (("count", "Calls", 60), ("total", "Total ms", 90),
+               ("mean", "Mean ms", 90), ("max", "Max ms", 90))
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Performance")
+        self.geometry("620x420")
+        self.configure(bg=COLORS["bg"])
+        self.attributes("-topmost", True)
+
+        self.table = ttk.Treeview(self, columns=[c[0] for c in self.COLUMNS],
+                                  show="tree headings")
+        self.table.heading("#0", text="Span")
+        self.table.column("#0", width=260)
+        for key, heading, width in self.COLUMNS:
+            self.table.heading(key, text=heading)
+            self.table.column(key, width=width, anchor="e")
+        self.table.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+
+        btn_frame = tk.Frame(self, bg=COLORS["bg"])
+        btn_frame.pack(fill="x", padx=10, pady=(5, 10))
+
+        self.status_label = tk.Label(btn_frame, bg=COLORS["bg"], fg=COLORS["text_light"],
+                                     font=("SF Pro Text", 10), anchor="w")
+        self.status_label.pack(side="left", fill="x", expand=True)
+
+        ModernButton(btn_frame, text="Export Trace", command=self.export_trace,
+                    bg_color=COLORS["primary"], hover_color=COLORS["primary_hover"],
+                    width=120, height=34).pack(side="right", padx=3)
+        ModernButton(btn_frame, text="Clear", command=PROFILER.clear,
+                    bg_color=COLORS["text_light"], width=80, height=34).pack(side="right", padx=3)
+
+        self._refresh_job = None
+        self.refresh()
+
+    def refresh(self):
+        self.table.delete(*self.table.get_children())
+        for name, count, total, mean, worst in PROFILER.summary():
+            self.table.insert("", "end", text=name,
+                              values=(count, f"{total:.1f}", f"{mean:.2f}", f"{worst:.2f}"))
+        self.status_label.config(
+            text=f"{len(PROFILER.spans)}/{PROFILER.spans.maxlen} spans buffered")
+        self._refresh_job = self.after(PROFILE_REFRESH_MS, self.refresh)
+
+    def export_trace(self):
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Export Chrome Trace",
+            defaultextension=".json",
+            initialfile=f"cms-trace-{datetime.now():%Y%m%d-%H%M%S}.json",
+            filetypes=[("Chrome Trace", "*.json")]
+        )
+        if path:
+            PROFILER.export_chrome_trace(path)
+
+    def destroy(self):
+        if self._refresh_job:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        super().destroy()
+
+# =====================
+# MEMORY MONITOR
+# =====================
+class MemoryMonitor(tk.Toplevel):
+    """Live bytes per subsystem plus on-demand tracemalloc snapshot diffs"""
+    def __init__(self, app):
+        super().__init__(app)
+        self.app = app
+        self.title("Memory")
+        self.geometry("720x520")
+        self.configure(bg=COLORS["bg"])
+        self.baseline = None
+
+        self.table = ttk.Treeview(self, columns=("live", "budget"), show="tree headings", height=5)
+        self.table.heading("#0", text="Subsystem")
+        self.table.column("#0", width=240)
+        for key, heading in (("live", "Live"), ("budget", "Budget")):
+            self.table.heading(key, text=heading)
+            self.table.column(key, width=120, anchor="e")
+        self.table.pack(fill="x", padx=10, pady=(10, 5))
+
+        self.diff_text = tk.Text(self, height=14, relief="flat", bg=COLORS["card"],
+                                 fg=COLORS["text"], font=("SF Mono", 10), wrap="none")
+        self.diff_text.pack(fill="both", expand=True, padx=10, pady=5)
+
+        btn_frame = tk.Frame(self, bg=COLORS["bg"])
+        btn_frame.pack(fill="x", padx=10, pady=(5, 10))
+
+        ModernButton(btn_frame, text="Snapshot", command=self.take_snapshot,
+                    bg_color=COLORS["primary"], hover_color=COLORS["primary_hover"],
+                    width=110, height=34).pack(side="left", padx=3)
+        ModernButton(btn_frame, text="Diff", command=self.diff_snapshot,
+                    bg_color=COLORS["primary"], hover_color=COLORS["primary_hover"],
+                    width=80, height=34).pack(side="left", padx=3)
+        ModernButton(btn_frame, text="Trim Now", command=self.trim,
+                    bg_color=COLORS["danger"], hover_color=COLORS["danger_hover"],
+                    width=100, height=34).pack(side="right", padx=3)
+
+        self._refresh_job = None
+        self.refresh()
+
+    def refresh(self):
+        self.table.delete(*self.table.get_children())
+        for name, live in self.app.memory_report().items():
+            budget = MEMORY_BUDGETS.get(name)
+            self.table.insert("", "end", text=name.replace("_", " ").title(),
+                              values=(f"{live / MB:.2f} MB",
+                                      f"{budget / MB:.0f} MB" if budget else "—"))
+        self._refresh_job = self.after(PROFILE_REFRESH_MS * 2, self.refresh)
+
+    def take_snapshot(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.baseline = tracemalloc.take_snapshot()
+        self._show(["Baseline snapshot taken - use the CMS, then press Diff."])
+
+    def diff_snapshot(self):
+        if self.baseline is None:
+            self.take_snapshot()
+            return
+        current = tracemalloc.take_snapshot()
+        stats = current.compare_to(self.baseline, "lineno")
+        self._show([str(stat) for stat in stats[:MEMORY_SNAPSHOT_TOP]])
+
+    def trim(self):
+        self.app.enforce_memory_budgets(force=True)
+
+    def _show(self, lines):
+        self.diff_text.delete("1.0", tk.END)
+        self.diff_text.insert("1.0", "\n".join(lines))
+
+    def destroy(self):
+        if self._refresh_job:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        if self.baseline is not None and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        super().destroy()
+
+class StillViewer(tk.Toplevel):
+    """Pan/zoom view of a gallery still, up to full resolution.
+
+    Each zoom step is a pyramid level shown 1:1. Only tiles overlapping the
+    visible area are read and turned into PhotoImages, and an LRU of
+    VIEWER_TILE_CACHE tiles bounds memory while panning.
+    """
+    def __init__(self, app, path):
+        super().__init__(app)
+        self.app = app
+        self.title(os.path.basename(path))
+        self.geometry("1100x720")
+        self.configure(bg="#000000")
+        self.pyramid = ImagePyramid(path)
+        self.level = None
+        self.tiles = collections.OrderedDict()  # (level, col, row) -> PhotoImage
+        self.items = {}  # Tiles currently on the canvas -> canvas item id
+        self._render_job = None
+
+        self.status = tk.Label(self, text="Building tiles…", bg=COLORS["bg"], fg=COLORS["text_light"],
+                               font=("SF Pro Text", 11), anchor="w", padx=10, pady=4)
+        self.status.pack(side="bottom", fill="x")
+        self.canvas = tk.Canvas(self, bg="#000000", highlightthickness=0,
+                                xscrollincrement=1, yscrollincrement=1)
+        self.canvas.pack(fill="both", expand=True)
+
+        self.canvas.bind("<ButtonPress-1>", lambda e: self.canvas.scan_mark(e.x, e.y))
+        self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<MouseWheel>", lambda e: self.zoom(1 if e.delta > 0 else -1, e.x, e.y))
+        self.canvas.bind("<Button-4>", lambda e: self.zoom(1, e.x, e.y))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom(-1, e.x, e.y))
+        self.canvas.bind("<Configure>", lambda e: self.schedule_render())
+        for key in ("<plus>", "<equal>"):
+            self.bind(key, lambda e: self.zoom(1))
+        self.bind("<minus>", lambda e: self.zoom(-1))
+        self.bind("0", lambda e: self.fit())
+        self.bind("<Escape>", lambda e: self.destroy())
+
+        if self.pyramid.open():
+            self.after_idle(self.fit)
+        else:
+            app.run_job(self.pyramid.build, on_done=self.on_built, on_error=self.on_build_failed)
+
+    def on_built(self, pyramid):
+        if self.winfo_exists():  # The window may have been closed while tiles were built
+            self.fit()
+
+    def on_build_failed(self, error):
+        if self.winfo_exists():
+            self.status.config(text=f"Couldn't open this still: {error}")
+
+    def fit(self):
+        """Largest level that fits the window"""
+        if not self.pyramid.levels:
+            return
+        cw, ch = self.canvas.winfo_width(), self.canvas.winfo_height()
+        level = next((i for i, (w, h) in enumerate(self.pyramid.levels) if w <= cw and h <= ch),
+                     len(self.pyramid.levels) - 1)
+        self.show_level(level, 0.5, 0.5, cw / 2, ch / 2)
+
+    def zoom(self, direction, x=None, y=None):
+        """Step one level in (direction 1) or out, keeping the point under (x, y) still"""
+        if self.level is None:
+            return
+        level = min(max(self.level - direction, 0), len(self.pyramid.levels) - 1)
+        if level == self.level:
+            return
+        cw, ch = self.canvas.winfo_width(), self.canvas.winfo_height()
+        x = cw / 2 if x is None else x
+        y = ch / 2 if y is None else y
+        w, h = self.pyramid.levels[self.level]
+        self.show_level(level, self.canvas.canvasx(x) / w, self.canvas.canvasy(y) / h, x, y)
+
+    def show_level(self, level, fx, fy, x, y):
+        """Switch level with image fraction (fx, fy) drawn at window point (x, y)"""
+        self.level = level
+        w, h = self.pyramid.levels[level]
+        cw, ch = self.canvas.winfo_width(), self.canvas.winfo_height()
+        self.canvas.delete("tile")
+        self.items.clear()
+
+        # Levels smaller than the window are centred
+        ox, oy = min(0, (w - cw) // 2), min(0, (h - ch) // 2)
+        rw, rh = max(w, cw), max(h, ch)
+        self.canvas.configure(scrollregion=(ox, oy, ox + rw, oy + rh))
+        self.canvas.xview_moveto((fx * w - x - ox) / rw)
+        self.canvas.yview_moveto((fy * h - y - oy) / rh)
+
+        full_w = self.pyramid.levels[0][0]
+        self.status.config(text=f"{100 * w / full_w:.0f}%  ·  {w}×{h}  ·  "
+                                "scroll to zoom, drag to pan, 0 to fit, Esc to close")
+        self.schedule_render()
+
+    def on_drag(self, event):
+        self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self.schedule_render()
+
+    def schedule_render(self):
+        if self._render_job is None:
+            self._render_job = self.after_idle(self.render_visible)
+
+    @profiled("StillViewer.render_visible", "ui")
+    def render_visible(self):
+        self._render_job = None
+        if self.level is None:
+            return
+        w, h = self.pyramid.levels[self.level]
+        x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        x1, y1 = x0 + self.canvas.winfo_width(), y0 + self.canvas.winfo_height()
+        cols = range(max(0, int(x0) // TILE_SIZE), min(-(-w // TILE_SIZE), int(x1) // TILE_SIZE + 1))
+        rows = range(max(0, int(y0) // TILE_SIZE), min(-(-h // TILE_SIZE), int(y1) // TILE_SIZE + 1))
+        wanted = {(self.level, c, r) for c in cols for r in rows}
+
+        for key in [k for k in self.items if k not in wanted]:
+            self.canvas.delete(self.items.pop(key))
+        for key in wanted:
+            if key not in self.items:
+                _level, c, r = key
+                self.items[key] = self.canvas.create_image(c * TILE_SIZE, r * TILE_SIZE, anchor="nw",
+                                                           image=self.tile_photo(key), tags="tile")
+
+    def tile_photo(self, key):
+        photo = self.tiles.get(key)
+        if photo is not None:
+            self.tiles.move_to_end(key)
+            return photo
+        photo = ImageTk.PhotoImage(self.pyramid.tile(*key))
+        self.tiles[key] = photo
+        # Evict least recently used tiles, never ones still on the canvas
+        for old in list(self.tiles):
+            if len(self.tiles) <= VIEWER_TILE_CACHE:
+                break
+            if old not in self.items and old != key:
+                del self.tiles[old]
+        return photo
+
+    def destroy(self):
+        if self._render_job:
+            self.after_cancel(self._render_job)
+            self._render_job = None
+        self.tiles.clear()
+        self.pyramid.close()
+        super().destroy()
+
+class ValidationReport(tk.Toplevel):
+    """Catalogue issues; double-click one to jump to its project"""
+    def __init__(self, app, issues):
+        super().__init__(app)
+        self.app = app
+        self.issues = issues
+        self.title("Catalogue Validation")
+        self.geometry("860x480")
+        self.configure(bg=COLORS["bg"])
+
+        errors = sum(1 for i in issues if i["severity"] == "error")
+        tk.Label(self, text=f"{errors} error(s), {len(issues) - errors} warning(s)",
+                bg=COLORS["bg"], fg=COLORS["danger"] if errors else COLORS["text"],
+                font=("SF Pro Text", 13, "bold"), anchor="w").pack(fill="x", padx=10, pady=(10, 5))
+
+        self.table = ttk.Treeview(self, columns=("kind", "project", "message"), show="headings")
+        for key, heading, width in (("kind", "Issue", 140), ("project", "Project / File", 240),
+                                    ("message", "Details", 440)):
+            self.table.heading(key, text=heading)
+            self.table.column(key, width=width, anchor="w")
+        self.table.tag_configure("error", foreground=COLORS["danger"])
+        for n, i in enumerate(issues):
+            where = i["project"] or os.path.relpath(i["path"])
+            self.table.insert("", "end", iid=str(n), values=(i["kind"], where, i["message"]),
+                              tags=(i["severity"],))
+        self.table.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.table.bind("<Double-1>", self.on_open)
+
+    def on_open(self, event):
+        selection = self.table.selection()
+        if not selection:
+            return
+        pid = self.issues[int(selection[0])]["project"]
+        for index, p in enumerate(self.app.projects):
+            if p.get("id") == pid:
+                self.app.select_project(index)
+                return
+
+class CropPreview(tk.Toplevel):
+    """Before/after of regenerated thumbnail crops; ticked ones are applied together"""
+    def __init__(self, app, items):
+        super().__init__(app)
+        self.app = app
+        self.items = items
+        self.images = []  # PhotoImages must outlive their labels
+        self.title("Regenerate Thumbnails")
+        self.geometry("620x640")
+        self.configure(bg=COLORS["bg"])
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        tk.Label(self, text=f"{len(items)} thumbnail(s) recropped; untick any to keep as they are",
+                bg=COLORS["bg"], fg=COLORS["text"], font=("SF Pro Text", 13, "bold"),
+                anchor="w").pack(fill="x", padx=10, pady=(10, 5))
+
+        btn_frame = tk.Frame(self, bg=COLORS["bg"])
+        btn_frame.pack(side="bottom", fill="x", padx=10, pady=10)
+        ModernButton(btn_frame, text="Apply", command=self.apply,
+                    bg_color=COLORS["success"], hover_color=COLORS["success_hover"],
+                    width=110, height=36).pack(side="right")
+        ModernButton(btn_frame, text="Cancel", command=self.cancel,
+                    bg_color=COLORS["text_light"], width=90, height=36).pack(side="right", padx=(0, 8))
+
+        scroll = ScrollableFrame(self)
+        scroll.pack(fill="both", expand=True, padx=10)
+        self.selected = []
+        for p, _sha1, aspect, result in items:
+            row = tk.Frame(scroll.scrollable_frame, bg=COLORS["card"])
+            row.pack(fill="x", pady=4)
+            var = tk.BooleanVar(value=True)
+            self.selected.append(var)
+            tk.Checkbutton(row, variable=var, bg=COLORS["card"]).pack(side="left", padx=(5, 0))
+            shape = f"{aspect[0]}:{aspect[1]}" if result["staged"] else "kept as is"
+            tk.Label(row, text=f"{p.get('title', p['id'])}\n{shape}", bg=COLORS["card"],
+                    fg=COLORS["text"], width=22, anchor="w", justify="left").pack(side="left", padx=5)
+            for img in (result["before"], result["after"]):
+                photo = ImageTk.PhotoImage(img)
+                self.images.append(photo)
+                tk.Label(row, image=photo, bg=COLORS["card"]).pack(side="left", padx=5, pady=5)
+
+    def apply(self):
+        chosen = [item for item, var in zip(self.items, self.selected) if var.get()]
+        self.destroy()
+        self.app.discard_staged_crops([item for item, var in zip(self.items, self.selected) if not var.get()])
+        if chosen:
+            self.app.apply_thumbnail_crops(chosen)
+
+    def cancel(self):
+        self.destroy()
+        self.app.discard_staged_crops(self.items)
+
 # =====================
 # APP
 # =====================
@@ -275,10 +3295,19 @@ class PortfolioApp(TkinterDnD.Tk):
         
         self.configure(bg=COLORS["bg"])
 
-        self.data = load_data()
-        self.projects = self.data["projects"]
-        self.categories = [c["id"] for c in self.data["categories"]]
+        self.store = open_store()
+        self.open_catalogue()
         
+        # Image metadata and duplicate detection; the index catches up with disk in a job
+        self.image_index = ImageIndex().load()
+        indexed = bool(self.image_index.entries)
+        self.phash_index = PHashIndex(self.image_index).load()
+        self.duplicate_gallery_indices = set()
+
+        # Previews, prefetch, copies, deletes, saves and scans all run as jobs
+        self.jobs = JobScheduler()
+        self.job_poll_pending = False
+
         # Undo/Redo
         self.undo_manager = UndoManager()
         self.undo_manager.add_state(self.projects)
@@ -291,16 +3320,52 @@ class PortfolioApp(TkinterDnD.Tk):
 
         self.thumbnail_image = None
         self.gallery_images = []
+        self.atlas = None
+        self.pending_copies = set()  # Destinations of copy jobs in flight
         
         # Unsaved changes tracking
         self.has_unsaved_changes = False
+        self.saving = False  # A save (its disk read, then its write) is in flight
+        self.save_again = False
+        self.merge_after_save = False
+        self.merging = False  # A disk read for an external merge is in flight
+        self.merge_again = False
+
+        self.perf_overlay = None
+        self.memory_monitor = None
+        self.still_viewer = None
+        self.validation_report = None
+        self.crop_preview = None
+        self.tree_drag = None
+
+        # Site placeholders: (record id, field, rel, sha1) being computed, results by image sha1
+        self.lqip_pending = set()
+        self.lqip_cache = {}
+
+        self.issues = {}  # project index -> issues, kept current edit by edit
+        self.duplicate_ids = set()
+        self.layout = LayoutScheduler(self)
+
+        # Tree expansion state persists across sessions
+        self.ui_state = load_ui_state()
+        self.expanded_categories = set(self.ui_state.get("expanded_categories", []))
 
         self.build_ui()
         self.populate_tree()
         self.bind_shortcuts()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         if self.projects:
             self.select_project(0)
+        # On a first run nothing validates until this lands, so it goes ahead of previews
+        self.run_job(self.image_index.changes, "maintenance" if indexed else "interactive",
+                     on_done=self.apply_index_changes)
+
+        # Pick up edits from scripts/ and git while the CMS is open
+        watch_files, watch_dirs = self.store.watch_paths()
+        self.file_watcher = FileWatcher(watch_files, watch_dirs + [IMAGES_DIR]).start()
+        self.after(WATCH_POLL_MS, self.poll_file_changes)
+        self.after(INDEX_FLUSH_MS, self.flush_image_index)
 
     def setup_styles(self):
         style = ttk.Style()
@@ -319,6 +3384,9 @@ class PortfolioApp(TkinterDnD.Tk):
         
         # Configure frame
         style.configure("Card.TFrame", background=COLORS["bg"])
+
+        # Edited-but-unsaved comboboxes get the same accent border as entries
+        style.configure("Dirty.TCombobox", bordercolor=COLORS["primary"])
         
         # Configure scrollbars to match theme
         style.configure("Vertical.TScrollbar",
@@ -349,12 +3417,58 @@ class PortfolioApp(TkinterDnD.Tk):
         # Reapply theme
         self.apply_theme()
     
+    def toggle_perf_overlay(self):
+        # Spans are only recorded while the overlay is open (or CMS_PROFILE=1)
+        if self.perf_overlay is not None and self.perf_overlay.winfo_exists():
+            self.perf_overlay.destroy()
+            self.perf_overlay = None
+            PROFILER.enabled = os.environ.get("CMS_PROFILE") == "1"
+            return
+
+        PROFILER.enabled = True
+        self.perf_overlay = PerformanceOverlay(self)
+        self.perf_overlay.protocol("WM_DELETE_WINDOW", self.toggle_perf_overlay)
+
+    def toggle_memory_monitor(self):
+        if self.memory_monitor is not None and self.memory_monitor.winfo_exists():
+            self.memory_monitor.destroy()
+            self.memory_monitor = None
+            return
+
+        self.memory_monitor = MemoryMonitor(self)
+        self.memory_monitor.protocol("WM_DELETE_WINDOW", self.toggle_memory_monitor)
+
+    def memory_report(self):
+        """Live bytes per subsystem"""
+        photos = [self.thumbnail_image] if self.thumbnail_image else []
+        photos += self.gallery_images
+        if self.still_viewer is not None and self.still_viewer.winfo_exists():
+            photos += list(self.still_viewer.tiles.values())
+        return {
+            "decoded_images": PREVIEW_CACHE.bytes,
+            "photo_images": sum(photo_nbytes(p) for p in photos),
+            "undo_history": self.undo_manager.bytes,
+            "catalogue": deep_sizeof(self.data),
+        }
+
+    def enforce_memory_budgets(self, force=False):
+        """Evict from subsystems that are over budget (or everything evictable when forced)"""
+        image_budget = 0 if force else MEMORY_BUDGETS["decoded_images"]
+        undo_budget = 0 if force else MEMORY_BUDGETS["undo_history"]
+        if PREVIEW_CACHE.bytes > image_budget:
+            PREVIEW_CACHE.evict_to(image_budget)
+        if self.undo_manager.bytes > undo_budget:
+            self.undo_manager.trim(undo_budget)
+
     def apply_theme(self):
         # Update styles
         self.setup_styles()
         
         # Rebuild UI to apply new colors
         for widget in self.winfo_children():
+            if widget in (self.perf_overlay, self.memory_monitor, self.still_viewer,
+                          self.validation_report, self.crop_preview):
+                continue
             widget.destroy()
         
         self.build_ui()
@@ -389,6 +3503,10 @@ class PortfolioApp(TkinterDnD.Tk):
         self.bind_all("<Command-Shift-Z>", safe_shortcut(self.redo))
         self.bind_all("<Command-f>", safe_shortcut(lambda: self.search_entry.focus()))
         self.bind_all("<Command-Shift-L>", safe_shortcut(self.toggle_night_mode))
+        self.bind_all("<Command-Shift-P>", safe_shortcut(self.toggle_perf_overlay))
+        self.bind_all("<Command-Shift-M>", safe_shortcut(self.toggle_memory_monitor))
+        self.bind_all("<Command-Shift-V>", safe_shortcut(self.show_validation_report))
+        self.bind_all("<Command-Shift-T>", safe_shortcut(self.regenerate_thumbnails))
 
     def build_ui(self):
         # Main container
@@ -435,12 +3553,17 @@ class PortfolioApp(TkinterDnD.Tk):
         tk.Label(filter_frame, text="Filter:", bg=COLORS["sidebar"],
                 fg=COLORS["text_light"], font=("SF Pro Text", 10)).pack(side="left", padx=(0, 5))
         
-        filter_combo = ttk.Combobox(filter_frame, textvariable=self.filter_category,
+        self.filter_combo = filter_combo = ttk.Combobox(filter_frame, textvariable=self.filter_category,
                                    values=["All"] + self.categories, state="readonly",
                                    font=("SF Pro Text", 10), width=15)
         filter_combo.pack(side="left")
         filter_combo.bind("<<ComboboxSelected>>", lambda e: self.on_search())
 
+        # Background job queue, under the tree
+        self.job_status = tk.Label(left, text="Idle", bg=COLORS["sidebar"], fg=COLORS["text_light"],
+                                   font=("SF Pro Text", 10), anchor="w")
+        self.job_status.pack(side="bottom", fill="x", padx=15, pady=(0, 8))
+
         # Tree
         tree_frame = tk.Frame(left, bg=COLORS["sidebar"])
         tree_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
@@ -448,6 +3571,11 @@ class PortfolioApp(TkinterDnD.Tk):
         self.tree = ttk.Treeview(tree_frame, show="tree")
         self.tree.pack(fill="both", expand=True)
         self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<<TreeviewOpen>>", self.on_tree_open)
+        self.tree.bind("<<TreeviewClose>>", self.on_tree_close)
+        self.tree.bind("<ButtonPress-1>", self.on_tree_press, add="+")
+        self.tree.bind("<B1-Motion>", self.on_tree_drag, add="+")
+        self.tree.bind("<ButtonRelease-1>", self.on_tree_release, add="+")
         
         # Tree scrolling - only when mouse is over it
         self.tree.bind("<Enter>", self._bind_tree_scroll)
@@ -494,6 +3622,18 @@ class PortfolioApp(TkinterDnD.Tk):
                                           bg_color=COLORS["text_light"],
                                           width=50, height=40)
         self.night_mode_btn.pack(side="right", padx=(10, 0))
+
+        # Performance overlay toggle
+        ModernButton(topbar_content, text="⏱", command=self.toggle_perf_overlay,
+                    bg_color=COLORS["text_light"], width=50, height=40).pack(side="right", padx=(10, 0))
+
+        # Catalogue validation report
+        ModernButton(topbar_content, text="✓", command=self.show_validation_report,
+                    bg_color=COLORS["text_light"], width=50, height=40).pack(side="right", padx=(10, 0))
+
+        # Batch smart-crop of site thumbnails
+        ModernButton(topbar_content, text="✂", command=self.regenerate_thumbnails,
+                    bg_color=COLORS["text_light"], width=50, height=40).pack(side="right", padx=(10, 0))
         
         # Undo/Redo buttons
         undo_frame = tk.Frame(topbar_content, bg=COLORS["topbar"])
@@ -515,7 +3655,7 @@ class PortfolioApp(TkinterDnD.Tk):
         content = tk.Frame(right, bg=COLORS["bg"])
         content.pack(fill="both", expand=True, padx=30, pady=20)
 
-        scroll = ScrollableFrame(content)
+        scroll = ScrollableFrame(content, layout=self.layout)
         scroll.pack(fill="both", expand=True)
         form = scroll.scrollable_frame
 
@@ -545,12 +3685,12 @@ class PortfolioApp(TkinterDnD.Tk):
         tk.Label(cat_frame, text="Category:", bg=COLORS["bg"], fg=COLORS["text"],
                 font=("SF Pro Text", 11), anchor="e", width=12).pack(side="left", padx=(0, 10))
         
-        self.category_var = tk.StringVar()
-        cat_combo = ttk.Combobox(cat_frame, values=self.categories,
-                                textvariable=self.category_var, state="readonly",
-                                font=("SF Pro Text", 12))
+        self.category_combo = cat_combo = ModernCombobox(cat_frame, values=self.categories,
+                                                         font=("SF Pro Text", 12))
+        self.category_var = cat_combo.var
         cat_combo.pack(side="left", fill="x", expand=True)
         cat_combo.bind("<<ComboboxSelected>>", self.on_category_change)
+        self.fields["category"] = cat_combo  # Saved, merged and dirty-tracked like the entries
 
         # Thumbnail section in right column with fixed height
         thumb_section = tk.Frame(right_column, bg=COLORS["card"], highlightthickness=1,
@@ -614,8 +3754,7 @@ class PortfolioApp(TkinterDnD.Tk):
         self.gallery_canvas.pack(fill="x")
         gallery_scrollbar.pack(fill="x", pady=(5, 0))
         
-        self.gallery_frame.bind("<Configure>",
-            lambda e: self.gallery_canvas.configure(scrollregion=self.gallery_canvas.bbox("all")))
+        self.gallery_frame.bind("<Configure>", self._on_gallery_frame_configure)
 
         # Gallery controls
         gallery_ctrl = tk.Frame(gallery_section, bg=COLORS["card"])
@@ -641,23 +3780,104 @@ class PortfolioApp(TkinterDnD.Tk):
                                               hover_color=COLORS["danger_hover"],
                                               width=100, height=38)
         self.delete_gallery_btn.pack(side="left", padx=3)
+
+        ModernButton(gallery_ctrl, text="🔍 Duplicates", command=self.find_gallery_duplicates,
+                    bg_color=COLORS["text_light"], width=130, height=38).pack(side="left", padx=3)
+
+        # Colour scopes for the selected still
+        scopes = tk.Frame(gallery_section, bg=COLORS["card"])
+        scopes.pack(fill="x", pady=(15, 0))
+        self.scope_labels = {}
+        self.scope_images = {}
+        for name in SCOPES:
+            column = tk.Frame(scopes, bg=COLORS["card"])
+            column.pack(side="left", padx=(0, 12))
+            tk.Label(column, text=name.title(), bg=COLORS["card"], fg=COLORS["text_light"],
+                    font=("SF Pro Text", 10), anchor="w").pack(fill="x")
+            # Fixed pixel size so the panel doesn't jump while scopes are computed
+            screen = tk.Frame(column, bg="#000000", width=SCOPE_SIZE[0], height=SCOPE_SIZE[1])
+            screen.pack_propagate(False)
+            screen.pack()
+            self.scope_labels[name] = tk.Label(screen, bg="#000000", fg=COLORS["text_light"],
+                                               font=("SF Pro Text", 10))
+            self.scope_labels[name].pack(fill="both", expand=True)
         
         # Drag and drop for gallery
         self.gallery_canvas.drop_target_register(DND_FILES)
         self.gallery_canvas.dnd_bind('<<Drop>>', self.on_gallery_drop)
 
-        # Bottom save button
-        ModernButton(content, text="💾 Save Project Changes",
-                    command=self.save_project,
-                    bg_color=COLORS["success"], hover_color=COLORS["success_hover"],
-                    height=45).pack(fill="x", pady=(20, 0))
+        # Bottom save button
+        ModernButton(content, text="💾 Save Project Changes",
+                    command=self.save_project,
+                    bg_color=COLORS["success"], hover_color=COLORS["success_hover"],
+                    height=45).pack(fill="x", pady=(20, 0))
+
+    def open_catalogue(self):
+        self.data = self.store.load()
+        self.data["projects"] = [ProjectRecord.from_dict(p) for p in self.data["projects"]]
+        self.projects = self.data["projects"]
+        # Last known on-disk catalogue, the base for merging external edits. Taken
+        # before sort keys are assigned so it matches the file until the next save.
+        self.disk_base = copy.deepcopy(self.data)
+        assign_sort_keys(self.projects)
+        self.categories = [c["id"] for c in self.data["categories"]]
+        self.store_synced = False
+
+    # ========== BACKGROUND JOBS ==========
+    def run_job(self, fn, lane="interactive", token=None, on_done=None, on_error=None, process=False):
+        """Submit a job and make sure its callbacks get pumped"""
+        job = self.jobs.submit(fn, lane, token, on_done, on_error, process)
+        self.schedule_job_poll()
+        return job
+
+    def schedule_job_poll(self):
+        if not self.job_poll_pending:
+            self.job_poll_pending = True
+            self.after(JOB_POLL_MS, self.poll_jobs)
+
+    def poll_jobs(self):
+        self.job_poll_pending = False
+        busy = True
+        try:
+            busy = self.jobs.pump()
+            self.update_job_status()
+        finally:
+            if busy:  # Also after an error, so results never stop being collected
+                self.schedule_job_poll()
+
+    def update_job_status(self):
+        counts = [f"{n} {lane}" for lane, n in self.jobs.counts().items() if n]
+        self.job_status.config(text="⟳ " + " · ".join(counts) if counts else "Idle")
+
+    def apply_index_changes(self, changes):
+        """Fold an image index scan into the index; validation follows if anything moved"""
+        if self.image_index.apply(*changes):
+            self.revalidate()
+
+    def flush_image_index(self):
+        # Previews, scans and copies only mark the index dirty; one write covers them all
+        if self.image_index.dirty:
+            self.run_job(self.image_index.flush, "maintenance")
+        self.after(INDEX_FLUSH_MS, self.flush_image_index)
+
+    def on_close(self):
+        if self.saving:
+            self.after(JOB_POLL_MS * 10, self.on_close)  # Let the save finish writing first
+            return
+        try:
+            self.image_index.flush()
+        except OSError as e:
+            print(f"Error saving image index: {e}")
+        self.destroy()
 
     # ========== UNDO/REDO ==========
+    @profiled("PortfolioApp.undo", "ui")
     def undo(self):
-        state = self.undo_manager.undo()
+        state = self.undo_manager.undo(self.projects)
         if state:
             self.projects = state
             self.data["projects"] = self.projects
+            self.store_synced = False
             self.populate_tree()
             if self.selected_index is not None and self.selected_index < len(self.projects):
                 self.load_project()
@@ -675,6 +3895,9 @@ class PortfolioApp(TkinterDnD.Tk):
         self.tree.unbind_all("<Button-4>")
         self.tree.unbind_all("<Button-5>")
     
+    def _on_gallery_frame_configure(self, event):
+        self.layout.request(self.gallery_canvas)
+
     def _on_tree_scroll(self, event):
         """Handle tree scrolling"""
         if event.num == 5 or event.delta < 0:
@@ -682,11 +3905,13 @@ class PortfolioApp(TkinterDnD.Tk):
         elif event.num == 4 or event.delta > 0:
             self.tree.yview_scroll(-1, "units")
 
+    @profiled("PortfolioApp.redo", "ui")
     def redo(self):
-        state = self.undo_manager.redo()
+        state = self.undo_manager.redo(self.projects)
         if state:
             self.projects = state
             self.data["projects"] = self.projects
+            self.store_synced = False
             self.populate_tree()
             if self.selected_index is not None and self.selected_index < len(self.projects):
                 self.load_project()
@@ -697,10 +3922,35 @@ class PortfolioApp(TkinterDnD.Tk):
         pass  # Could gray out buttons when unavailable
     
     def save_state(self):
-        self.undo_manager.add_state([dict(p) for p in self.projects])
+        self.undo_manager.add_state(self.projects)
         self.has_unsaved_changes = True
+        self.store_synced = False
+        self.enforce_memory_budgets()
 
     # ========== SEARCH/FILTER ==========
+    def query_store(self):
+        """The store if it answers indexed queries, synced with unsaved edits"""
+        if not hasattr(self.store, "search"):
+            return None
+        if not self.store_synced:
+            self.store.sync(self.projects)
+            self.store_synced = True
+        return self.store
+
+    def search_projects(self, search_term, filter_cat):
+        """Indices of projects matching the search term and category filter"""
+        store = self.query_store()
+        if store is not None:
+            return store.search(search_term, None if filter_cat == "All" else filter_cat)
+
+        return filter_projects(self.projects, search_term, filter_cat)
+
+    def project_id_exists(self, project_id):
+        store = self.query_store()
+        if store is not None:
+            return store.has_id(project_id)
+        return any(p["id"] == project_id for p in self.projects)
+
     def on_category_change(self, event=None):
         """Handle category change to show/hide gallery section"""
         if self.selected_index is None:
@@ -712,53 +3962,230 @@ class PortfolioApp(TkinterDnD.Tk):
         else:
             self.gallery_section.pack_forget()
     
+    @profiled("PortfolioApp.on_search", "ui")
     def on_search(self, *args):
         search_term = self.search_var.get().lower()
         filter_cat = self.filter_category.get()
+
+        if not search_term and filter_cat == "All":
+            self.populate_tree()
+            return
         
         self.tree.delete(*self.tree.get_children())
         self.cat_nodes = {}
-        
+        self.loaded_categories = set()
+
+        # Filtered results are small, so they're inserted eagerly and shown open
+        matches = {}
+        for i in self.search_projects(search_term, filter_cat):
+            matches.setdefault(self.projects[i]["category"], []).append(i)
+
+        hits = []
         for c in self.categories:
             if filter_cat == "All" or filter_cat == c:
-                self.cat_nodes[c] = self.tree.insert("", "end", text=c.upper(), open=True)
-        
-        for i, p in enumerate(self.projects):
-            # Filter by category
-            if filter_cat != "All" and p["category"] != filter_cat:
-                continue
-            
-            # Filter by search
-            if search_term:
-                searchable = f"{p.get('title', '')} {p.get('client', '')} {p.get('role', '')}".lower()
-                if search_term not in searchable:
-                    continue
-            
-            if p["category"] in self.cat_nodes:
-                self.tree.insert(self.cat_nodes[p["category"]], "end",
-                               text=p["title"], values=(i,))
+                indices = category_order(self.projects, matches.get(c, []))
+                self.cat_nodes[c] = self.tree.insert("", "end", iid=f"category:{c}",
+                                                     text=self.category_label(c, len(indices)),
+                                                     open=True)
+                self.insert_project_rows(c, indices)
+                hits.extend(indices)
+
+        if search_term:
+            self.prefetch_projects(hits[:PREFETCH_SEARCH_HITS])
+
+    # ========== EXTERNAL CHANGES ==========
+    def poll_file_changes(self):
+        paths = self.file_watcher.drain()
+        catalogue_dirs = [os.path.abspath(d) for d in self.store.watch_paths()[1]]
+        if any(p in self.file_watcher.files or os.path.dirname(p) in catalogue_dirs
+               for p in paths):
+            self.merge_disk_changes()
+        images = [os.path.relpath(p) for p in paths
+                  if p.lower().endswith(IMAGE_EXTENSIONS)]
+        if images:
+            self.on_images_changed(images)
+        self.after(WATCH_POLL_MS, self.poll_file_changes)
+
+    def merge_disk_changes(self):
+        """Merge projects.json edits made outside the CMS into the live catalogue, once a job reads it"""
+        if self.saving:
+            self.merge_after_save = True  # The file may be half-written; retry once the save lands
+            return
+        if self.merging:
+            self.merge_again = True
+            return
+        self.merging = True
+        self.read_disk(self.disk_read)
+
+    def read_disk(self, on_read):
+        """Read the catalogue on disk in a job; on_read(disk) gets None if it's mid-write or removed"""
+        self.run_job(self.store.read_disk, "interactive", None, on_read, lambda e: on_read(None))
+
+    def disk_read(self, disk):
+        self.merging = False
+        # A save that started meanwhile merged a newer read itself
+        if disk is not None and not self.saving:
+            self.apply_disk_changes(disk)
+        if self.merge_again:
+            self.merge_again = False
+            self.merge_disk_changes()
+
+    @profiled("PortfolioApp.apply_disk_changes", "ui")
+    def apply_disk_changes(self, disk):
+        if disk == self.disk_base:
+            return  # Our own save, or a touch without content changes
+
+        # merge_catalogue reports project_keys(), so a repeated id maps to the right record
+        keys = project_keys(self.projects)
+        selected_key = keys[self.selected_index] if self.selected_index is not None else None
+        old_categories = {k: p["category"] for k, p in zip(keys, self.projects)}
+        old_keys = {k: p.get("sortKey") for k, p in zip(keys, self.projects)}
+
+        merged, updated, added, removed, conflicts = merge_catalogue(
+            self.disk_base["projects"], self.projects, disk["projects"])
+        self.projects[:] = merged
+        rekeyed = assign_sort_keys(self.projects)
+
+        if disk["categories"] != self.disk_base["categories"] and \
+                self.data["categories"] == self.disk_base["categories"]:
+            self.data["categories"] = copy.deepcopy(disk["categories"])
+            self.categories = [c["id"] for c in self.data["categories"]]
+            self.filter_combo.configure(values=["All"] + self.categories)
+            self.category_combo.configure(values=self.categories)
+            added = added or ["categories"]  # Forces a full tree rebuild
+
+        self.disk_base = disk
+        if not (updated or added or removed):
+            return
+        self.undo_manager.add_state(self.projects)
+        self.store_synced = False
+
+        ids = project_keys(self.projects)
+        self.selected_index = ids.index(selected_key) if selected_key in ids else None
+        reordered = rekeyed or any(self.projects[ids.index(pid)].get("sortKey") != old_keys.get(pid)
+                                   for pid in updated)
+
+        if added or removed or reordered:
+            # Indices shifted or rows moved, so every row's value is stale
+            self.populate_tree()
+            if self.selected_index is not None:
+                self.select_project(self.selected_index)
+        else:
+            for pid in updated:
+                i = ids.index(pid)
+                self.refresh_project_row(i, old_categories.get(pid))
+            if selected_key in updated:
+                if any(w.dirty for w in self.fields.values()):
+                    conflicts.append(selected_key)
+                else:
+                    self.load_project()
+
+        if self.selected_index is None and selected_key is not None:
+            self.project_title_label.config(text="Select a project")
+        if conflicts:
+            messagebox.showwarning("External Changes",
+                "projects.json changed on disk while these projects had local edits; "
+                "your versions were kept:\n\n" + "\n".join(sorted(set(conflicts))))
+
+    def on_images_changed(self, paths):
+        """Re-read changed image files in a job, then refresh the index and previews"""
+        self.run_job(functools.partial(read_image_changes, self.image_index, paths), "maintenance",
+                     on_done=self.apply_image_changes)
+
+    def apply_image_changes(self, result):
+        removed, fresh = result
+        changed = set(removed) | set(fresh)
+        for path in removed:
+            self.image_index.discard(path)
+        for path, meta in fresh.items():
+            if meta is not None:
+                self.image_index.update(path, meta)
+        for path in changed:
+            PREVIEW_CACHE.invalidate(path)
+
+        if not changed:
+            return
+        # Only projects referencing a changed file can have gained or lost issues
+        self.revalidate([i for i, p in enumerate(self.projects)
+                         if any(path in changed for _f, path in project_image_paths(p))])
+
+        if self.selected_index is None:
+            return
+        p = self.projects[self.selected_index]
+        if p.get("thumbnail") and thumbnail_path(p) in changed:
+            self.load_thumbnail(p)
+        if p.get("category") == "colour-grading" and \
+                any(os.path.join(GALLERY_DIR, rel) in changed for rel in p.get("gallery", [])):
+            self.load_gallery(p)
 
     # ========== DRAG AND DROP ==========
     def on_thumbnail_drop(self, event):
-        files = self.parse_drop_files(event.data)
-        if files and self.selected_index is not None:
-            self.process_thumbnail(files[0])
+        paths = self.parse_drop_files(event.data)
+        if paths and self.selected_index is not None:
+            # Stops at the first image, so even a dropped folder is cheap
+            file = next(iter_image_files(paths), None)
+            if file:
+                self.process_thumbnail(file)
     
     def on_gallery_drop(self, event):
-        files = self.parse_drop_files(event.data)
-        if files and self.selected_index is not None:
-            self.process_gallery_files(files)
+        paths = self.parse_drop_files(event.data)
+        if paths and self.selected_index is not None:
+            self.ingest_gallery(paths)
     
     def parse_drop_files(self, data):
-        # Parse the file paths from drag and drop
-        files = []
-        for item in data.split():
-            item = item.strip('{}')
-            if os.path.isfile(item):
-                files.append(item)
-        return files
+        # Tk list syntax: paths with spaces arrive brace-quoted
+        return [item for item in self.tk.splitlist(data) if os.path.exists(item)]
+
+    def ingest_gallery(self, paths):
+        """Stream images from files/folders into the selected project's gallery.
+
+        A scan job emits batches; each is duplicate-checked and copied by
+        its own jobs, one batch at a time so the duplicate question comes
+        up at most once per drop.
+        """
+        if self.selected_index is None:
+            return
+        token = CancelToken()
+        ingest = {
+            "project": self.projects[self.selected_index],  # Batches keep going to this project
+            "token": token,
+            "batches": collections.deque(),
+            "busy": False,
+            "scanned": False,
+            "copied": [],
+        }
+        emit = functools.partial(self.jobs.call_soon, self.queue_ingest_batch, ingest, token=token)
+        self.run_job(functools.partial(scan_image_batches, paths, token, emit), "interactive", token,
+                     functools.partial(self.scan_finished, ingest))
+
+    def queue_ingest_batch(self, ingest, batch):
+        ingest["batches"].append(batch)
+        self.advance_ingest(ingest)
+
+    def scan_finished(self, ingest, _result):
+        ingest["scanned"] = True
+        self.advance_ingest(ingest)
+
+    def advance_ingest(self, ingest):
+        if ingest["busy"] or ingest["token"].cancelled:
+            return
+        if ingest["batches"]:
+            ingest["busy"] = True
+            files = ingest["batches"].popleft()
+            self.run_job(functools.partial(self.match_incoming, files), "interactive", ingest["token"],
+                         functools.partial(self.copy_gallery_batch, ingest, files),
+                         lambda e: self.copy_gallery_batch(ingest, files, [[] for _ in files]))
+        elif ingest["scanned"]:
+            self.finish_ingest(ingest)
+
+    def finish_ingest(self, ingest):
+        if ingest["copied"]:
+            self.warn_oversized(ingest["copied"])
+        elif not ingest["token"].cancelled and "skip_duplicates" not in ingest:
+            messagebox.showinfo("No Images", "No images were found in the dropped files or folders.")
 
     # ========== PROJECT MANAGEMENT ==========
+    @profiled("PortfolioApp.select_project", "ui")
     def select_project(self, index):
         if index < 0 or index >= len(self.projects):
             return
@@ -766,37 +4193,229 @@ class PortfolioApp(TkinterDnD.Tk):
         self.selected_index = index
         cat = self.projects[index]["category"]
         
-        # Find and select in tree
-        found = False
-        for cat_node in self.tree.get_children():
-            for child in self.tree.get_children(cat_node):
-                try:
-                    if int(self.tree.item(child, "values")[0]) == index:
-                        self.tree.selection_set(child)
-                        self.tree.see(child)
-                        found = True
-                        break
-                except (ValueError, IndexError):
-                    continue
-            if found:
-                break
+        # Find and select in tree, loading the category first if it's collapsed
+        if cat in self.cat_nodes:
+            self.load_category(cat)
+            self.tree.item(self.cat_nodes[cat], open=True)
+        iid = f"project:{index}"
+        if self.tree.exists(iid):
+            self.tree.selection_set(iid)
+            self.tree.see(iid)
         
         # Always load the project, even if tree selection didn't work
         self.load_project()
 
+    @profiled("PortfolioApp.populate_tree", "ui")
     def populate_tree(self):
         self.tree.delete(*self.tree.get_children())
         self.cat_nodes = {}
+        self.loaded_categories = set()
+        self.revalidate()
+
+        # Index membership up front; rows are only built when a category opens
+        self.category_members = {c: [] for c in self.categories}
+        for i, p in enumerate(self.projects):
+            self.category_members.setdefault(p["category"], []).append(i)
+        for c, members in self.category_members.items():
+            members.sort(key=lambda i: sort_key_order(self.projects, i))
         
         for c in self.categories:
-            self.cat_nodes[c] = self.tree.insert("", "end", text=c.upper(), open=True)
-        
-        for i, p in enumerate(self.projects):
-            self.tree.insert(self.cat_nodes[p["category"]], "end",
-                           text=p["title"], values=(i,))
+            is_open = c in self.expanded_categories
+            self.cat_nodes[c] = self.tree.insert("", "end", iid=f"category:{c}",
+                                                 text=self.category_label(c, len(self.category_members[c])),
+                                                 open=is_open)
+            if is_open:
+                self.load_category(c)
+            elif self.category_members[c]:
+                # Placeholder child so the node shows an expander
+                self.tree.insert(self.cat_nodes[c], "end", text="…")
         
         self.stats_label.config(text=f"{len(self.projects)} Projects")
 
+    def project_row_text(self, index):
+        title = self.projects[index]["title"]
+        return f"⚠ {title}" if self.issues.get(index) else title
+
+    # ========== VALIDATION ==========
+    @profiled("PortfolioApp.revalidate", "ui")
+    def revalidate(self, indices=None):
+        """Re-check the given projects (all when None) and update their tree rows"""
+        if indices is None:
+            self.duplicate_ids = duplicate_project_ids(self.projects)
+            indices = range(len(self.projects))
+            self.issues = {}
+        category_ids = {c["id"] for c in self.data["categories"]}
+        for i in indices:
+            if not 0 <= i < len(self.projects):
+                continue
+            found = validate_project(self.projects[i], category_ids, self.image_index, self.duplicate_ids)
+            had = bool(self.issues.pop(i, None))
+            if found:
+                self.issues[i] = found
+            iid = f"project:{i}"
+            if had != bool(found) and hasattr(self, "tree") and self.tree.exists(iid):
+                self.tree.item(iid, text=self.project_row_text(i))
+        # Every image ingest or change passes through here, so placeholders follow
+        self.queue_site_placeholders(indices)
+
+    # ========== SITE PLACEHOLDERS ==========
+    def queue_site_placeholders(self, indices):
+        """Compute placeholders for the projects' new or changed images in process jobs"""
+        changed = False
+        for i in indices:
+            if not 0 <= i < len(self.projects):
+                continue
+            p = self.projects[i]
+            changed |= prune_site_placeholders(p)
+            for field, rel, path, sha1 in stale_site_placeholders(p, self.image_index):
+                key = (id(p), field, rel, sha1)
+                if sha1 in self.lqip_cache:
+                    set_site_placeholder(p, field, rel, sha1, self.lqip_cache[sha1])
+                    changed = True
+                elif key not in self.lqip_pending:
+                    self.lqip_pending.add(key)
+                    self.run_job(functools.partial(_site_placeholder_worker, path), "maintenance", None,
+                                 functools.partial(self.site_placeholder_ready, p, key),
+                                 lambda e, key=key: self.lqip_pending.discard(key), process=True)
+        if changed:
+            self.placeholders_changed()
+
+    def site_placeholder_ready(self, p, key, placeholder):
+        self.lqip_pending.discard(key)
+        if placeholder is None:
+            return
+        _id, field, rel, sha1 = key
+        self.lqip_cache[sha1] = placeholder
+        # The image may have been replaced or removed while this one was computed
+        if any(job[:2] == (field, rel) and job[3] == sha1
+               for job in stale_site_placeholders(p, self.image_index)):
+            set_site_placeholder(p, field, rel, sha1, placeholder)
+            self.placeholders_changed()
+
+    def placeholders_changed(self):
+        # Derived data: no undo step (an undo recomputes from lqip_cache) and no unsaved
+        # changes, so they're written with the next save and ignored by merges meanwhile
+        self.store_synced = False
+
+    # ========== THUMBNAIL CROPS ==========
+    def regenerate_thumbnails(self):
+        """Smart-crop every thumbnail whose source changed, then preview before applying"""
+        if self.crop_preview is not None and self.crop_preview.winfo_exists():
+            self.crop_preview.lift()
+            return
+        stale = stale_thumbnail_crops(self.projects, self.image_index)
+        if not stale:
+            messagebox.showinfo("Thumbnails", "Every thumbnail's crop is up to date.")
+            return
+        token = self.jobs.renew("crops")
+        self.run_job(functools.partial(thumbnail_crops, [job[1:] for job in stale], self.jobs.process_pool()),
+                     "maintenance", token, functools.partial(self.show_crop_preview, stale),
+                     lambda e: messagebox.showerror("Error", f"Couldn't crop thumbnails: {e}"))
+
+    def show_crop_preview(self, stale, results):
+        items = [(p, sha1, aspect, result)
+                 for (p, _path, sha1, aspect), result in zip(stale, results) if result is not None]
+        if not items:
+            messagebox.showwarning("Thumbnails", "None of the thumbnails could be cropped.")
+            return
+        self.crop_preview = CropPreview(self, items)
+
+    def apply_thumbnail_crops(self, items):
+        pairs = [(result["staged"], os.path.join(THUMBNAILS_DIR, crop_dest(p)))
+                 for p, _s, _a, result in items if result["staged"]]
+        self.run_job(functools.partial(copy_images, pairs), "interactive", None,
+                     functools.partial(self.thumbnail_crops_copied, items),
+                     functools.partial(self.thumbnail_crops_failed, items))
+
+    def thumbnail_crops_failed(self, items, e):
+        self.discard_staged_crops(items)
+        messagebox.showerror("Error", f"Couldn't apply thumbnail crops: {e}")
+
+    def discard_staged_crops(self, items):
+        """Delete the staged files of previewed crops, once applied or turned down"""
+        staged = [result["staged"] for *_i, result in items if result["staged"]]
+        if staged:
+            self.run_job(functools.partial(remove_files, staged), "maintenance")
+
+    def thumbnail_crops_copied(self, items, copied):
+        indices = []
+        copied = iter(copied)  # One per item with a staged crop, in order
+        for p, sha1, aspect, result in items:
+            entry = None
+            if result["staged"]:
+                dest, meta = next(copied)
+                self.image_index.update(dest, meta)
+                PREVIEW_CACHE.invalidate(dest)
+                src = os.path.relpath(dest, THUMBNAILS_DIR).replace(os.sep, "/")
+                entry = thumbnail_crop_entry(src, sha1, aspect, result)
+            index = self.project_index(p)
+            if index is None:
+                continue
+            if entry is None:
+                self.projects[index].pop("thumbnailCrop", None)  # The source is already the right shape
+            else:
+                self.projects[index]["thumbnailCrop"] = entry
+            indices.append(index)
+        self.discard_staged_crops(items)
+        if not indices:
+            return
+        self.save_state()
+        self.revalidate(indices)
+        if self.selected_index in indices:
+            self.load_thumbnail(self.projects[self.selected_index])
+        messagebox.showinfo("Thumbnails", f"Applied {len(indices)} thumbnail crop(s).")
+
+    def show_validation_report(self):
+        # Re-reading changed images is the slow part, so it runs as a job first
+        self.run_job(self.image_index.changes, on_done=self.open_validation_report)
+
+    def open_validation_report(self, changes):
+        self.apply_index_changes(changes)
+        if self.validation_report is not None and self.validation_report.winfo_exists():
+            self.validation_report.destroy()
+        self.validation_report = ValidationReport(
+            self, validate_catalogue(self.data, self.image_index, refresh=False))
+
+    def category_label(self, category, count):
+        return f"{category.upper()} ({count})"
+
+    def insert_project_rows(self, category, indices):
+        node = self.cat_nodes[category]
+        self.tree.delete(*self.tree.get_children(node))
+        for i in indices:
+            self.tree.insert(node, "end", iid=f"project:{i}",
+                             text=self.project_row_text(i), values=(i,))
+        self.loaded_categories.add(category)
+
+    def load_category(self, category):
+        if category not in self.loaded_categories:
+            self.insert_project_rows(category, self.category_members.get(category, []))
+
+    def on_tree_open(self, event=None):
+        node = self.tree.focus()
+        category = node.split(":", 1)[1] if node.startswith("category:") else None
+        if category is None:
+            return
+        self.load_category(category)
+        self.set_category_expanded(category, True)
+
+    def on_tree_close(self, event=None):
+        node = self.tree.focus()
+        if node.startswith("category:"):
+            self.set_category_expanded(node.split(":", 1)[1], False)
+
+    def set_category_expanded(self, category, expanded):
+        # Only the unfiltered tree's state is remembered
+        if self.search_var.get() or self.filter_category.get() != "All":
+            return
+        if expanded:
+            self.expanded_categories.add(category)
+        else:
+            self.expanded_categories.discard(category)
+        self.ui_state["expanded_categories"] = sorted(self.expanded_categories)
+        save_ui_state(self.ui_state)
+
+    @profiled("PortfolioApp.on_select", "ui")
     def on_select(self, _):
         selection = self.tree.selection()
         if not selection:
@@ -806,13 +4425,23 @@ class PortfolioApp(TkinterDnD.Tk):
         values = self.tree.item(item, "values")
         
         if values:  # It's a project, not a category
-            self.selected_index = int(values[0])
+            index = int(values[0])
+            if index == self.selected_index:
+                return  # Already showing it, e.g. select_project or a row move
+
+            self.selected_index = index
             self.load_project()
 
+    @profiled("PortfolioApp.load_project", "ui")
     def load_project(self):
         if self.selected_index is None or self.selected_index >= len(self.projects):
             return
             
+        # User-initiated loads always win over queued prefetch work, and preview
+        # jobs still queued for the previous selection are dropped
+        self.jobs.renew("prefetch")
+        self.jobs.renew("selection")
+
         p = self.projects[self.selected_index]
         
         # Update title
@@ -820,10 +4449,8 @@ class PortfolioApp(TkinterDnD.Tk):
         
         # Load fields
         for k, widget in self.fields.items():
-            widget.delete(0, tk.END)
-            widget.insert(0, p.get(k, ""))
+            widget.set_value(p.get(k, ""))
         
-        self.category_var.set(p.get("category", ""))
         self.load_thumbnail(p)
         
         # Show/hide gallery based on category
@@ -833,60 +4460,138 @@ class PortfolioApp(TkinterDnD.Tk):
         else:
             self.gallery_section.pack_forget()
 
+        self.prefetch_neighbours()
+
+    @profiled("PortfolioApp.load_thumbnail", "io")
     def load_thumbnail(self, project):
+        token = self.jobs.renew("thumbnail", self.jobs.token("selection"))
         if "thumbnail" in project and project["thumbnail"]:
             try:
-                img_path = os.path.join(THUMBNAILS_DIR, project["thumbnail"])
-                img = Image.open(img_path)
-                
-                # Check if image is wide (landscape orientation)
-                # If width is significantly larger than height, scale to fit container width
-                is_wide = img.width > img.height * 1.3  # More than 30% wider than tall
-                
-                if is_wide:
-                    # For wide images, scale to fit the larger container width (~470px available)
-                    # Use 450px to leave some margin
-                    aspect_ratio = img.height / img.width
-                    new_width = 450
-                    new_height = int(new_width * aspect_ratio)
-                    img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                else:
-                    # For portrait/square images, use standard thumbnail sizing
-                    img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-                
-                # Add subtle shadow effect
-                shadow = Image.new('RGBA', (img.width + 10, img.height + 10), (0, 0, 0, 0))
-                shadow_draw = ImageDraw.Draw(shadow)
-                shadow_draw.rectangle([5, 5, img.width + 5, img.height + 5],
-                                     fill=(0, 0, 0, 30))
-                shadow = shadow.filter(ImageFilter.GaussianBlur(5))
-                shadow.paste(img, (5, 5), img if img.mode == 'RGBA' else None)
-                
-                self.thumbnail_image = ImageTk.PhotoImage(shadow)
-                self.thumbnail_label.config(image=self.thumbnail_image, text="",
-                                          bg=COLORS["card"])
+                img_path = thumbnail_path(project)  # What the site shows
+                shadow, ready = self.progressive_preview(img_path, "thumbnail")
+                self.show_thumbnail(shadow)
+                if not ready:
+                    self.run_job(functools.partial(self.thumbnail_preview, img_path), "interactive", token,
+                                 self.show_thumbnail, lambda e: self.show_thumbnail(None))
             except Exception as e:
                 print(f"Error loading thumbnail: {e}")
-                self.thumbnail_label.config(image="", text="Error loading image",
-                                          bg=COLORS["card"])
+                self.show_thumbnail(None)
         else:
+            self.thumbnail_image = None
             self.thumbnail_label.config(image="", text="No thumbnail",
                                       bg=COLORS["bg"])
+        self.enforce_memory_budgets()
+
+    def show_thumbnail(self, img):
+        if img is None:
+            self.thumbnail_image = None
+            self.thumbnail_label.config(image="", text="Error loading image",
+                                      bg=COLORS["card"])
+            return
+        with PROFILER.span("load_thumbnail.photoimage"):
+            self.thumbnail_image = ImageTk.PhotoImage(img)
+        self.thumbnail_label.config(image=self.thumbnail_image, text="",
+                                  bg=COLORS["card"])
+
+    def thumbnail_preview(self, img_path):
+        """Shadowed thumbnail preview, from cache when possible (thread-safe)"""
+        key = preview_key(img_path, "thumbnail")
+        img = PREVIEW_CACHE.get(key)
+        if img is None:
+            meta = self.image_index.get(img_path) or self.image_index.update(img_path)
+            img = render_thumbnail_preview(img_path,
+                                           thumbnail_target_size(meta["width"], meta["height"]))
+            PREVIEW_CACHE.put(key, img)
+            store_placeholder(key, img)
+        return img
+
+    def gallery_preview(self, img_path):
+        """Gallery card preview, from cache when possible (thread-safe)"""
+        key = preview_key(img_path, "gallery")
+        img = PREVIEW_CACHE.get(key)
+        if img is None:
+            img = render_gallery_preview(img_path)
+            PREVIEW_CACHE.put(key, img)
+            store_placeholder(key, img)
+        return img
+
+    @profiled("PortfolioApp.progressive_preview", "io")
+    def progressive_preview(self, img_path, variant):
+        """(image, ready): the cached full preview, or a quick placeholder to show meanwhile"""
+        key = preview_key(img_path, variant)
+        img = PREVIEW_CACHE.get(key)
+        if img is not None:
+            return img, True
+        meta = self.image_index.get(img_path) or self.image_index.update(img_path)
+        return render_placeholder(img_path, key, preview_size(meta, variant), variant), False
+
+    def preview_jobs(self, project):
+        jobs = []
+        if project.get("thumbnail"):
+            jobs.append(functools.partial(self.thumbnail_preview, thumbnail_path(project)))
+        if project.get("category") == "colour-grading":
+            for rel in project.get("gallery", []):
+                path = os.path.join(GALLERY_DIR, rel)
+                jobs.append(functools.partial(self.gallery_preview, path))
+        return jobs
+
+    def prefetch_projects(self, indices):
+        jobs = []
+        for i in indices:
+            if 0 <= i < len(self.projects):
+                jobs.extend(self.preview_jobs(self.projects[i]))
+        token = self.jobs.renew("prefetch")
+        for job in jobs:
+            self.run_job(job, "prefetch", token)
+
+    def visible_project_indices(self):
+        """Project indices in tree display order"""
+        indices = []
+        for cat_node in self.tree.get_children():
+            for child in self.tree.get_children(cat_node):
+                values = self.tree.item(child, "values")
+                if values:
+                    indices.append(int(values[0]))
+        return indices
+
+    def prefetch_neighbours(self):
+        visible = self.visible_project_indices()
+        if self.selected_index not in visible:
+            return
+        pos = visible.index(self.selected_index)
+        # Nearest first, so the likeliest next selection is warmed first
+        order = []
+        for d in range(1, PREFETCH_RADIUS + 1):
+            order += [pos + d, pos - d]
+        self.prefetch_projects([visible[i] for i in order if 0 <= i < len(visible)])
 
+    @profiled("PortfolioApp.load_gallery", "io")
     def load_gallery(self, project):
         # Clear existing
         for w in self.gallery_frame.winfo_children():
             w.destroy()
         self.gallery_images.clear()
         self.selected_gallery_index = None
+        self.duplicate_gallery_indices = set()
+        self.jobs.renew("scopes")
+        self.show_scopes(None)
 
         gallery = project.get("gallery", [])
+        token = self.jobs.renew("gallery", self.jobs.token("selection"))
+        atlas = self.gallery_atlas(project)
+        atlas_misses = 0
         
         for i, rel in enumerate(gallery):
             try:
                 img_path = os.path.join(GALLERY_DIR, rel)
-                img = Image.open(img_path)
-                img.thumbnail(GALLERY_SIZE, Image.Resampling.LANCZOS)
+                img, ready = self.progressive_preview(img_path, "gallery")
+                if not ready:
+                    cell = atlas.lookup(rel, img_path)
+                    if cell is not None:
+                        img, ready = cell, True
+                        PREVIEW_CACHE.put(preview_key(img_path, "gallery"), cell)
+                    else:
+                        atlas_misses += 1
                 
                 tk_img = ImageTk.PhotoImage(img)
                 self.gallery_images.append(tk_img)
@@ -899,16 +4604,40 @@ class PortfolioApp(TkinterDnD.Tk):
                 lbl = tk.Label(card, image=tk_img, bg=COLORS["card"])
                 lbl.pack(padx=4, pady=4)
                 
-                # Bind click
+                # Bind click; double-click opens the still at full resolution
                 lbl.bind("<Button-1>", lambda e, idx=i: self.select_gallery(idx))
                 card.bind("<Button-1>", lambda e, idx=i: self.select_gallery(idx))
+                lbl.bind("<Double-Button-1>", lambda e, idx=i: self.open_still_viewer(idx))
+                card.bind("<Double-Button-1>", lambda e, idx=i: self.open_still_viewer(idx))
+
+                if not ready:
+                    self.run_job(functools.partial(self.gallery_preview, img_path), "interactive", token,
+                                 functools.partial(self.show_gallery_card, len(self.gallery_images) - 1, lbl))
                 
             except Exception as e:
                 print(f"Error loading gallery image: {e}")
 
-        self.gallery_canvas.update_idletasks()
-        self.gallery_canvas.configure(scrollregion=self.gallery_canvas.bbox("all"))
+        # Stills added, changed or removed since the sheet was built
+        if atlas_misses or len(atlas.entries) != len(set(gallery)):
+            self.run_job(functools.partial(atlas.sync, list(gallery), self.gallery_preview), "maintenance")
+
+        self.layout.request(self.gallery_canvas)
+        self.enforce_memory_budgets()
+
+    def gallery_atlas(self, project):
+        """Sprite atlas for the project's gallery; only the current project's is kept"""
+        if self.atlas is None or self.atlas.key != (project["category"], project["id"]):
+            self.atlas = GalleryAtlas(project["category"], project["id"]).load()
+        return self.atlas
+
+    def show_gallery_card(self, slot, label, img):
+        """Swap a gallery card's placeholder for its full preview"""
+        if not label.winfo_exists():
+            return
+        self.gallery_images[slot] = ImageTk.PhotoImage(img)
+        label.config(image=self.gallery_images[slot])
 
+    @profiled("PortfolioApp.select_gallery", "ui")
     def select_gallery(self, index):
         self.selected_gallery_index = index
         
@@ -916,15 +4645,191 @@ class PortfolioApp(TkinterDnD.Tk):
             if i == index:
                 card.config(highlightbackground=COLORS["selected"],
                           highlightthickness=3)
+            elif i in self.duplicate_gallery_indices:
+                card.config(highlightbackground=COLORS["danger"],
+                          highlightthickness=3)
             else:
                 card.config(highlightbackground=COLORS["border"],
                           highlightthickness=2)
 
+        gallery = self.projects[self.selected_index].get("gallery", []) \
+            if self.selected_index is not None else []
+        if index is not None and index < len(gallery):
+            self.load_scopes(os.path.join(GALLERY_DIR, gallery[index]))
+
+    def open_still_viewer(self, index):
+        gallery = self.projects[self.selected_index].get("gallery", [])
+        if index >= len(gallery):
+            return
+        if self.still_viewer is not None and self.still_viewer.winfo_exists():
+            self.still_viewer.destroy()
+        try:
+            self.still_viewer = StillViewer(self, os.path.join(GALLERY_DIR, gallery[index]))
+        except OSError as e:
+            print(f"Error opening still viewer: {e}")
+            messagebox.showerror("Error", f"Couldn't open this still:\n{e}")
+
+    def load_scopes(self, img_path):
+        token = self.jobs.renew("scopes", self.jobs.token("selection"))
+        cached = [PREVIEW_CACHE.get(preview_key(img_path, f"scope-{name}")) for name in SCOPES]
+        if all(img is not None for img in cached):
+            self.show_scopes(dict(zip(SCOPES, cached)))
+            return
+        # The previous still's scopes stay up until these are ready
+        self.run_job(functools.partial(self.scopes_for, img_path), "interactive", token,
+                     self.show_scopes, lambda e: self.show_scopes(None, "Couldn't read this still"))
+
+    def scopes_for(self, img_path):
+        """Scope images for a still, cached alongside its previews (thread-safe)"""
+        scopes = compute_scopes(img_path)
+        for name, img in scopes.items():
+            PREVIEW_CACHE.put(preview_key(img_path, f"scope-{name}"), img)
+        return scopes
+
+    def show_scopes(self, scopes, message="Select a still"):
+        for name, label in self.scope_labels.items():
+            if scopes is None:
+                self.scope_images.pop(name, None)
+                label.config(image="", text=message if name == "waveform" else "")
+            else:
+                self.scope_images[name] = ImageTk.PhotoImage(scopes[name])
+                label.config(image=self.scope_images[name], text="")
+
+    def find_gallery_duplicates(self):
+        """Flag gallery stills that are near-duplicates of other catalogue images"""
+        if self.selected_index is None:
+            return
+        self.run_job(self.gallery_clusters, "interactive", self.jobs.token("selection"),
+                     self.show_gallery_duplicates)
+
+    def gallery_clusters(self):
+        # Runs as a job; hashing fans out over the scheduler's process pool
+        self.phash_index.refresh(self.jobs.process_pool())
+        with self.phash_index.lock:
+            return self.phash_index.clusters()
+
+    def show_gallery_duplicates(self, clusters):
+        gallery = self.projects[self.selected_index].get("gallery", [])
+        keys = {self.image_index.key(os.path.join(GALLERY_DIR, rel)): i
+                for i, rel in enumerate(gallery)}
+
+        clusters = [c for c in clusters if any(k in keys for k in c)]
+        self.duplicate_gallery_indices = {keys[k] for c in clusters for k in c if k in keys}
+        self.select_gallery(self.selected_gallery_index)
+
+        if not clusters:
+            messagebox.showinfo("Duplicates", "No near-duplicates found for this gallery.")
+            return
+        lines = ["\n".join(f"  • {k}" for k in c) for c in clusters]
+        messagebox.showwarning("Duplicates",
+            f"Found {len(clusters)} near-duplicate group(s):\n\n" + "\n\n".join(lines))
+
+    def match_incoming(self, files):
+        """Catalogue images each incoming file nearly duplicates (runs as a job)"""
+        pool = self.jobs.process_pool()
+        self.phash_index.refresh(pool)
+        hashes = hash_files(list(files), pool)
+        with self.phash_index.lock:
+            return self.phash_index.matches(hashes)
+
+    def filter_duplicate_files(self, files, matches, ingest):
+        """Ask whether to skip incoming files that match existing images; None cancels.
+
+        The answer is remembered in `ingest` and applied to every later
+        batch of the same drop.
+        """
+        dupes = [(f, m) for f, m in zip(files, matches) if m]
+        if not dupes:
+            return list(files)
+
+        if "skip_duplicates" in ingest:
+            answer = ingest["skip_duplicates"]
+        else:
+            lines = [f"{os.path.basename(f)} ≈ {m[0]}" for f, m in dupes]
+            answer = messagebox.askyesnocancel("Possible Duplicates",
+                f"{len(dupes)} image(s) look like ones already in the catalogue:\n\n"
+                + "\n".join(lines) + "\n\nSkip these images?"
+                + "\n\n(Your answer applies to the rest of this drop.)")
+            ingest["skip_duplicates"] = answer
+        if answer is None:
+            return None
+        if answer:
+            skip = {f for f, _ in dupes}
+            return [f for f in files if f not in skip]
+        return list(files)
+
+    def copy_gallery_batch(self, ingest, files, matches):
+        files = self.filter_duplicate_files(files, matches, ingest)
+        if files is None:
+            ingest["token"].cancel()
+            self.finish_ingest(ingest)
+            return
+        index = self.project_index(ingest["project"])
+        if not files or index is None:
+            ingest["busy"] = False
+            self.advance_ingest(ingest)
+            return
+
+        p = self.projects[index]
+        project_folder = os.path.join(GALLERY_DIR, p["id"])
+        n = len(p.get("gallery", []))
+        pairs = []
+        for f in files:
+            ext = os.path.splitext(f)[1]
+            if ext.lower() not in IMAGE_EXTENSIONS:
+                ext = sniff_image(f) or ext  # e.g. camera exports without an extension
+            while True:
+                n += 1
+                dest = os.path.join(project_folder, f"{p['id']}-{n}{ext}")
+                if dest not in self.pending_copies and not os.path.exists(dest):
+                    break
+            self.pending_copies.add(dest)
+            pairs.append((f, dest))
+        # Not cancellable: once a copy starts, its result is recorded
+        self.run_job(functools.partial(copy_images, pairs), "interactive", None,
+                     functools.partial(self.add_gallery_images, ingest, p),
+                     functools.partial(self.gallery_copy_failed, ingest, pairs))
+
+    def add_gallery_images(self, ingest, p, copied):
+        for dest, meta in copied:
+            self.pending_copies.discard(dest)
+            self.image_index.update(dest, meta)
+        ingest["copied"].extend(dest for dest, _meta in copied)  # Warned about once the drop finishes
+        index = self.project_index(p)
+        if index is not None:
+            p = self.projects[index]
+            if "gallery" not in p:
+                p["gallery"] = []
+            p.mutable("gallery").extend(os.path.relpath(dest, GALLERY_DIR).replace(os.sep, "/")
+                                for dest, _meta in copied)
+            self.save_state()
+            self.revalidate([index])
+            if index == self.selected_index:
+                self.load_gallery(p)
+        ingest["busy"] = False
+        self.advance_ingest(ingest)
+
+    def gallery_copy_failed(self, ingest, pairs, e):
+        for _source, dest in pairs:
+            self.pending_copies.discard(dest)
+        ingest["token"].cancel()
+        self.finish_ingest(ingest)
+        messagebox.showerror("Error", f"Couldn't copy gallery images: {e}")
+
+    def project_index(self, p):
+        """Current index of a project record, which jobs hold across edits and undo"""
+        for i, q in enumerate(self.projects):
+            if q is p:
+                return i
+        # Undo/redo and merges may have swapped the record for an equal one
+        return next((i for i, q in enumerate(self.projects) if q["id"] == p["id"]), None)
+
+    @profiled("PortfolioApp.move_gallery", "ui")
     def move_gallery(self, direction):
         if self.selected_gallery_index is None:
             return
         
-        g = self.projects[self.selected_index]["gallery"]
+        g = self.projects[self.selected_index].mutable("gallery")
         i = self.selected_gallery_index
         j = i + direction
         
@@ -934,13 +4839,15 @@ class PortfolioApp(TkinterDnD.Tk):
             self.load_gallery(self.projects[self.selected_index])
             self.select_gallery(j)
 
+    @profiled("PortfolioApp.remove_selected_gallery", "ui")
     def remove_selected_gallery(self):
         if self.selected_gallery_index is None:
             messagebox.showwarning("No Selection", "Please select an image to remove")
             return
         
-        self.projects[self.selected_index]["gallery"].pop(self.selected_gallery_index)
+        self.projects[self.selected_index].mutable("gallery").pop(self.selected_gallery_index)
         self.save_state()
+        self.revalidate([self.selected_index])
         self.load_gallery(self.projects[self.selected_index])
 
     # ========== FILE OPERATIONS ==========
@@ -952,23 +4859,41 @@ class PortfolioApp(TkinterDnD.Tk):
         if file:
             self.process_thumbnail(file)
 
+    @profiled("PortfolioApp.process_thumbnail", "io")
     def process_thumbnail(self, file):
         if not self.selected_index is not None:
             return
             
         p = self.projects[self.selected_index]
         category_folder = os.path.join(THUMBNAILS_DIR, p["category"])
-        os.makedirs(category_folder, exist_ok=True)
 
         ext = os.path.splitext(file)[1]
+        if ext.lower() not in IMAGE_EXTENSIONS:
+            ext = sniff_image(file) or ext
         dest_name = f"{p['id']}{ext}"
         dest = os.path.join(category_folder, dest_name)
 
-        shutil.copy(file, dest)
-        p["thumbnail"] = os.path.join(p["category"], dest_name)
+        self.run_job(functools.partial(copy_images, [(file, dest)]), "interactive", None,
+                     functools.partial(self.thumbnail_copied, p, os.path.join(p["category"], dest_name)),
+                     lambda e: messagebox.showerror("Error", f"Couldn't copy thumbnail: {e}"))
+
+    def thumbnail_copied(self, p, rel, copied):
+        dest, meta = copied[0]
+        self.image_index.update(dest, meta)
+        PREVIEW_CACHE.invalidate(dest)  # Same name as any previous thumbnail
+        self.warn_oversized([dest])
+        index = self.project_index(p)
+        if index is None:
+            return
+        p = self.projects[index]
+        p["thumbnail"] = rel
+        p.pop("thumbnailCrop", None)  # Made from the old source; regenerate to recrop
         self.save_state()
-        self.load_thumbnail(p)
+        self.revalidate([index])
+        if index == self.selected_index:
+            self.load_thumbnail(p)
 
+    @profiled("PortfolioApp.remove_thumbnail", "ui")
     def remove_thumbnail(self):
         if self.selected_index is None:
             return
@@ -976,7 +4901,9 @@ class PortfolioApp(TkinterDnD.Tk):
         p = self.projects[self.selected_index]
         if "thumbnail" in p:
             p["thumbnail"] = ""
+            p.pop("thumbnailCrop", None)
             self.save_state()
+            self.revalidate([self.selected_index])
             self.load_thumbnail(p)
 
     def pick_gallery(self):
@@ -984,55 +4911,136 @@ class PortfolioApp(TkinterDnD.Tk):
             title="Select Gallery Images",
             filetypes=[("Image Files", "*.png *.jpg *.jpeg *.gif *.bmp *.webp")]
         )
-        if files:
-            self.process_gallery_files(files)
-
-    def process_gallery_files(self, files):
-        if self.selected_index is None:
-            return
-            
-        p = self.projects[self.selected_index]
-        if "gallery" not in p:
-            p["gallery"] = []
-
-        project_folder = os.path.join(GALLERY_DIR, p["id"])
-        os.makedirs(project_folder, exist_ok=True)
-
-        existing = len(p["gallery"])
-        for i, f in enumerate(files, start=1):
-            ext = os.path.splitext(f)[1]
-            dest_name = f"{p['id']}-{existing+i}{ext}"
-            dest = os.path.join(project_folder, dest_name)
-            shutil.copy(f, dest)
-            p["gallery"].append(os.path.join(p["id"], dest_name))
+        if files and self.selected_index is not None:
+            self.ingest_gallery(files)
 
-        self.save_state()
-        self.load_gallery(p)
+    def warn_oversized(self, paths):
+        """Warn about newly ingested images that exceed IMAGE_SIZE_BUDGET"""
+        over = []
+        for path in paths:
+            meta = self.image_index.get(path)
+            if meta and meta["bytes"] > IMAGE_SIZE_BUDGET:
+                over.append(f"{os.path.basename(path)} ({meta['bytes'] / 1024 / 1024:.1f} MB)")
+        if over:
+            messagebox.showwarning("Large Images",
+                f"These images are over the {IMAGE_SIZE_BUDGET // 1024 // 1024} MB budget "
+                f"and will slow the site down:\n\n" + "\n".join(over))
 
     # ========== ACTIONS ==========
+    @profiled("PortfolioApp.save_project", "ui")
     def save_project(self):
         if self.selected_index is None:
             return
             
         p = self.projects[self.selected_index]
-        
+
+        # Only fields edited since load are compared against the record
+        changes = {}
         for k, widget in self.fields.items():
+            if not widget.dirty:
+                continue
             v = widget.get().strip()
-            p[k] = v
-        
-        p["category"] = self.category_var.get()
+            if v != p.get(k, ""):
+                changes[k] = v
+
+        if not changes:
+            return  # Nothing edited since load, so there's nothing to write or confirm
+
+        old_category = p.get("category")
+        p.update(changes)
         p["updated"] = datetime.now().isoformat()
+        if "category" in changes:
+            p["sortKey"] = self.append_sort_key(p["category"])
         
         self.save_state()
-        self.populate_tree()
-        self.select_project(self.selected_index)
+        for k, widget in self.fields.items():
+            widget.set_value(p.get(k, ""))
+        if "category" in changes:
+            self.duplicate_ids = duplicate_project_ids(self.projects)
+        self.revalidate([self.selected_index])
+        self.refresh_project_row(self.selected_index, old_category)
+        self.project_title_label.config(text=p.get("title", "Untitled Project"))
         
         messagebox.showinfo("Success", "Project changes saved!")
 
+    def refresh_project_row(self, index, old_category=None):
+        """Update one project's tree row in place after an edit"""
+        p = self.projects[index]
+        iid = f"project:{index}"
+        new_category = p["category"]
+
+        if old_category is None or old_category == new_category:
+            if self.tree.exists(iid):
+                self.tree.item(iid, text=self.project_row_text(index))
+            return
+
+        # Filtered views are rebuilt, the full tree moves just this row
+        if self.search_var.get() or self.filter_category.get() != "All":
+            self.on_search()
+        else:
+            # The old key is already gone, so the old category is searched linearly
+            self.category_members[old_category].remove(index)
+            new_members = self.category_members[new_category]
+            bisect.insort(new_members, index, key=lambda i: sort_key_order(self.projects, i))
+            for c in (old_category, new_category):
+                self.tree.item(self.cat_nodes[c],
+                               text=self.category_label(c, len(self.category_members[c])))
+
+            if new_category in self.loaded_categories:
+                position = self.member_position(index)
+                self.tree.move(iid, self.cat_nodes[new_category], position)
+            else:
+                self.tree.delete(iid)
+                self.load_category(new_category)
+            self.tree.item(self.cat_nodes[new_category], open=True)
+
+        if self.tree.exists(iid):
+            self.tree.item(iid, text=self.project_row_text(index))
+            self.tree.selection_set(iid)
+            self.tree.see(iid)
+
+    @profiled("PortfolioApp.save_all", "ui")
     def save_all(self):
-        save_data(self.data)
+        if self.saving:
+            self.save_again = True  # Edits made since that save started go in the next one
+            return
+        self.saving = True
+        # Fold in external edits first rather than silently overwriting them
+        self.read_disk(self.write_catalogue)
+
+    def write_catalogue(self, disk):
+        if disk is not None:
+            self.apply_disk_changes(disk)
+        # The job writes a copy-on-write snapshot, so editing can carry on meanwhile
+        data = dict(self.data, categories=copy.deepcopy(self.data["categories"]),
+                    projects=ProjectRecord.restore(ProjectRecord.snapshot(self.projects)[0]))
+        previous = self.disk_base
+        self.disk_base = data
         self.has_unsaved_changes = False
-        messagebox.showinfo("Saved", f"All {len(self.projects)} projects saved successfully!")
+        self.run_job(functools.partial(save_catalogue, self.store, data, self.image_index), "interactive",
+                     None, functools.partial(self.on_saved, len(data["projects"])),
+                     functools.partial(self.on_save_failed, previous))
+
+    def on_saved(self, count, result):
+        fresh, removed, manifest = result
+        self.image_index.apply(fresh, removed)
+        self.finish_save()
+        messagebox.showinfo("Saved", f"All {count} projects saved successfully!\n\n{manifest_summary(manifest)}")
+
+    def on_save_failed(self, previous, e):
+        self.disk_base = previous
+        self.has_unsaved_changes = True
+        self.finish_save()
+        messagebox.showerror("Error", f"Couldn't save the catalogue: {e}")
+
+    def finish_save(self):
+        self.saving = False
+        if self.merge_after_save:
+            self.merge_after_save = False
+            self.merge_disk_changes()
+        if self.save_again:
+            self.save_again = False
+            self.save_all()
 
     def create_new_project(self):
         popup = tk.Toplevel(self)
@@ -1076,7 +5084,7 @@ class PortfolioApp(TkinterDnD.Tk):
             base = re.sub(r'[^a-z0-9\-]', '', title.lower().replace(" ", "-"))
             proj_id = base
             counter = 1
-            while any(p["id"] == proj_id for p in self.projects):
+            while self.project_id_exists(proj_id):
                 proj_id = f"{base}-{counter}"
                 counter += 1
             
@@ -1085,10 +5093,11 @@ class PortfolioApp(TkinterDnD.Tk):
                 "title": title,
                 "category": category,
                 "gallery": [],
-                "created": datetime.now().isoformat()
+                "created": datetime.now().isoformat(),
+                "sortKey": self.append_sort_key(category)
             }
             
-            self.projects.append(new_project)
+            self.projects.append(ProjectRecord.from_dict(new_project))
             self.save_state()
             
             # Clear search/filter to ensure new project is visible
@@ -1109,6 +5118,7 @@ class PortfolioApp(TkinterDnD.Tk):
         title_entry.entry.focus()
         popup.bind("<Return>", lambda e: create())
 
+    @profiled("PortfolioApp.duplicate_project", "ui")
     def duplicate_project(self):
         if self.selected_index is None:
             messagebox.showwarning("No Selection", "Please select a project to duplicate")
@@ -1121,15 +5131,25 @@ class PortfolioApp(TkinterDnD.Tk):
         base = orig["id"]
         proj_id = f"{base}-copy"
         counter = 1
-        while any(p["id"] == proj_id for p in self.projects):
+        while self.project_id_exists(proj_id):
             proj_id = f"{base}-copy-{counter}"
             counter += 1
         
         new_proj["id"] = proj_id
         new_proj["title"] = f"{orig.get('title', 'Untitled')} (Copy)"
         new_proj["created"] = datetime.now().isoformat()
+
+        # Slot the copy in right after the original
+        members = self.category_members[orig["category"]]
+        position = self.member_position(self.selected_index)
+        following = members[position + 1] if position + 1 < len(members) else None
+        try:
+            new_proj["sortKey"] = sort_key_between(
+                orig["sortKey"], self.projects[following]["sortKey"] if following is not None else None)
+        except ValueError:
+            new_proj["sortKey"] = self.append_sort_key(orig["category"])  # Tied keys
         
-        self.projects.insert(self.selected_index + 1, new_proj)
+        self.projects.insert(self.selected_index + 1, ProjectRecord.from_dict(new_proj))
         self.save_state()
         
         # Clear search/filter to ensure duplicated project is visible
@@ -1142,46 +5162,80 @@ class PortfolioApp(TkinterDnD.Tk):
     def move_project(self, direction):
         if self.selected_index is None:
             return
-        
-        current_project = self.projects[self.selected_index]
-        current_category = current_project["category"]
-        
-        # Find all projects in the same category
-        category_projects = []
-        for i, p in enumerate(self.projects):
-            if p["category"] == current_category:
-                category_projects.append((i, p))
-        
-        # Find current position within category
-        category_position = None
-        for pos, (idx, proj) in enumerate(category_projects):
-            if idx == self.selected_index:
-                category_position = pos
-                break
-        
-        if category_position is None:
-            return
-        
-        # Calculate new position within category
-        new_category_position = category_position + direction
-        
-        # Check bounds within category
-        if new_category_position < 0 or new_category_position >= len(category_projects):
+        self.move_project_to(self.selected_index, self.member_position(self.selected_index) + direction)
+
+    @profiled("PortfolioApp.move_project", "ui")
+    def move_project_to(self, index, target):
+        """Move a project to position target in its category; only its sortKey changes"""
+        category = self.projects[index]["category"]
+        members = self.category_members[category]
+        position = self.member_position(index)
+        if not 0 <= target < len(members) or target == position:
             return
-        
-        # Get the array indices to swap
-        idx1 = category_projects[category_position][0]
-        idx2 = category_projects[new_category_position][0]
-        
-        # Swap in the array
-        self.projects[idx1], self.projects[idx2] = self.projects[idx2], self.projects[idx1]
-        
+
+        key = sort_key_for_move(self.projects, members, position, target)
+        if key is None:
+            # No room left between the neighbours, so re-key the category once
+            respread_sort_keys(self.projects, members)
+            key = sort_key_for_move(self.projects, members, position, target)
+        self.projects[index]["sortKey"] = key
+        members.insert(target, members.pop(position))
         self.save_state()
-        self.populate_tree()
-        
-        # Update selected_index to the new position
-        self.selected_index = idx2
-        self.select_project(self.selected_index)
+
+        iid = f"project:{index}"
+        if self.search_var.get() or self.filter_category.get() != "All":
+            self.on_search()
+        elif category in self.loaded_categories:
+            self.tree.move(iid, self.cat_nodes[category], target)
+        if index != self.selected_index:
+            self.select_project(index)
+        elif self.tree.exists(iid):
+            # Only the row moved: the form (and any edits in it) stays as it is
+            self.tree.selection_set(iid)
+            self.tree.see(iid)
+
+    def member_position(self, index):
+        """Position of a project in its category's display order, by bisection"""
+        members = self.category_members[self.projects[index]["category"]]
+        return bisect.bisect_left(members, sort_key_order(self.projects, index),
+                                  key=lambda i: sort_key_order(self.projects, i))
+
+    def append_sort_key(self, category):
+        """Key that places a project after everything in category"""
+        members = self.category_members.get(category, [])
+        last = self.projects[members[-1]].get("sortKey") if members else None
+        key = sort_key_between(last, None)
+        if len(key) > SORT_KEY_MAX_LEN:
+            respread_sort_keys(self.projects, members)
+            key = sort_key_between(self.projects[members[-1]]["sortKey"], None)
+        return key
+
+    # ========== TREE DRAG REORDER ==========
+    def on_tree_press(self, event):
+        row = self.tree.identify_row(event.y)
+        self.tree_drag = {"row": row, "y": event.y, "moved": False} if row.startswith("project:") else None
+
+    def on_tree_drag(self, event):
+        drag = self.tree_drag
+        if drag is None or (not drag["moved"] and abs(event.y - drag["y"]) < TREE_DRAG_THRESHOLD):
+            return
+        drag["moved"] = True
+        target = self.tree.identify_row(event.y)
+        same_category = target.startswith("project:") and \
+            self.tree.parent(target) == self.tree.parent(drag["row"])
+        self.tree.configure(cursor="sb_v_double_arrow" if same_category else "X_cursor")
+
+    def on_tree_release(self, event):
+        drag, self.tree_drag = self.tree_drag, None
+        if drag is None or not drag["moved"]:
+            return
+        self.tree.configure(cursor="")
+        target = self.tree.identify_row(event.y)
+        if not target.startswith("project:") or target == drag["row"] or \
+                self.tree.parent(target) != self.tree.parent(drag["row"]):
+            return
+        index = int(self.tree.item(drag["row"], "values")[0])
+        self.move_project_to(index, self.member_position(int(self.tree.item(target, "values")[0])))
 
     def delete_project(self):
         if self.selected_index is None:
@@ -1196,32 +5250,14 @@ class PortfolioApp(TkinterDnD.Tk):
         if not result:
             return
 
-        # Delete thumbnail
-        if "thumbnail" in p and p["thumbnail"]:
-            thumb_path = os.path.join(THUMBNAILS_DIR, p["thumbnail"])
-            if os.path.exists(thumb_path):
-                try:
-                    os.remove(thumb_path)
-                except Exception as e:
-                    print(f"Error deleting thumbnail: {e}")
-
-        # Delete gallery images
-        if "gallery" in p:
-            for img_rel in p["gallery"]:
-                img_path = os.path.join(GALLERY_DIR, img_rel)
-                if os.path.exists(img_path):
-                    try:
-                        os.remove(img_path)
-                    except Exception as e:
-                        print(f"Error deleting gallery image: {e}")
-
-            # Remove project folder if empty
-            project_folder = os.path.join(GALLERY_DIR, p["id"])
-            if os.path.exists(project_folder) and not os.listdir(project_folder):
-                try:
-                    os.rmdir(project_folder)
-                except Exception as e:
-                    print(f"Error deleting project folder: {e}")
+        # Delete the thumbnail, gallery images and (if left empty) the project folder in a job
+        paths = [os.path.join(GALLERY_DIR, rel) for rel in p.get("gallery", [])]
+        if p.get("thumbnail"):
+            paths.append(os.path.join(THUMBNAILS_DIR, p["thumbnail"]))
+        if p.get("thumbnailCrop"):
+            paths.append(os.path.join(THUMBNAILS_DIR, p["thumbnailCrop"]["src"]))
+        folders = [os.path.join(GALLERY_DIR, p["id"])] if "gallery" in p else []
+        self.run_job(functools.partial(remove_files, paths, folders), "maintenance")
 
         # Remove from list
         self.projects.pop(self.selected_index)
@@ -1232,16 +5268,182 @@ class PortfolioApp(TkinterDnD.Tk):
         # Clear form
         self.project_title_label.config(text="Select a project")
         for widget in self.fields.values():
-            widget.delete(0, tk.END)
+            widget.set_value("")
+
+# =====================
+# BENCHMARKS
+# =====================
+BENCH_WORDS = ("launch", "trailer", "studio", "brand", "campaign", "colour", "grade",
+               "night", "city", "ocean", "alumni", "games", "music", "video", "story")
+
+def synthetic_catalogue(n, seed=0):
+    """A catalogue shaped like projects.json with n generated projects"""
+    import random
+    rng = random.Random(seed)
+    categories = [{"id": c, "name": c.title(), "slug": c}
+                  for c in ("commercial", "branded", "vertical", "colour-grading")]
+    projects = []
+    for i in range(n):
+        words = rng.sample(BENCH_WORDS, 3)
+        category = rng.choice(categories)["id"]
+        projects.append({
+            "id": f"{'-'.join(words)}-{i}",
+            "title": " ".join(w.title() for w in words),
+            "category": category,
+            "vimeoId": str(rng.randrange(10**8, 10**9)),
+            "thumbnail": f"{category}/{'-'.join(words)}-{i}.jpg",
+            "client": rng.choice(BENCH_WORDS).title(),
+            "description": f"A {words[0]} {words[1]} piece for a {words[2]} client.",
+            "role": rng.choice(("Editor", "Colourist", "Editor & Colourist")),
+            "year": str(rng.randrange(2018, 2026)),
+        })
+    return {"categories": categories, "projects": projects}
+
+def _timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+def bench_stores(sizes):
+    """Compare the JSON and SQLite backends on catalogue-sized workloads"""
+    import tempfile
+    rows = []
+    for n in sizes:
+        data = synthetic_catalogue(n)
+        projects = data["projects"]
+        mid = n // 2
+        category = projects[mid]["category"]
+        with tempfile.TemporaryDirectory() as tmp:
+            aggregate = os.path.join(tmp, "projects.json")
+
+            json_store = JsonStore(aggregate)
+            t_save, _ = _timed(lambda: json_store.save(data))
+            t_load, _ = _timed(json_store.load)
+            t_search, _ = _timed(lambda: filter_projects(projects, "ocean", "All"), 5)
+            t_filter, _ = _timed(lambda: filter_projects(projects, "", category), 5)
+            t_id, _ = _timed(lambda: any(p["id"] == "missing" for p in projects), 5)
+            rows.append((n, "json", t_save, t_load, t_search, t_filter, t_id))
+
+            db_store = SqliteStore(os.path.join(tmp, "catalogue.db"), aggregate)
+            t_import, _ = _timed(db_store.load)  # First load imports the aggregate
+            projects[mid]["title"] += " (edited)"
+            t_save, _ = _timed(lambda: db_store.save(data))
+            t_load, _ = _timed(db_store.load)
+            t_search, _ = _timed(lambda: db_store.search("ocean", None), 5)
+            t_filter, _ = _timed(lambda: db_store.search("", category), 5)
+            t_id, _ = _timed(lambda: db_store.has_id("missing"), 5)
+            db_store.db.close()
+            rows.append((n, "sqlite", t_save, t_load, t_search, t_filter, t_id))
+            print(f"{n} projects: sqlite first import {t_import:.1f} ms")
+
+    header = ("projects", "backend", "save 1 edit", "load", "search", "filter", "id check")
+    print("".join(f"{h:>13}" for h in header))
+    for n, name, *times in rows:
+        print(f"{n:>13}{name:>13}" + "".join(f"{t:>10.2f} ms" for t in times))
+    return 0
+
+def bench_records(sizes):
+    """Memory and undo-snapshot cost of plain dicts vs ProjectRecord"""
+    import gc
+    header = ("projects", "model", "memory", "snapshot", "snap bytes", "undo")
+    print("".join(f"{h:>13}" for h in header))
+    for n in sizes:
+        # Through JSON text, so strings aren't shared the way a generator shares them
+        text = json.dumps(synthetic_catalogue(n)["projects"])
+
+        gc.collect()
+        tracemalloc.start()
+        dicts = json.loads(text)
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        records = [ProjectRecord.from_dict(p) for p in dicts]
+        del dicts
+        gc.collect()
+        record_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        dicts = json.loads(text)
+
+        # The old save_state: copy every record and serialise the lot
+        t_dict, snap = _timed(lambda: json.dumps([dict(p) for p in dicts]), 3)
+        t_dict_undo, _ = _timed(lambda: json.loads(snap), 3)
+        dict_snap = sys.getsizeof(snap)
+
+        # COW: one edit between snapshots, as in save_state after a field change
+        ProjectRecord.snapshot(records)
+        def edit_and_snapshot():
+            records[n // 2]["title"] += "!"
+            return ProjectRecord.snapshot(records)
+        t_rec, (frozen, rec_snap) = _timed(edit_and_snapshot, 3)
+        t_rec_undo, _ = _timed(lambda: ProjectRecord.restore(frozen, records), 3)
+
+        mb = 1024 * 1024
+        print(f"{n:>13}{'dict':>13}{dict_bytes / mb:>10.1f} MB{t_dict:>10.1f} ms"
+              f"{dict_snap / mb:>10.2f} MB{t_dict_undo:>10.1f} ms")
+        print(f"{n:>13}{'record':>13}{record_bytes / mb:>10.1f} MB{t_rec:>10.1f} ms"
+              f"{rec_snap / mb:>10.2f} MB{t_rec_undo:>10.1f} ms")
+    return 0
 
 # =====================
 # RUN
 # =====================
-if __name__ == "__main__":
+def run_validate(as_json=False, strict=False):
+    """Validate projects.json and images/; exit status 1 if errors (or warnings when strict)"""
+    issues = validate_catalogue(load_data(), ImageIndex().load())
+    errors = sum(1 for i in issues if i["severity"] == "error")
+    warnings = len(issues) - errors
+    if as_json:
+        print(json.dumps(issues, indent=2))
+    else:
+        for i in issues:
+            print(format_issue(i))
+        print(f"{errors} error(s), {warnings} warning(s)")
+    return 1 if errors or (strict and warnings) else 0
+
+def run_placeholders():
+    """Compute missing or outdated site placeholders and save the catalogue"""
+    store = open_store()
+    data = store.load()
+    image_index = ImageIndex().load()
+    image_index.refresh()
+    changed = refresh_site_placeholders(data["projects"], image_index)
+    if changed:
+        store.save(data)
+    print(f"Updated placeholders on {changed} project(s)")
+    return 0
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Portfolio CMS")
+    commands = parser.add_subparsers(dest="command")
+    bench = commands.add_parser("bench-store", help="Benchmark the JSON and SQLite catalogue backends")
+    bench.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    records = commands.add_parser("bench-records", help="Benchmark dict vs ProjectRecord memory and undo snapshots")
+    records.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    validate = commands.add_parser("validate", help="Check the catalogue and images/ for broken references, "
+                                                    "size-budget violations and duplicate ids")
+    validate.add_argument("--json", action="store_true", help="Print issues as JSON")
+    validate.add_argument("--strict", action="store_true", help="Exit 1 on warnings as well as errors")
+    commands.add_parser("placeholders", help="Compute LQIP placeholders and dominant colours for "
+                                             "every thumbnail and gallery image")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench-store":
+        return bench_stores(args.sizes)
+    if args.command == "bench-records":
+        return bench_records(args.sizes)
+    if args.command == "validate":
+        return run_validate(args.json, args.strict)
+    if args.command == "placeholders":
+        return run_placeholders()
+
     try:
         app = PortfolioApp()
         app.mainloop()
     except Exception as e:
         print(f"Error: {e}")
         print("Note: This enhanced version requires tkinterdnd2 for drag-and-drop.")
-        print("Install it with: pip install tkinterdnd2")
\ No newline at end of file
+        print("Install it with: pip install tkinterdnd2 pillow numpy")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,23 @@
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gui
+
+
+@pytest.fixture
+def app_stub():
+    """A stand-in PortfolioApp holding just the state the bound methods need (no Tk window)"""
+    def make(data, *methods):
+        app = types.SimpleNamespace(data=data, projects=data["projects"], issues={}, duplicate_ids=set(),
+                                    image_index=gui.ImageIndex(path=os.devnull), lqip_pending=set(),
+                                    lqip_cache={}, has_unsaved_changes=False, store_synced=True, jobs=[])
+        app.run_job = lambda *args, **kwargs: app.jobs.append(args)
+        for name in methods:
+            setattr(app, name, types.MethodType(getattr(gui.PortfolioApp, name), app))
+        return app
+    return make
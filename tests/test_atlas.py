@@ -0,0 +1,21 @@
+from PIL import Image
+
+import gui
+
+
+def test_same_id_in_two_categories_keeps_two_atlases(tmp_path, monkeypatch):
+    monkeypatch.setattr(gui, "GALLERY_DIR", str(tmp_path / "gallery"))
+    (tmp_path / "gallery").mkdir()
+    for rel in ("a.jpg", "b.jpg"):
+        Image.new("RGB", (64, 36), "#808080").save(tmp_path / "gallery" / rel)
+
+    def render(path):
+        return Image.open(path).convert("RGB")
+    root = str(tmp_path / "atlas")
+    assert gui.GalleryAtlas("commercial", "dot", root).load().sync(["a.jpg"], render) == 1
+    assert gui.GalleryAtlas("music-video", "dot", root).load().sync(["b.jpg"], render) == 1
+
+    # Switching back finds each atlas intact rather than rebuilding it
+    commercial = gui.GalleryAtlas("commercial", "dot", root).load()
+    assert list(commercial.entries) == ["a.jpg"]
+    assert commercial.sync(["a.jpg"], render) == 0
@@ -0,0 +1,72 @@
+import os
+
+from PIL import Image
+
+import gui
+
+
+def save_image(path, size):
+    Image.new("RGB", size, "#336699").save(path, "JPEG")
+    return path
+
+
+def test_source_in_shape_is_not_reencoded(tmp_path):
+    src = save_image(tmp_path / "wide.jpg", (1920, 1080))
+    dest = tmp_path / "staged.jpg"
+    result = gui.thumbnail_crop(str(src), str(dest), (16, 9))
+    assert result["staged"] is None
+    assert result["box"] == [0, 0, 1920, 1080]
+    assert not dest.exists()
+
+
+def test_source_out_of_shape_is_cropped(tmp_path):
+    src = save_image(tmp_path / "tall.jpg", (1920, 1440))
+    dest = tmp_path / "staged.jpg"
+    result = gui.thumbnail_crop(str(src), str(dest), (16, 9))
+    assert result["staged"] == str(dest) and dest.exists()
+    assert (result["width"], result["height"]) == (1280, 720)
+
+
+def test_stale_crops_skip_uncropped_sources_in_shape():
+    index = gui.ImageIndex(path=os.devnull)
+    projects = []
+    for pid, size in (("wide", (1920, 1080)), ("tall", (1920, 1440))):
+        p = {"id": pid, "category": "commercial", "thumbnail": f"commercial/{pid}.jpg"}
+        index.entries[index.key(os.path.join(gui.THUMBNAILS_DIR, p["thumbnail"]))] = \
+            {"width": size[0], "height": size[1], "bytes": 100, "mtime": 0.0, "sha1": pid}
+        projects.append(p)
+    assert [p["id"] for p, *_rest in gui.stale_thumbnail_crops(projects, index)] == ["tall"]
+
+
+def test_phash_index_ignores_crops():
+    index = gui.ImageIndex(path=os.devnull)
+    meta = {"width": 16, "height": 9, "bytes": 100, "mtime": 0.0}
+    index.entries = {"thumbnails/commercial/a.jpg": meta, "thumbnails/cropped/commercial/a.jpg": meta}
+    phash = gui.PHashIndex(index, path=os.devnull)
+    phash.entries = {k: {"mtime": 0.0, "hash": "0" * 16} for k in index.entries}
+    phash.save = lambda: None
+    phash.refresh()
+    assert list(phash.entries) == ["thumbnails/commercial/a.jpg"]
+
+
+def test_discarding_crops_removes_only_staged_files(app_stub):
+    app = app_stub({"projects": []}, "discard_staged_crops")
+    items = [({"id": "a"}, "sha-a", (16, 9), {"staged": "a.jpg"}),
+             ({"id": "b"}, "sha-b", (16, 9), {"staged": None})]
+    app.discard_staged_crops(items)
+    (job, lane), = app.jobs
+    assert job.func is gui.remove_files and job.args == (["a.jpg"],)
+    assert lane == "maintenance"
+
+
+def test_crop_box_follows_the_salient_region():
+    saliency = gui.np.zeros((90, 400))
+    saliency[:, 300:350] = 1.0  # Interest near the right edge
+    left, top, right, bottom = gui.crop_box(saliency, (400, 90), (16, 9))
+    assert (top, bottom, right - left) == (0, 90, 160)
+    assert left <= 300 and right >= 350
+
+
+def test_crop_size_fits_inside_the_source():
+    assert gui.crop_size((1920, 1440), (16, 9)) == (1920, 1080)
+    assert gui.crop_size((1920, 1080), (9, 16)) == (608, 1080)
@@ -0,0 +1,55 @@
+import types
+from unittest import mock
+
+import gui
+
+
+class Field:
+    """Stands in for ModernEntry / ModernCombobox: a value plus its load-time baseline"""
+    def __init__(self, value):
+        self.baseline = self.value = value
+
+    @property
+    def dirty(self):
+        return self.value != self.baseline
+
+    def get(self):
+        return self.value
+
+    def set_value(self, value):
+        self.baseline = self.value = value
+
+
+def form_app(app_stub):
+    data = gui.synthetic_catalogue(4)
+    gui.assign_sort_keys(data["projects"])
+    app = app_stub(data, "save_project")
+    app.selected_index = 1
+    p = app.projects[1]
+    app.fields = {k: Field(p.get(k, "")) for k in (*gui.FIELD_MAP, "category")}
+    app.calls = []
+    app.save_state = lambda: app.calls.append("save_state")
+    app.append_sort_key = lambda category: "z"
+    app.revalidate = lambda indices: None
+    app.refresh_project_row = lambda i, old: app.calls.append(("row", i, old))
+    app.project_title_label = types.SimpleNamespace(config=lambda **kwargs: None)
+    return app
+
+
+def test_unchanged_save_is_a_quiet_no_op(app_stub):
+    app = form_app(app_stub)
+    with mock.patch.object(gui.messagebox, "showinfo") as info:
+        app.save_project()
+    assert not info.called and app.calls == []
+
+
+def test_category_is_saved_through_its_dirty_field(app_stub):
+    app = form_app(app_stub)
+    old = app.projects[1]["category"]
+    new = next(c["id"] for c in app.data["categories"] if c["id"] != old)
+    app.fields["category"].value = new
+    with mock.patch.object(gui.messagebox, "showinfo"):
+        app.save_project()
+    assert app.projects[1]["category"] == new and app.projects[1]["sortKey"] == "z"
+    assert app.calls == ["save_state", ("row", 1, old)]
+    assert not app.fields["category"].dirty
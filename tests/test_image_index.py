@@ -0,0 +1,17 @@
+import json
+
+import gui
+
+
+def test_updates_are_written_once_on_flush(tmp_path):
+    path = tmp_path / "image-index.json"
+    index = gui.ImageIndex(root=str(tmp_path), path=str(path))
+    meta = {"width": 16, "height": 9, "bytes": 100, "mtime": 0.0}
+    for i in range(5):
+        index.update(str(tmp_path / f"{i}.jpg"), meta)
+    index.discard(str(tmp_path / "4.jpg"))
+    assert index.dirty and not path.exists()
+
+    index.flush()
+    assert not index.dirty
+    assert sorted(json.loads(path.read_text())) == ["0.jpg", "1.jpg", "2.jpg", "3.jpg"]
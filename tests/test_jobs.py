@@ -0,0 +1,66 @@
+import threading
+import time
+
+import gui
+
+
+def drain(jobs, timeout=5):
+    deadline = time.monotonic() + timeout
+    while jobs.pump():
+        assert time.monotonic() < deadline, "jobs never finished"
+        time.sleep(0.005)
+
+
+def test_failing_callback_does_not_strand_later_results():
+    jobs = gui.JobScheduler(threads=0)
+    ran = []
+    jobs.call_soon(lambda: 1 / 0)
+    jobs.call_soon(ran.append, "after")
+    assert not jobs.pump()
+    assert ran == ["after"]
+
+
+def test_higher_lanes_are_taken_first():
+    jobs = gui.JobScheduler(threads=0)
+    for lane in ("maintenance", "prefetch", "interactive", "maintenance", "interactive"):
+        jobs.submit(lambda: None, lane, name=lane)
+    order = []
+    while (job := jobs._next(gui.JOB_LANES)) is not None:
+        order.append(job.name)
+    assert order == ["interactive", "interactive", "prefetch", "maintenance", "maintenance"]
+    # The first worker never takes anything but interactive jobs
+    jobs.submit(lambda: None, "maintenance")
+    assert jobs._next(gui.JOB_LANES[:1]) is None
+
+
+def test_renew_drops_queued_jobs_and_their_callbacks():
+    jobs = gui.JobScheduler(threads=1)
+    gate = threading.Event()
+    done = []
+    token = jobs.token("selection")
+    jobs.submit(gate.wait, token=token, on_done=done.append)  # Running when the scope is renewed
+    while not jobs.counts()["interactive"] or jobs.lanes["interactive"]:
+        time.sleep(0.001)
+    jobs.submit(lambda: "queued", token=token, on_done=done.append)
+    jobs.submit(lambda: "kept", on_done=done.append)
+
+    jobs.renew("selection")
+    assert len(jobs.lanes["interactive"]) == 1
+    gate.set()
+    drain(jobs)
+    assert done == ["kept"]
+
+
+def test_child_tokens_follow_their_parent():
+    jobs = gui.JobScheduler(threads=0)
+    child = jobs.renew("thumbnail", jobs.token("selection"))
+    jobs.renew("selection")
+    assert child.cancelled
+
+
+def test_errors_reach_on_error():
+    jobs = gui.JobScheduler(threads=1)
+    errors = []
+    jobs.submit(lambda: 1 / 0, on_done=lambda r: errors.append("done"), on_error=errors.append)
+    drain(jobs)
+    assert len(errors) == 1 and isinstance(errors[0], ZeroDivisionError)
@@ -0,0 +1,57 @@
+import copy
+import os
+
+import gui
+
+
+def state_of(data, assets=None):
+    index = gui.ImageIndex(path=os.devnull)
+    index.entries = {k: {"sha1": h} for k, h in (assets or {}).items()}
+    return gui.catalogue_state(data, index)
+
+
+def built_from(data, assets=None):
+    return copy.deepcopy(state_of(data, assets))
+
+
+def test_no_recorded_build_means_full_rebuild():
+    data = gui.synthetic_catalogue(10)
+    assert gui.change_manifest(state_of(data), None, "sha")["full"]
+
+
+def test_one_edit_rebuilds_its_page_and_category():
+    data = gui.synthetic_catalogue(10)
+    built = built_from(data)
+    data["projects"][3]["title"] = "Edited"
+    manifest = gui.change_manifest(state_of(data), built, "sha")
+    assert not manifest["full"]
+    assert manifest["projects"] == [data["projects"][3]["id"]]
+    assert manifest["categories"] == [data["projects"][3]["category"]]
+    assert manifest["removedPages"] == []
+
+
+def test_category_move_rebuilds_both_categories_and_drops_the_old_page():
+    data = gui.synthetic_catalogue(10)
+    built = built_from(data)
+    p = data["projects"][3]
+    old = p["category"]
+    p["category"] = next(c["id"] for c in data["categories"] if c["id"] != old)
+    manifest = gui.change_manifest(state_of(data), built, "sha")
+    assert manifest["categories"] == sorted({old, p["category"]})
+    assert manifest["removedPages"] == [built["projects"][p["id"]]["page"]]
+
+
+def test_assets_are_diffed_by_hash():
+    data = gui.synthetic_catalogue(3)
+    built = built_from(data, {"a.jpg": "1", "b.jpg": "2", "c.jpg": "3"})
+    manifest = gui.change_manifest(state_of(data, {"a.jpg": "1", "b.jpg": "changed", "d.jpg": "4"}),
+                                   built, "sha")
+    assert manifest["assets"] == {"changed": ["b.jpg", "d.jpg"], "removed": ["c.jpg"]}
+    assert manifest["projects"] == []
+
+
+def test_category_list_change_means_full_rebuild():
+    data = gui.synthetic_catalogue(10)
+    built = built_from(data)
+    data["categories"][0]["name"] = "Renamed"
+    assert gui.change_manifest(state_of(data), built, "sha")["full"]
@@ -0,0 +1,142 @@
+import copy
+import types
+from unittest import mock
+
+import pytest
+
+import gui
+
+
+def run_now(fn, lane="interactive", token=None, on_done=None, on_error=None, process=False):
+    try:
+        result = fn()
+    except Exception as e:
+        on_error(e)
+    else:
+        on_done(result)
+
+
+@pytest.fixture
+def first_run(app_stub):
+    """An app opened on an unkeyed catalogue, with a store whose file the test can edit"""
+    disk = gui.synthetic_catalogue(30)
+    assert not any("sortKey" in p for p in disk["projects"])
+    store = types.SimpleNamespace(load=lambda: copy.deepcopy(disk), read_disk=lambda: copy.deepcopy(disk))
+    app = app_stub({"projects": []}, "open_catalogue", "merge_disk_changes", "read_disk", "disk_read",
+                   "apply_disk_changes", "placeholders_changed")
+    app.run_job = run_now
+    app.store = store
+    app.open_catalogue()
+    app.saving = app.merging = app.merge_again = False
+    app.selected_index = None
+    app.fields = {}
+    app.calls = []
+    app.undo_manager = types.SimpleNamespace(add_state=lambda projects: None)
+    app.populate_tree = lambda: app.calls.append("populate")
+    app.refresh_project_row = lambda i, old_category=None: app.calls.append(("row", i))
+    app.project_title_label = types.SimpleNamespace(config=lambda **kwargs: None)
+    return app, disk
+
+
+def test_external_edit_after_first_run_merges_one_project(first_run):
+    app, disk = first_run
+    keys = [p["sortKey"] for p in app.projects]
+    disk["projects"][5]["title"] = "Edited outside the CMS"
+
+    with mock.patch.object(gui.messagebox, "showwarning") as warning:
+        app.merge_disk_changes()
+
+    assert not warning.called  # No conflicts
+    assert app.calls == [("row", 5)]
+    assert app.projects[5]["title"] == "Edited outside the CMS"
+    assert [p["sortKey"] for p in app.projects] == keys
+
+
+def test_local_move_then_merge_with_file_untouched(first_run):
+    app, disk = first_run
+    members = [i for i, p in enumerate(app.projects) if p["category"] == app.projects[7]["category"]]
+    members.sort(key=lambda i: gui.sort_key_order(app.projects, i))
+    moved = members[-1]
+    app.projects[moved]["sortKey"] = gui.sort_key_for_move(app.projects, members, len(members) - 1, 0)
+
+    with mock.patch.object(gui.messagebox, "showwarning") as warning:
+        app.merge_disk_changes()
+
+    assert not warning.called
+    assert app.calls == []
+    members.sort(key=lambda i: gui.sort_key_order(app.projects, i))
+    assert members[0] == moved
+
+
+def test_startup_placeholders_are_not_local_edits(first_run):
+    app, disk = first_run
+    placeholder = {"color": "#102030", "lqip": "data:,", "width": 16, "height": 9}
+    for i, p in enumerate(app.projects):
+        gui.set_site_placeholder(p, "thumbnail", p["thumbnail"], f"sha{i}", placeholder)
+    app.placeholders_changed()
+    assert not app.has_unsaved_changes
+    disk["projects"][5]["title"] = "Edited outside the CMS"
+
+    with mock.patch.object(gui.messagebox, "showwarning") as warning:
+        app.merge_disk_changes()
+
+    assert not warning.called
+    assert app.projects[5]["title"] == "Edited outside the CMS"
+    assert app.projects[5]["thumbnailPlaceholder"]["sha1"] == "sha5"
+
+
+def test_unreadable_file_leaves_catalogue_alone(first_run):
+    app, disk = first_run
+    before = copy.deepcopy([dict(p) for p in app.projects])
+
+    def mid_write():
+        raise ValueError("half-written JSON")
+    app.store.read_disk = mid_write
+    app.merge_disk_changes()
+
+    assert not app.merging
+    assert [dict(p) for p in app.projects] == before
+
+
+def three_way(n=5):
+    base = [{"id": f"p{i}", "category": "commercial", "title": f"P{i}"} for i in range(n)]
+    return base, copy.deepcopy(base), copy.deepcopy(base)
+
+
+def test_merge_takes_disk_edits_to_untouched_projects():
+    base, live, disk = three_way()
+    disk[1]["title"] = "Disk"
+    record = live[1]
+    merged, updated, added, removed, conflicts = gui.merge_catalogue(base, live, disk)
+    assert updated == ["p1"] and not (added or removed or conflicts)
+    assert merged[1] is record and record["title"] == "Disk"  # Updated in place
+
+
+def test_merge_keeps_local_edits_and_reports_conflicts():
+    base, live, disk = three_way()
+    live[2]["title"] = "Local"
+    disk[2]["title"] = "Disk"
+    live[3]["title"] = "Local only"
+    merged, updated, _added, _removed, conflicts = gui.merge_catalogue(base, live, disk)
+    assert conflicts == ["p2"] and updated == []
+    assert [p["title"] for p in merged[2:4]] == ["Local", "Local only"]
+
+
+def test_merge_adds_and_removes_disk_projects():
+    base, live, disk = three_way()
+    del disk[0]
+    disk.append({"id": "new", "category": "commercial", "title": "New"})
+    live.append({"id": "mine", "category": "commercial", "title": "Mine"})
+    merged, _updated, added, removed, _conflicts = gui.merge_catalogue(base, live, disk)
+    assert removed == ["p0"] and added == ["new"]
+    assert [p["id"] for p in merged] == ["p1", "p2", "p3", "p4", "mine", "new"]
+
+
+def test_merge_matches_repeated_ids_by_occurrence():
+    base, live, disk = three_way(2)
+    for side in (base, live, disk):
+        side.append({"id": "p0", "category": "vertical", "title": "Twin"})
+    disk[2]["title"] = "Twin edited"
+    merged, updated, *_rest = gui.merge_catalogue(base, live, disk)
+    assert updated == ["p0~2"]
+    assert merged[0]["title"] == "P0" and merged[2]["title"] == "Twin edited"
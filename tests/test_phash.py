@@ -0,0 +1,25 @@
+import numpy as np
+from PIL import Image
+
+import gui
+
+
+def test_rescaled_reexport_hashes_close_and_other_images_far(tmp_path):
+    rng = np.random.default_rng(0)
+    pixels = (rng.random((12, 16, 3)) * 255).astype(np.uint8)
+    original = Image.fromarray(pixels).resize((640, 480), Image.Resampling.BILINEAR)
+    original.save(tmp_path / "a.png")
+    original.resize((320, 240), Image.Resampling.LANCZOS).save(tmp_path / "a-small.jpg", quality=80)
+    Image.fromarray(255 - pixels).resize((640, 480), Image.Resampling.BILINEAR).save(tmp_path / "b.png")
+
+    a, small, b = (gui.perceptual_hash(str(tmp_path / n)) for n in ("a.png", "a-small.jpg", "b.png"))
+    assert bin(a ^ small).count("1") <= gui.PHASH_THRESHOLD
+    assert bin(a ^ b).count("1") > gui.PHASH_THRESHOLD
+
+
+def test_hamming_pairs_across_chunks_and_transitive_clusters():
+    hashes = [0b0, 0b111, 0b111111, 1 << 40, (1 << 40) | 1, 0xFFFF_FFFF_0000_0000]
+    pairs = gui.hamming_pairs(hashes, threshold=3, chunk=2)
+    assert sorted(pairs) == [(0, 1), (0, 3), (0, 4), (1, 2), (1, 4), (3, 4)]
+    clusters = gui.near_duplicate_clusters(list("abcdef"), hashes, threshold=3)
+    assert clusters == [["a", "b", "c", "d", "e"]]
@@ -0,0 +1,44 @@
+import os
+
+import numpy as np
+from PIL import Image
+
+import gui
+
+
+def test_site_placeholder_colour_grid_and_size(tmp_path):
+    img = Image.new("RGB", (400, 200), "#204060")
+    img.paste((250, 250, 250), (0, 0, 40, 200))  # A minority stripe doesn't win the colour vote
+    img.save(tmp_path / "still.png")
+    placeholder = gui.site_placeholder(str(tmp_path / "still.png"))
+    assert placeholder["color"] == "#204060"
+    assert (placeholder["width"], placeholder["height"]) == (400, 200)
+    assert placeholder["lqip"].startswith("data:image/webp;base64,")
+
+
+def test_box_downsample_averages_cells():
+    rgb = np.zeros((4, 8, 3), dtype=np.uint8)
+    rgb[:, 4:] = 200
+    cells = gui.box_downsample(rgb, 2)
+    assert cells.shape == (1, 2, 3)
+    assert cells[0, 0].tolist() == [0, 0, 0] and cells[0, 1].tolist() == [200, 200, 200]
+
+
+def test_placeholders_follow_image_changes():
+    index = gui.ImageIndex(path=os.devnull)
+    p = {"id": "a", "thumbnail": "commercial/a.jpg", "gallery": ["a/1.jpg", "a/2.jpg"]}
+    for path, sha1 in ((gui.thumbnail_path(p), "t"), (os.path.join(gui.GALLERY_DIR, "a/1.jpg"), "g1"),
+                       (os.path.join(gui.GALLERY_DIR, "a/2.jpg"), "g2")):
+        index.update(path, {"width": 16, "height": 9, "bytes": 1, "mtime": 0.0, "sha1": sha1})
+    placeholder = {"color": "#000000", "lqip": "data:,", "width": 16, "height": 9}
+    for field, rel, _path, sha1 in gui.stale_site_placeholders(p, index):
+        gui.set_site_placeholder(p, field, rel, sha1, placeholder)
+    assert gui.stale_site_placeholders(p, index) == []
+
+    index.update(os.path.join(gui.GALLERY_DIR, "a/2.jpg"),
+                 {"width": 16, "height": 9, "bytes": 1, "mtime": 1.0, "sha1": "g2-new"})
+    assert [job[1] for job in gui.stale_site_placeholders(p, index)] == ["a/2.jpg"]
+
+    p["gallery"] = ["a/2.jpg"]
+    assert gui.prune_site_placeholders(p)
+    assert list(p["galleryPlaceholders"]) == ["a/2.jpg"]
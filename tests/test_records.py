@@ -0,0 +1,64 @@
+import os
+
+import gui
+from gui import ProjectRecord
+
+
+def placeholder(sha1):
+    return {"color": "#000000", "lqip": "data:,", "width": 16, "height": 9, "sha1": sha1}
+
+
+def catalogue(n=20):
+    data = gui.synthetic_catalogue(n)
+    data["projects"] = [ProjectRecord.from_dict(p) for p in data["projects"]]
+    for i, p in enumerate(data["projects"]):
+        p["gallery"] = [f"{p['id']}/{p['id']}-1.jpg"]
+        p["thumbnailCrop"] = {"src": f"cropped/{p['thumbnail']}", "box": [0, 0, 16, 9],
+                              "aspect": [16, 9], "width": 16, "height": 9, "sha1": f"t{i}"}
+        p["thumbnailPlaceholder"] = placeholder(f"c{i}")
+        p["galleryPlaceholders"] = {p["gallery"][0]: placeholder(f"g{i}")}
+    return data
+
+
+def index_for(data):
+    """An image index in which every referenced image exists and matches its placeholder"""
+    index = gui.ImageIndex(path=os.devnull)
+    meta = {"width": 16, "height": 9, "bytes": 100, "mtime": 0.0}
+    for i, p in enumerate(data["projects"]):
+        for path, sha1 in ((os.path.join(gui.THUMBNAILS_DIR, p["thumbnail"]), f"t{i}"),
+                           (gui.thumbnail_path(p), f"c{i}"),
+                           (os.path.join(gui.GALLERY_DIR, p["gallery"][0]), f"g{i}")):
+            index.entries[index.key(path)] = dict(meta, sha1=sha1)
+    return index
+
+
+def test_reads_keep_frozen_cache():
+    p = ProjectRecord.from_dict({"id": "a", "gallery": ["a/1.jpg"], "thumbnailCrop": {"src": "x"}})
+    frozen = p.freeze()
+    p["gallery"], p.get("thumbnailCrop"), dict(p)
+    assert p.freeze() is frozen
+
+
+def test_mutable_drops_frozen_cache():
+    p = ProjectRecord.from_dict({"id": "a", "gallery": ["a/1.jpg"]})
+    frozen = p.freeze()
+    p.mutable("gallery").append("a/2.jpg")
+    assert p.freeze() is not frozen
+    assert ProjectRecord.thaw(p.freeze())["gallery"] == ["a/1.jpg", "a/2.jpg"]
+
+
+def test_revalidate_between_snapshots_shares_records(app_stub):
+    data = catalogue()
+    app = app_stub(data, "revalidate", "queue_site_placeholders")
+    app.image_index = index_for(data)
+    before, _ = ProjectRecord.snapshot(app.projects)
+
+    app.revalidate()
+    app.projects[3]["title"] = "Edited"
+    after, nbytes = ProjectRecord.snapshot(app.projects)
+
+    assert not app.jobs  # Every placeholder was current
+    shared = sum(a is b for a, b in zip(before, after))
+    assert shared == len(app.projects) - 1
+    assert after[3] is not before[3]
+    assert nbytes < 10_000
@@ -0,0 +1,75 @@
+import types
+
+import pytest
+
+import gui
+
+
+def test_keyboard_move_keeps_the_form_loaded(app_stub):
+    data = gui.synthetic_catalogue(6)
+    for p in data["projects"]:
+        p["category"] = "commercial"
+    gui.assign_sort_keys(data["projects"])
+    app = app_stub(data, "move_project_to", "member_position", "select_project")
+    app.category_members = {"commercial": list(range(6))}
+    app.loaded_categories = {"commercial"}
+    app.cat_nodes = {"commercial": "category:commercial"}
+    app.search_var = types.SimpleNamespace(get=lambda: "")
+    app.filter_category = types.SimpleNamespace(get=lambda: "All")
+    app.save_state = lambda: None
+    app.calls = []
+    app.tree = types.SimpleNamespace(move=lambda *args: app.calls.append("move"), exists=lambda iid: True,
+                                     selection_set=lambda iid: app.calls.append(("select", iid)),
+                                     see=lambda iid: None, item=lambda *args, **kwargs: None)
+    app.load_category = lambda category: None
+    app.load_project = lambda: app.calls.append("load")
+    app.selected_index = 3
+
+    app.move_project_to(3, 2)
+
+    assert app.calls == ["move", ("select", "project:3")]
+    assert gui.category_order(app.projects, range(6)) == [0, 1, 3, 2, 4, 5]
+
+
+def test_sort_key_between_orders_strictly():
+    for lo, hi in [(None, None), (None, "V"), ("V", None), ("1", "2"), ("1", "11"), ("zz", None), ("0V", "1")]:
+        key = gui.sort_key_between(lo, hi)
+        assert (lo or "") < key and (hi is None or key < hi)
+        assert not key.endswith("0")
+
+
+def test_sort_key_between_rejects_tied_neighbours():
+    with pytest.raises(ValueError):
+        gui.sort_key_between("V", "V")
+
+
+def test_spread_sort_keys_are_short_and_ascending():
+    keys = gui.spread_sort_keys(100)
+    assert keys == sorted(keys) and len(set(keys)) == 100
+    assert max(map(len, keys)) == 2
+
+
+def test_assign_sort_keys_keeps_list_order_and_appends_keyless():
+    projects = [{"category": "a"}, {"category": "b"}, {"category": "a"}]
+    assert sorted(gui.assign_sort_keys(projects)) == [0, 1, 2]
+    assert projects[0]["sortKey"] < projects[2]["sortKey"]
+
+    projects.append({"category": "a"})
+    assert gui.assign_sort_keys(projects) == [3]
+    assert gui.category_order(projects, [0, 2, 3]) == [0, 2, 3]
+
+
+def test_repeated_moves_into_one_gap_run_out_of_room():
+    projects = [{"category": "a", "sortKey": key} for key in gui.spread_sort_keys(3)]
+    members = [0, 1, 2]
+    for _ in range(100):
+        # The last project moves up next to the first, squeezing the gap each time
+        key = gui.sort_key_for_move(projects, members, 2, 1)
+        if key is None:
+            break
+        projects[members[2]]["sortKey"] = key
+        members = gui.category_order(projects, members)
+    else:
+        pytest.fail("keys grew past SORT_KEY_MAX_LEN")
+    gui.respread_sort_keys(projects, members)
+    assert gui.sort_key_for_move(projects, members, 2, 1) is not None
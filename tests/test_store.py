@@ -0,0 +1,106 @@
+import pytest
+
+import gui
+
+
+def catalogue(n=20):
+    data = gui.synthetic_catalogue(n)
+    data["projects"].append(dict(data["projects"][0], title="Same id, another entry"))
+    return data
+
+
+def sharded(tmp_path):
+    return gui.ShardedStore(str(tmp_path / "projects"), str(tmp_path / "projects" / "manifest.json"),
+                            str(tmp_path / "projects.json"))
+
+
+def test_json_store_round_trip(tmp_path):
+    data = catalogue()
+    store = gui.JsonStore(str(tmp_path / "projects.json"))
+    store.save(data)
+    assert store.load() == data
+
+
+def test_sharded_store_splits_the_aggregate_on_first_load(tmp_path):
+    data = catalogue()
+    gui.JsonStore(str(tmp_path / "projects.json")).save(data)
+    assert sharded(tmp_path).load() == data
+    assert len(list((tmp_path / "projects").glob("*.json"))) == len(data["projects"]) + 1  # Plus manifest
+    assert sharded(tmp_path).load() == data
+
+
+def test_sharded_store_rewrites_only_changed_shards(tmp_path):
+    data = catalogue()
+    store = sharded(tmp_path)
+    store.save(data)
+    assert store.save(data) == 0
+    data["projects"][4]["title"] = "Edited"
+    assert store.save(data) == 3  # The shard, the aggregate and the manifest
+    assert sharded(tmp_path).load() == data
+
+
+def test_sharded_store_loads_an_externally_edited_aggregate(tmp_path):
+    data = catalogue()
+    store = sharded(tmp_path)
+    store.save(data)
+    data["projects"][2]["title"] = "Edited by a script"
+    gui.JsonStore(str(tmp_path / "projects.json")).save(data)
+    assert sharded(tmp_path).load() == data
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = gui.SqliteStore(str(tmp_path / "catalogue.db"), str(tmp_path / "projects.json"))
+    yield store
+    store.db.close()
+
+
+@pytest.mark.parametrize("term", ["ocean", "cean", "oc", "and", "a-b", 'say "hi"', "launch trailer", "zzz"])
+def test_sqlite_search_matches_filter_projects(sqlite_store, term):
+    data = gui.synthetic_catalogue(60)
+    data["projects"][3]["title"] = "Rock and Roll"
+    data["projects"][4]["client"] = "A-B Studios"
+    data["projects"][5]["role"] = 'They say "hi"'
+    sqlite_store.save(data)
+    assert sqlite_store.search(term) == gui.filter_projects(data["projects"], term)
+    category = data["projects"][0]["category"]
+    assert sqlite_store.search(term, category) == gui.filter_projects(data["projects"], term, category)
+
+
+def test_sqlite_search_index_is_rebuilt_for_older_databases(tmp_path):
+    path = str(tmp_path / "catalogue.db")
+    data = gui.synthetic_catalogue(20)
+    store = gui.SqliteStore(path, str(tmp_path / "projects.json"))
+    store.save(data)
+    with store.db:
+        store.db.execute("DELETE FROM projects_search")
+    store.db.close()
+
+    store = gui.SqliteStore(path, str(tmp_path / "projects.json"))
+    assert store.search("ocean") == gui.filter_projects(data["projects"], "ocean")
+    store.db.close()
+
+
+def test_sqlite_store_round_trip_and_export(tmp_path, sqlite_store):
+    data = catalogue()
+    sqlite_store.save(data)
+    assert sqlite_store.load() == data
+    assert gui.load_data(str(tmp_path / "projects.json")) == data
+
+
+def test_sqlite_sync_is_searchable_without_exporting(tmp_path, sqlite_store):
+    data = catalogue()
+    sqlite_store.save(data)
+    data["projects"][7]["title"] = "Unsaved zebra"
+    sqlite_store.sync(data["projects"])
+    assert sqlite_store.search("zebra") == [7]
+    assert gui.load_data(str(tmp_path / "projects.json"))["projects"][7]["title"] != "Unsaved zebra"
+    assert sqlite_store.has_id(data["projects"][7]["id"]) and not sqlite_store.has_id("missing")
+
+
+def test_sqlite_store_reimports_an_externally_edited_export(tmp_path, sqlite_store):
+    data = catalogue()
+    sqlite_store.save(data)
+    data["projects"][2]["title"] = "Edited by a script"
+    gui.JsonStore(str(tmp_path / "projects.json")).save(data)
+    assert sqlite_store.load() == data
@@ -0,0 +1,33 @@
+import os
+
+import gui
+
+
+def meta(size=100):
+    return {"width": 16, "height": 9, "bytes": size, "mtime": 0.0, "sha1": "x"}
+
+
+def test_validate_catalogue_reports_each_kind_errors_first():
+    index = gui.ImageIndex(path=os.devnull)
+    index.entries = {"thumbnails/commercial/ok.jpg": meta(),
+                     "thumbnails/commercial/big.jpg": meta(gui.IMAGE_SIZE_BUDGET + 1),
+                     "gallery/stray.jpg": meta()}
+    data = {
+        "categories": [{"id": "commercial"}, {"id": "vertical"}],
+        "projects": [
+            {"id": "ok", "category": "commercial", "thumbnail": "commercial/ok.jpg"},
+            {"id": "big", "category": "commercial", "thumbnail": "commercial/big.jpg"},
+            {"id": "gone", "category": "commercial", "thumbnail": "commercial/no-such-file.jpg"},
+            {"id": "twice", "category": "commercial"},
+            {"id": "twice", "category": "commercial"},
+            {"id": "shared", "category": "commercial"},
+            {"id": "shared", "category": "vertical"},
+            {"id": "lost", "category": "nowhere"},
+        ],
+    }
+    issues = gui.validate_catalogue(data, index, refresh=False)
+    found = {(i["kind"], i["project"]) for i in issues}
+    assert found == {("oversized", "big"), ("missing-file", "gone"), ("duplicate-id", "twice"),
+                     ("shared-id", "shared"), ("unknown-category", "lost"), ("orphan", None)}
+    severities = [i["severity"] for i in issues]
+    assert severities == sorted(severities, key=lambda s: s != "error")